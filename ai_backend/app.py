@@ -1,73 +1,297 @@
-from flask import Flask, request, jsonify
+from flask import Blueprint, Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
-from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
-from langchain_groq import ChatGroq
 import uuid
 import json
 import os
-from googletrans import Translator, LANGUAGES
-from bs4 import BeautifulSoup
+import threading
+import time
 import logging
-from typing import Dict, List
+from typing import List, Tuple
+from functools import partial
 from dotenv import load_dotenv
+from streaming import ReplyStreamParser, format_event
+from html_text import splice, text_nodes
+from translation import (get_translator, translate_many, translate_text, translate_tree, translation_cache,
+                         translation_stats, warm_clients as warm_translation_clients)
+import metrics
+from metrics import record_json_parse, record_llm_usage, stage, stage_iter
+from catalog import catalog_text, localized_event_types, localized_questions
+from compaction import Compactor, estimate_tokens, fit_to_budget
+from conversation_store import create_conversation_store, make_record
+from event_data import (BUSY_MESSAGE, EVENT_PROMPTS, FALLBACK_FOLLOW_UPS, PLAN_SECTIONS, PLAN_SUMMARY,
+                        SPEECH_SUMMARY)
+from sectioned_plan import PLAN_GENERATION_MODE, generate_sections
+from llm_gateway import (LLM_MAX_RETRIES, LLM_REQUEST_TIMEOUT, LLMUnavailable, gateway, message_tokens,
+                         start_deadline)
+from model_router import LARGE_MODEL, SMALL_MODEL, ModelRouter, contains_json, is_json_object
+from plan_cache import get_or_build_plan, normalize_plan_request, plan_cache, plan_cache_key
+from plan_batch import PLAN_BATCH_MAX_ITEMS, run_batch
+from plan_jobs import PLAN_JOB_MODE, PlanJobs, job_view
+from offline_plan import PLAN_LLM_SLO_MS, PLAN_OFFLINE_FALLBACK, build_offline_plan
+from prompts import prompts
 
 load_dotenv()
 
-app = Flask(__name__)
-# Permissive CORS for browser deployments (Vercel/Render)
-CORS(app, resources={r"/*": {"origins": "*"}})
+# Routes live on a blueprint so create_app() can build the Flask app
+api = Blueprint("api", __name__)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-conversation_history: Dict[str, List] = {}
-translator = Translator()
+conversation_store = create_conversation_store()
 
 # # Securely load GROQ API key from environment
 # GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 # if not GROQ_API_KEY:
 #     logger.warning("GROQ_API_KEY not found in environment. Set it in .env or environment variables.")
-llm = ChatGroq(model="llama-3.3-70b-versatile", api_key=os.environ.get("GROQ_API_KEY"))
+# Chat models are built on first use (or by warm_up()); langchain_groq is slow
+# to import. Tests and benchmarks may assign stand-ins to llm / small_llm.
+llm = None
+# Small, fast model for trivial chat turns and plan sections (see model_router.py)
+small_llm = None
+_clients_lock = threading.Lock()
+
+def get_llm(tier: str = "large"):
+    """The chat model for a tier, creating the ChatGroq client on first use."""
+    global llm, small_llm
+    model = small_llm if tier == "small" else llm
+    if model is None:
+        with _clients_lock:
+            from langchain_groq import ChatGroq
+            if tier == "small":
+                if small_llm is None:
+                    small_llm = ChatGroq(model=SMALL_MODEL, api_key=os.environ.get("GROQ_API_KEY"),
+                                         request_timeout=LLM_REQUEST_TIMEOUT, max_retries=LLM_MAX_RETRIES)
+                model = small_llm
+            else:
+                if llm is None:
+                    llm = ChatGroq(model=LARGE_MODEL, api_key=os.environ.get("GROQ_API_KEY"),
+                                   request_timeout=LLM_REQUEST_TIMEOUT, max_retries=LLM_MAX_RETRIES)
+                model = llm
+    return model
+
+# Every model call is admitted through the shared gateway (see llm_gateway.py)
+router = ModelRouter(get_llm, gateway=gateway)
 
 def load_prompt() -> str:
-    """Load the system prompt from file."""
-    current_path = os.path.dirname(os.path.abspath(__file__))
-    prompt_path = os.path.join(current_path, "web3_prompt.txt")
-    try:
-        with open(prompt_path, "r", encoding="utf-8") as file:
-            return file.read()
-    except Exception as e:
-        logger.error(f"Error loading prompt file: {str(e)}")
-        return "You are a helpful assistant."
+    """Return the system prompt from the prompt registry (reloaded when the file changes)."""
+    return prompts.get("system").text
+
+def invoke_llm(messages: List, decision=None, validate=is_json_object):
+    """Call the LLM, timing the call and counting prompt/completion tokens.
+
+    With a router decision the chosen tier is used (falling back to the large
+    model when its output fails validate); without one the large model is
+    called at background priority.
+    """
+    if decision is not None:
+        return router.invoke(messages, decision, validate)
+    with stage("llm_invoke"):
+        model = get_llm()
+        result = gateway.call(lambda: model.invoke(messages), "background", message_tokens(messages))
+    record_llm_usage(result)
+    return result
+
+def conversation_depth(messages: List) -> int:
+    """Number of earlier assistant turns in a chat history."""
+    return sum(1 for m in messages if getattr(m, "type", None) == "ai")
+
+def summarize_history(previous_summary: str, records: List[dict]) -> str:
+    """Fold older conversation records into the rolling summary (runs off the request path)."""
+    from langchain_core.messages import HumanMessage, SystemMessage
+    transcript = "\n".join(f"{r['role']}: {r['content']}" for r in records)
+    result = invoke_llm([
+        SystemMessage(content=prompts.get("summary").text),
+        HumanMessage(content=f"Previous summary:\n{previous_summary or '(none)'}\n\nTranscript:\n{transcript}")
+    ])
+    content = result.content if isinstance(result.content, str) else str(result.content)
+    return content.strip()
+
+compactor = Compactor(conversation_store, summarize_history)
+
+def build_chat_messages(conversation_id: str, query: str) -> Tuple[List, bool]:
+    """System prompt + rolling summary + stored records + the new user query.
+
+    History is trimmed to CHAT_TOKEN_BUDGET; the flag says whether the session
+    should be compacted once the response has been returned.
+    """
+    from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+    system_prompt = load_prompt()
+    with stage("load_history"):
+        # load() expires an idle session first, so its summary is never read after that
+        records = conversation_store.load(conversation_id)
+        summary = conversation_store.get_summary(conversation_id) if records is not None else ""
+        records = records or []
+    fixed = estimate_tokens(system_prompt) + estimate_tokens(summary) + estimate_tokens(query)
+    records, needs_compaction = fit_to_budget(fixed, records)
+
+    messages = [SystemMessage(content=system_prompt)]
+    if summary:
+        messages.append(SystemMessage(content=f"Summary of the earlier conversation:\n{summary}"))
+    for record in records:
+        if record["role"] == "user":
+            messages.append(HumanMessage(content=record["content"]))
+        else:
+            messages.append(AIMessage(content=record["content"]))
+    messages.append(HumanMessage(content=query))
+    return messages, needs_compaction
 
 def translate_response(response: dict, target_lang: str) -> dict:
     """Translate the response to the target language."""
     if target_lang == 'en':
         return response
     
+    with stage("translate_output"):
+        try:
+            # Collect the HTML text nodes and every message text into one batched translation
+            pieces, indices, texts = [], [], []
+            if 'html_response' in response:
+                pieces, indices, texts = text_nodes(response['html_response'])
+            html_count = len(texts)
+            msgs = [m for m in response.get('messages', []) if isinstance(m, dict) and 'text' in m]
+            texts.extend(m['text'] for m in msgs)
+
+            translated = translate_many(texts, dest=target_lang, src='en')
+
+            if html_count:
+                # Keep the model's markup; only its text nodes change
+                response['html_response'] = splice(pieces, indices, translated[:html_count])
+            for msg, text in zip(msgs, translated[html_count:]):
+                msg['text'] = text
+
+            return response
+        except Exception as e:
+            logger.error(f"Translation error: {str(e)}")
+            return response  # Return untranslated response if error occurs
+
+def ensure_speech_message(parsed_response: dict, language: str) -> dict:
+    """Append a short spoken summary when the reply has no speakable message."""
     try:
-        # Translate HTML response
-        if 'html_response' in response:
-            soup = BeautifulSoup(response['html_response'], 'html.parser')
-            text_to_translate = soup.get_text()
-            translated_text = translator.translate(text_to_translate, src='en', dest=target_lang).text
-            response['html_response'] = f'<div class="bg-purple-600/70 text-white p-4 rounded-lg max-w-md mx-auto">{translated_text}</div>'
-
-        # Translate messages
-        for msg in response.get('messages', []):
-            msg['text'] = translator.translate(msg['text'], src='en', dest=target_lang).text
-            
-        return response
+        if isinstance(parsed_response, dict):
+            msgs = parsed_response.get('messages', []) or []
+            def looks_like_json_text(t: str) -> bool:
+                if not isinstance(t, str):
+                    return False
+                s = t.strip()
+                return s.startswith('{') or s.startswith('[')
+            needs_summary = True
+            for m in msgs:
+                if m and isinstance(m, dict):
+                    txt = m.get('text', '')
+                    if txt and not looks_like_json_text(txt):
+                        needs_summary = False
+                        break
+            if needs_summary:
+                summary = catalog_text(SPEECH_SUMMARY, language)
+                msgs.append({"text": summary, "facialExpression": "smile", "animation": "Talking_1"})
+                parsed_response['messages'] = msgs
+    except Exception:
+        pass
+    return parsed_response
+
+@api.before_app_request
+def begin_request_metrics():
+    # Label by view name without the blueprint prefix ("api.chat" -> "chat")
+    metrics.begin_request((request.endpoint or "unknown").rsplit(".", 1)[-1])
+    start_deadline()
+
+@api.after_app_request
+def end_request_metrics(response):
+    if response.is_streamed:
+        # The body is generated after this hook; finish timing once it has been sent
+        response.call_on_close(partial(metrics.end_request, response.status_code))
+    else:
+        metrics.end_request(response.status_code)
+    return response
+
+def _cache_lookups():
+    samples = {}
+    for name, cache in (("translation", translation_cache), ("event_plan", plan_cache)):
+        stats = cache.stats()
+        samples[(name, "memory_hit")] = stats["memory_hits"]
+        samples[(name, "disk_hit")] = stats["disk_hits"]
+        samples[(name, "miss")] = stats["misses"]
+    return samples
+
+metrics.gauge("cache_lookups", "Cache lookups by cache and result since process start.",
+              _cache_lookups, ("cache", "result"))
+metrics.gauge("cache_hit_ratio", "Cache hit ratio since process start.",
+              lambda: {("translation",): translation_cache.stats()["hit_rate"],
+                       ("event_plan",): plan_cache.stats()["hit_rate"]}, ("cache",))
+metrics.gauge("active_conversations", "Conversations currently held by the conversation store.",
+              lambda: {(): conversation_store.stats()["sessions"]})
+metrics.gauge("conversation_store_bytes", "Approximate bytes held by the conversation store.",
+              lambda: {(): conversation_store.stats()["bytes"]})
+metrics.gauge("llm_tier_json_valid_ratio", "Recent JSON-valid rate of each model tier (router input).",
+              lambda: {(tier,): s["json_rate"] for tier, s in router.stats().items() if s["json_rate"] is not None},
+              ("tier",))
+metrics.gauge("llm_gateway_in_flight", "LLM calls currently admitted by the gateway.",
+              lambda: {(): gateway.stats()["in_flight"]})
+metrics.gauge("llm_gateway_queued", "LLM calls waiting for admission.",
+              lambda: {(): gateway.stats()["queued"]})
+metrics.gauge("llm_circuit_open", "1 while the LLM circuit breaker is open or half-open.",
+              lambda: {(): 0 if gateway.stats()["circuit"] == "closed" else 1})
+metrics.gauge("translation_avoided_ratio", "Share of strings the pre-translation classifier kept from the translator.",
+              lambda: {(): translation_stats()["avoided_ratio"]})
+metrics.gauge("prompt_template_tokens", "Estimated token size of each prompt template.",
+              lambda: {(name,): tokens for name, tokens in prompts.token_report().items()}, ("prompt",))
+
+@api.route('/health', methods=['GET'])
+def health():
+    # Answers immediately, before the LLM and translation stacks are warm
+    return jsonify({"status": "ok", "warm": is_warm()})
+
+@api.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Prometheus text exposition of this worker's counters and histograms."""
+    return Response(metrics.registry.render(), mimetype="text/plain; version=0.0.4")
+
+def translate_query(query: str, language: str) -> str:
+    """Translate the user's query to English; the original is kept if translation fails."""
+    if language == 'en':
+        return query
+    try:
+        with stage("translate_query"):
+            return translate_text(query, dest='en', src=language)
     except Exception as e:
-        logger.error(f"Translation error: {str(e)}")
-        return response  # Return untranslated response if error occurs
+        logger.error(f"Query translation error: {str(e)}")
+        return query
+
+def record_chat_turn(conversation_id: str, query: str, output_str: str, needs_compaction: bool) -> None:
+    """Persist a completed turn and queue compaction when the session is over budget."""
+    with stage("store_turn"):
+        conversation_store.append(conversation_id, [
+            make_record("user", query), make_record("assistant", output_str)
+        ])
+    if needs_compaction:
+        compactor.schedule(conversation_id)
 
-@app.route('/health', methods=['GET'])
-def health():
-    return jsonify({"status": "ok"})
+def parse_chat_reply(output_str: str, language: str) -> dict:
+    """Parse the LLM reply into the response shape, or build the fallback response."""
+    try:
+        with stage("json_parse"):
+            parsed_response = json.loads(output_str)
+        record_json_parse(True)
 
-@app.route('/chat', methods=['POST'])
+        # Ensure a brief speech-friendly message exists even if content is JSON-only
+        ensure_speech_message(parsed_response, language)
+
+        # Translate response if needed
+        if language != 'en':
+            parsed_response = translate_response(parsed_response, language)
+        return parsed_response
+    except json.JSONDecodeError:
+        record_json_parse(False)
+        logger.error("Failed to parse LLM response as JSON")
+        return create_fallback_response(output_str, language)
+
+@api.route('/api/prompts', methods=['GET'])
+def get_prompt_stats():
+    """Token size of each prompt template, to track per-request prompt overhead."""
+    return jsonify({"prompt_tokens": prompts.token_report()})
+
+@api.route('/chat', methods=['POST'])
 def chat():
     """Handle chat requests with multilingual support."""
     try:
@@ -83,81 +307,121 @@ def chat():
             conversation_id = str(uuid.uuid4())
 
         # Translate query to English for processing if needed
-        if language != 'en':
-            try:
-                query = translator.translate(query, src=language, dest='en').text
-            except Exception as e:
-                logger.error(f"Query translation error: {str(e)}")
-                # Continue with original query if translation fails
+        query = translate_query(query, language)
 
-        # Initialize conversation if new
-        if conversation_id not in conversation_history:
-            conversation_history[conversation_id] = [
-                SystemMessage(content=load_prompt())
-            ]
+        # Rebuild the LangChain history from the stored records (empty if new)
+        history, needs_compaction = build_chat_messages(conversation_id, query)
 
-        conversation_history[conversation_id].append(HumanMessage(content=query))
-
-        # Get the response
-        result = llm.invoke(conversation_history[conversation_id])
+        # Get the response from the tier the router picks for this turn
+        decision = router.route("chat", query, conversation_depth(history))
+        result = invoke_llm(history, decision)
         output_str = result.content
-        conversation_history[conversation_id].append(AIMessage(content=output_str))
-
-        try:
-            parsed_response = json.loads(output_str)
-            
-            # Land price enhancement removed for this project
-            
-            # Ensure a brief speech-friendly message exists even if content is JSON-only
-            try:
-                if isinstance(parsed_response, dict):
-                    msgs = parsed_response.get('messages', []) or []
-                    def looks_like_json_text(t: str) -> bool:
-                        if not isinstance(t, str):
-                            return False
-                        s = t.strip()
-                        return s.startswith('{') or s.startswith('[')
-                    needs_summary = True
-                    for m in msgs:
-                        if m and isinstance(m, dict):
-                            txt = m.get('text', '')
-                            if txt and not looks_like_json_text(txt):
-                                needs_summary = False
-                                break
-                    if needs_summary:
-                        summary = "I've prepared an updated structured response. Please review the left panel."
-                        if language != 'en':
-                            try:
-                                summary = translator.translate(summary, src='en', dest=language).text
-                            except Exception:
-                                pass
-                        msgs.append({"text": summary, "facialExpression": "smile", "animation": "Talking_1"})
-                        parsed_response['messages'] = msgs
-            except Exception:
-                pass
+        record_chat_turn(conversation_id, query, output_str, needs_compaction)
 
-            # Translate response if needed
-            if language != 'en':
-                parsed_response = translate_response(parsed_response, language)
-                
-            return jsonify({
-                "response": parsed_response,
-                "conversation_id": conversation_id
-            })
-            
-        except json.JSONDecodeError:
-            logger.error("Failed to parse LLM response as JSON")
-            # Create a fallback response
-            fallback_response = create_fallback_response(output_str, language)
-            return jsonify({
-                "response": fallback_response,
-                "conversation_id": conversation_id
-            })
+        return jsonify({
+            "response": parse_chat_reply(output_str, language),
+            "conversation_id": conversation_id
+        })
 
+    except LLMUnavailable as e:
+        return busy_response({"response": busy_reply(language), "conversation_id": conversation_id}, e)
     except Exception as e:
         logger.error(f"Error in chat endpoint: {str(e)}")
         return jsonify({"error": "Internal server error"}), 500
 
+@api.route('/chat/stream', methods=['POST'])
+def chat_stream():
+    """Streaming variant of /chat.
+
+    Emits one event per completed entry of messages[], then html_response, and a
+    final "done" event carrying conversation_id and the assembled response.
+    NDJSON by default; Server-Sent Events when the client accepts text/event-stream.
+    """
+    data = request.get_json(silent=True) or {}
+    query = data.get('message')
+    conversation_id = data.get('conversation_id') or str(uuid.uuid4())
+    language = data.get('language', 'en').lower()
+    sse = 'text/event-stream' in request.headers.get('Accept', '')
+
+    if not query:
+        return jsonify({"error": "Message parameter is required"}), 400
+
+    query = translate_query(query, language)
+    history, needs_compaction = build_chat_messages(conversation_id, query)
+    # Streamed replies cannot be redone mid-stream, so only the routing and the
+    # JSON outcome are recorded here
+    decision = router.route("chat", query, conversation_depth(history))
+    model = router.get_model(decision.tier)
+
+    def generate():
+        parser = ReplyStreamParser()
+        streamed_messages = []
+        streamed_html = None
+        try:
+            # Admission happens before the first event, so a shed request gets the busy reply
+            with gateway.slot("chat", message_tokens(history), tier=decision.tier):
+                for chunk in stage_iter("llm_stream", model.stream(history)):
+                    piece = chunk.content if isinstance(chunk.content, str) else str(chunk.content)
+                    for event in parser.feed(piece):
+                        if event["type"] == "message":
+                            msg = event["message"]
+                            if language != 'en' and isinstance(msg.get('text'), str):
+                                msg = translate_response({"messages": [msg]}, language)["messages"][0]
+                            streamed_messages.append(msg)
+                            event["message"] = msg
+                        else:
+                            if language != 'en':
+                                event["html_response"] = translate_response(
+                                    {"html_response": event["html_response"]}, language
+                                )["html_response"]
+                            streamed_html = event["html_response"]
+                        yield format_event(event, sse)
+        except LLMUnavailable:
+            reply = busy_reply(language)
+            for msg in reply['messages']:
+                yield format_event({"type": "message", "message": msg}, sse)
+            yield format_event({"type": "html_response", "html_response": reply['html_response']}, sse)
+            yield format_event({"type": "done", "conversation_id": conversation_id, "response": reply}, sse)
+            return
+        except Exception as e:
+            logger.error(f"Error in chat stream: {str(e)}")
+            yield format_event({"type": "error", "error": "Internal server error",
+                                "conversation_id": conversation_id}, sse)
+            return
+
+        output_str = parser.text
+        router.record_output(decision.tier, is_json_object(output_str))
+        record_chat_turn(conversation_id, query, output_str, needs_compaction)
+
+        try:
+            parsed_response = json.loads(output_str)
+            if not isinstance(parsed_response, dict):
+                raise json.JSONDecodeError("Expected a JSON object", output_str, 0)
+            parsed_response['messages'] = list(streamed_messages)
+            ensure_speech_message(parsed_response, language)
+            for msg in parsed_response['messages'][len(streamed_messages):]:
+                yield format_event({"type": "message", "message": msg}, sse)
+            if streamed_html is not None:
+                parsed_response['html_response'] = streamed_html
+        except json.JSONDecodeError:
+            logger.error("Failed to parse streamed LLM response as JSON")
+            parsed_response = create_fallback_response(output_str, language)
+            if not streamed_messages:
+                for msg in parsed_response['messages']:
+                    yield format_event({"type": "message", "message": msg}, sse)
+                yield format_event({"type": "html_response",
+                                    "html_response": parsed_response['html_response']}, sse)
+
+        yield format_event({
+            "type": "done",
+            "conversation_id": conversation_id,
+            "response": parsed_response
+        }, sse)
+
+    mimetype = 'text/event-stream' if sse else 'application/x-ndjson'
+    return Response(stream_with_context(generate()), mimetype=mimetype,
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
 def extract_region(query: str) -> str:
     """Extract region from query for land price lookup."""
     query = query.lower()
@@ -171,11 +435,12 @@ def extract_region(query: str) -> str:
         return "karnataka"
     return "telangana"  # Default
 
-def create_fallback_response(text: str, language: str) -> dict:
+def create_fallback_response(text: str, language: str, translate: bool = True) -> dict:
     """Create a fallback response when JSON parsing fails."""
-    if language != 'en':
+    if translate and language != 'en':
         try:
-            text = translator.translate(text, src='en', dest=language).text
+            with stage("fallback"):
+                text = translate_text(text, dest=language, src='en')
         except:
             pass
     
@@ -188,227 +453,422 @@ def create_fallback_response(text: str, language: str) -> dict:
                 "animation": "Idle"
             },
             {
-                "text": "Is there anything else I can help with?",
+                "text": catalog_text(FALLBACK_FOLLOW_UPS[0], language),
                 "facialExpression": "smile",
                 "animation": "Talking_1"
             },
             {
-                "text": "Please let me know if you have more questions.",
+                "text": catalog_text(FALLBACK_FOLLOW_UPS[1], language),
                 "facialExpression": "default",
                 "animation": "Idle"
             }
         ]
     }
 
+def busy_reply(language: str) -> dict:
+    """Fallback-shaped reply used when the LLM gateway sheds a request."""
+    return create_fallback_response(catalog_text(BUSY_MESSAGE, language), language, translate=False)
+
+def busy_response(payload: dict, error: LLMUnavailable):
+    """503 with Retry-After so clients back off while the LLM is overloaded."""
+    resp = jsonify(payload)
+    resp.status_code = 503
+    resp.headers['Retry-After'] = str(int(error.retry_after))
+    return resp
+
 # ==========================
 # Event Management Endpoints
 # ==========================
 
-EVENT_TYPES = {
-    "hackathon": {"name": "Hackathon AI", "icon": "💻", "color": "from-blue-500 to-indigo-600"},
-    "wedding": {"name": "Wedding AI", "icon": "💒", "color": "from-pink-500 to-rose-600"},
-    "birthday": {"name": "Birthday AI", "icon": "🎂", "color": "from-yellow-400 to-orange-500"},
-    "corporate": {"name": "Corporate AI", "icon": "🏢", "color": "from-gray-500 to-blue-700"},
-    "concert": {"name": "Concert AI", "icon": "🎵", "color": "from-purple-500 to-fuchsia-600"},
-    "festival": {"name": "Fest AI", "icon": "🎪", "color": "from-green-500 to-teal-600"},
-    "sports": {"name": "Sports AI", "icon": "⚽", "color": "from-red-500 to-orange-600"},
-    "school": {"name": "School AI", "icon": "🏫", "color": "from-emerald-500 to-teal-600"},
-    "christmas": {"name": "Christmas AI", "icon": "🎄", "color": "from-red-500 to-green-600"}
-}
-
-EVENT_QUESTIONS = {
-    "default": [
-        {"step": 1, "key": "date", "label": "Date", "question": "When is the event?", "placeholder": "20 Oct 2025"},
-        {"step": 2, "key": "venue", "label": "Venue", "question": "Where will it take place?", "placeholder": "Convention Center"},
-        {"step": 3, "key": "people", "label": "People", "question": "How many attendees?", "placeholder": "300 attendees"},
-        {"step": 4, "key": "time", "label": "Time", "question": "What's the duration or start time?", "placeholder": "2 days"},
-        {"step": 5, "key": "budget", "label": "Budget", "question": "What's your budget?", "placeholder": "₹5,00,000"},
-    ],
-    "hackathon": [
-        {"step": 1, "key": "date", "label": "Hackathon Dates", "question": "When will the hackathon run?", "placeholder": "12-14 Dec 2025"},
-        {"step": 2, "key": "venue", "label": "Venue", "question": "Where is the venue (campus/tech park)?", "placeholder": "NIT Auditorium"},
-        {"step": 3, "key": "people", "label": "Participants", "question": "Expected number of hackers/teams?", "placeholder": "200 hackers"},
-        {"step": 4, "key": "time", "label": "Duration", "question": "Event duration and daily schedule?", "placeholder": "48 hours with opening/closing"},
-        {"step": 5, "key": "budget", "label": "Budget", "question": "Overall budget?", "placeholder": "₹8,00,000"},
-    ],
-    "wedding": [
-        {"step": 1, "key": "date", "label": "Wedding Date", "question": "What is the wedding date?", "placeholder": "21 Jan 2026"},
-        {"step": 2, "key": "venue", "label": "Venue", "question": "Which venue or city?", "placeholder": "Sri Mahal, Coimbatore"},
-        {"step": 3, "key": "people", "label": "Guests", "question": "Approximate guest count?", "placeholder": "500 guests"},
-        {"step": 4, "key": "time", "label": "Ceremony Timing", "question": "Muhurtham / ceremony start time?", "placeholder": "6:30 AM"},
-        {"step": 5, "key": "budget", "label": "Budget", "question": "Overall budget?", "placeholder": "₹15,00,000"},
-    ],
-    "birthday": [
-        {"step": 1, "key": "date", "label": "Date", "question": "When is the birthday?", "placeholder": "10 Feb 2026"},
-        {"step": 2, "key": "venue", "label": "Venue", "question": "Where is the party venue?", "placeholder": "Home / Party Hall"},
-        {"step": 3, "key": "people", "label": "Guests", "question": "Guest count (kids/adults)?", "placeholder": "30 kids, 20 adults"},
-        {"step": 4, "key": "time", "label": "Time", "question": "Start time and duration?", "placeholder": "5 PM, 3 hours"},
-        {"step": 5, "key": "budget", "label": "Budget", "question": "Budget range?", "placeholder": "₹50,000"},
-    ],
-    "corporate": [
-        {"step": 1, "key": "date", "label": "Event Date", "question": "When is the corporate event?", "placeholder": "5 Mar 2026"},
-        {"step": 2, "key": "venue", "label": "Venue", "question": "Where will it be hosted?", "placeholder": "Hotel Ballroom"},
-        {"step": 3, "key": "people", "label": "Attendees", "question": "Expected attendee count?", "placeholder": "250"},
-        {"step": 4, "key": "time", "label": "Agenda", "question": "Agenda duration and key sessions?", "placeholder": "9 AM–6 PM"},
-        {"step": 5, "key": "budget", "label": "Budget", "question": "Budget?", "placeholder": "₹10,00,000"},
-    ],
-    "concert": [
-        {"step": 1, "key": "date", "label": "Concert Date", "question": "When is the concert?", "placeholder": "18 Apr 2026"},
-        {"step": 2, "key": "venue", "label": "Venue", "question": "Which venue?", "placeholder": "Open Grounds"},
-        {"step": 3, "key": "people", "label": "Audience", "question": "Expected audience size?", "placeholder": "5,000"},
-        {"step": 4, "key": "time", "label": "Show Time", "question": "Start time and run time?", "placeholder": "7 PM, 3 hours"},
-        {"step": 5, "key": "budget", "label": "Budget", "question": "Budget?", "placeholder": "₹50,00,000"},
-    ],
-    "festival": [
-        {"step": 1, "key": "date", "label": "Festival Dates", "question": "Festival dates?", "placeholder": "1–3 May 2026"},
-        {"step": 2, "key": "venue", "label": "Venue", "question": "Location and grounds?", "placeholder": "City Fairgrounds"},
-        {"step": 3, "key": "people", "label": "Crowd", "question": "Expected daily footfall?", "placeholder": "10,000/day"},
-        {"step": 4, "key": "time", "label": "Hours", "question": "Daily operating hours?", "placeholder": "10 AM–10 PM"},
-        {"step": 5, "key": "budget", "label": "Budget", "question": "Budget?", "placeholder": "₹1,00,00,000"},
-    ],
-    "sports": [
-        {"step": 1, "key": "date", "label": "Match Dates", "question": "Event dates?", "placeholder": "8–10 Jun 2026"},
-        {"step": 2, "key": "venue", "label": "Venue", "question": "Stadium/ground?", "placeholder": "City Stadium"},
-        {"step": 3, "key": "people", "label": "Teams/Players", "question": "How many teams/players?", "placeholder": "8 teams"},
-        {"step": 4, "key": "time", "label": "Schedule", "question": "Match schedule pattern?", "placeholder": "League + Finals"},
-        {"step": 5, "key": "budget", "label": "Budget", "question": "Budget?", "placeholder": "₹12,00,000"},
-    ],
-    "school": [
-        {"step": 1, "key": "date", "label": "Event Date", "question": "When is the school event?", "placeholder": "15 Aug 2026"},
-        {"step": 2, "key": "venue", "label": "Venue", "question": "School block / ground?", "placeholder": "Main Auditorium"},
-        {"step": 3, "key": "people", "label": "Participants", "question": "Students/parents/teachers count?", "placeholder": "800 students, 200 parents"},
-        {"step": 4, "key": "time", "label": "Agenda", "question": "Start time and schedule?", "placeholder": "9 AM–1 PM"},
-        {"step": 5, "key": "budget", "label": "Budget", "question": "Budget?", "placeholder": "₹2,50,000"},
-    ],
-    "christmas": [
-        {"step": 1, "key": "date", "label": "Celebration Date", "question": "When is the celebration?", "placeholder": "24–25 Dec 2026"},
-        {"step": 2, "key": "venue", "label": "Venue", "question": "Church/Hall/Community center?", "placeholder": "St. Mary's Church Hall"},
-        {"step": 3, "key": "people", "label": "Attendees", "question": "Expected attendees?", "placeholder": "600"},
-        {"step": 4, "key": "time", "label": "Program Timing", "question": "Mass/time & cultural programs?", "placeholder": "7 PM Mass, 8–10 PM cultural"},
-        {"step": 5, "key": "budget", "label": "Budget", "question": "Budget?", "placeholder": "₹3,00,000"},
-    ],
-}
-
-@app.route('/api/event-types', methods=['GET'])
+def catalog_response(payload: dict, etag: str):
+    """JSON response with a strong ETag; answers 304 when the client already has it."""
+    resp = jsonify(payload)
+    resp.set_etag(etag)
+    resp.headers['Cache-Control'] = 'public, max-age=300'
+    return resp.make_conditional(request)
+
+
+@api.route('/api/event-types', methods=['GET'])
 def get_event_types():
-    return jsonify({"event_types": EVENT_TYPES})
+    lang = request.args.get('lang', 'en').lower()
+    event_types, etag = localized_event_types(lang)
+    return catalog_response({"event_types": event_types}, etag)
 
 
-@app.route('/api/event-questions/<event_type>', methods=['GET'])
+@api.route('/api/event-questions/<event_type>', methods=['GET'])
 def get_event_questions(event_type: str):
-    qs = EVENT_QUESTIONS.get(event_type, EVENT_QUESTIONS["default"]) or []
     lang = request.args.get('lang', 'en').lower()
+    qs, etag = localized_questions(event_type, lang)
+    return catalog_response({"questions": qs}, etag)
+
+
+def plan_messages(event_type: str, answers: dict) -> List:
+    """System prompt + rendered event-plan prompt for one submission."""
+    from langchain_core.messages import HumanMessage, SystemMessage
+    with stage("plan_prompt"):
+        prompt = prompts.get("event_plan").render(
+            event_type=event_type,
+            guidance=EVENT_PROMPTS.get(event_type, ''),
+            date=answers.get('date', ''),
+            venue=answers.get('venue', ''),
+            people=answers.get('people', ''),
+            time=answers.get('time', ''),
+            budget=answers.get('budget', ''),
+        )
+
+    return [
+        SystemMessage(content=load_prompt()),
+        HumanMessage(content=prompt)
+    ]
+
+def finish_event_plan(content: str, event_type: str, lang: str) -> Tuple[dict, bool]:
+    """JSON-parse the plan, translate it and add the spoken summary.
+
+    Returns the response payload and whether the LLM output parsed as JSON
+    (unparsed plans are not worth caching).
+    """
+    plan_json = None
+    parsed = True
+    try:
+        with stage("json_parse"):
+            plan_json = json.loads(content)
+    except json.JSONDecodeError:
+        # If not JSON, wrap as simple text plan
+        plan_json = {"overview": content}
+        parsed = False
+    record_json_parse(parsed)
+    return package_event_plan(plan_json, event_type, lang), parsed
+
+def section_messages(event_type: str, answers: dict, section: str) -> List:
+    """Prompt for a single plan section (sectioned generation mode)."""
+    from langchain_core.messages import HumanMessage
+    prompt = prompts.get("event_plan_section").render(
+        event_type=event_type,
+        section=section,
+        section_hint=PLAN_SECTIONS.get(section, ''),
+        guidance=EVENT_PROMPTS.get(event_type, ''),
+        date=answers.get('date', ''),
+        venue=answers.get('venue', ''),
+        people=answers.get('people', ''),
+        time=answers.get('time', ''),
+        budget=answers.get('budget', ''),
+    )
+    return [HumanMessage(content=prompt)]
+
+def package_event_plan(plan_json: dict, event_type: str, lang: str) -> dict:
+    """Translate plan_json if needed and wrap it with the spoken summary."""
+    # Translate plan_json values if non-English requested (batched, deduplicated leaves)
     if lang and lang != 'en':
         try:
-            def tr_text(text: str) -> str:
-                try:
-                    return translator.translate(text, src='en', dest=lang).text
-                except Exception:
-                    return text
-            translated = []
-            for q in qs:
-                if not isinstance(q, dict):
-                    continue
-                q2 = dict(q)
-                if 'label' in q2 and isinstance(q2['label'], str):
-                    q2['label'] = tr_text(q2['label'])
-                if 'question' in q2 and isinstance(q2['question'], str):
-                    q2['question'] = tr_text(q2['question'])
-                if 'placeholder' in q2 and isinstance(q2['placeholder'], str):
-                    q2['placeholder'] = tr_text(q2['placeholder'])
-                translated.append(q2)
-            qs = translated
+            with stage("translate_plan"):
+                plan_json = translate_tree(plan_json, dest=lang, src='en')
         except Exception:
             pass
-    return jsonify({"questions": qs})
 
+    # Create a short spoken summary (in target language)
+    with stage("summary"):
+        summary_text = catalog_text(PLAN_SUMMARY.format(event_type=event_type), lang)
 
-@app.route('/api/event-plan', methods=['POST'])
+    response_payload = {
+        "html_response": (
+            f"<div class='bg-purple-600/70 text-white p-4 rounded-lg max-w-md mx-auto'>{summary_text}</div>"
+        ),
+        "messages": [
+            {"text": summary_text, "facialExpression": "smile", "animation": "Talking_1"}
+        ],
+        "plan_json": plan_json
+    }
+    return response_payload
+
+def build_event_plan(event_type: str, answers: dict, lang: str, mode: str = None,
+                     on_section=None) -> Tuple[dict, bool]:
+    """Run the full plan pipeline synchronously.
+
+    In "sectioned" mode the nine sections are requested concurrently and only
+    the ones that fail to parse are retried; on_section(section, value) sees
+    each one (untranslated) as it arrives.
+    """
+    if (mode or PLAN_GENERATION_MODE) == "sectioned":
+        decision = router.route("plan_section")
+        with stage("llm_sections"):
+            plan_json, failed = generate_sections(
+                lambda messages: invoke_llm(messages, decision, contains_json),
+                lambda section: section_messages(event_type, answers, section),
+                on_section=on_section,
+            )
+        record_json_parse(not failed)
+        return package_event_plan(plan_json, event_type, lang), not failed
+
+    result = invoke_llm(plan_messages(event_type, answers), router.route("plan"))
+    content = result.content if isinstance(result.content, str) else str(result.content)
+    return finish_event_plan(content, event_type, lang)
+
+def offline_plan_payload(data: dict, reason: str) -> dict:
+    """Plan payload from the offline generator for a degraded (slo/error) answer."""
+    event_type = data.get('event_type', 'event')
+    with stage("offline_plan"):
+        plan_json = build_offline_plan(event_type, data.get('answers', {}))
+    metrics.PLAN_DEGRADED.inc(reason=reason)
+    return package_event_plan(plan_json, event_type, data.get('language', 'en'))
+
+def offline_plan_body(payload: dict, job: dict = None) -> dict:
+    """Body of a degraded answer; with job, where to poll for the LLM plan still building."""
+    body = {"response": payload, "degraded": True}
+    if job is not None:
+        body.update(job_id=job['job_id'], poll=f"/api/event-plan/jobs/{job['job_id']}")
+    return body
+
+def offline_plan_response(data: dict, reason: str, cache_status: str, job: dict = None):
+    """Degraded answer from the offline plan generator, in the normal response shape."""
+    resp = jsonify(offline_plan_body(offline_plan_payload(data, reason), job))
+    resp.headers['X-Cache'] = cache_status
+    resp.headers['X-Plan-Source'] = 'offline'
+    return resp
+
+def plan_failure_response(data: dict, error: Exception):
+    """Offline plan for a failed LLM plan; busy or JSON 500 reply if that fails too."""
+    if PLAN_OFFLINE_FALLBACK and data:
+        try:
+            return offline_plan_response(data, "error", "bypass")
+        except Exception as e:
+            logger.error(f"Offline plan failed: {e}")
+    if isinstance(error, LLMUnavailable):
+        return busy_response({"response": busy_reply(data.get('language', 'en'))}, error)
+    return jsonify({"error": "Failed to generate plan"}), 500
+
+@api.route('/api/event-plan', methods=['POST'])
 def generate_event_plan():
+    data = {}
     try:
         data = request.get_json(force=True)
-        event_type = data.get('event_type', 'event')
-        answers = data.get('answers', {})
-        lang = data.get('language', 'en')
-
-        # Event-specific prompt enrichment
-        EVENT_PROMPTS = {
-            "hackathon": "Focus on tracks, judging criteria, mentor slots, API partners, and submission process.",
-            "wedding": "Include rituals timeline, vendor coordination (decor, catering, photography), guest flow, and contingency for weather.",
-            "birthday": "Suggest theme, games/activities, decor, cake timing, return gifts, and kid-friendly logistics.",
-            "corporate": "Emphasize agenda, AV needs, registration flow, speaker management, and breakout sessions.",
-            "concert": "Cover stage plot, sound/lighting, artist rider, security, ticketing, and entry/exit flow.",
-            "festival": "Include multi-stage scheduling, stall/vendor zoning, crowd control, permissions, and sanitation.",
-            "sports": "Detail fixtures/schedule, officials, equipment, medical/safety, scorekeeping, and audience seating.",
-            "school": "Plan inauguration, student performances, prize distribution, safety, discipline committees, and parent management.",
-            "christmas": "Plan Mass/service timings, carols, nativity play, decor/lights, food distribution, crowd and parking management."
-        }
-
-        prompt = (
-            f"You are an expert {event_type} event planner. Using the inputs below, generate a detailed, structured event management plan strictly as a SINGLE VALID JSON object with keys: "
-            f"overview, timeline, venue_layout, logistics, staffing_roles, budget_breakdown, vendors, risk_contingency, next_steps. "
-            f"Do not add any explanations or markdown. Return ONLY JSON. Use INR symbols where applicable. "
-            f"Additional guidance: {EVENT_PROMPTS.get(event_type, '')}\n\n"
-            f"Inputs:\n"
-            f"- Date: {answers.get('date','')}\n"
-            f"- Venue: {answers.get('venue','')}\n"
-            f"- People: {answers.get('people','')}\n"
-            f"- Time/Duration: {answers.get('time','')}\n"
-            f"- Budget: {answers.get('budget','')}\n"
+        try:
+            plan = normalize_plan_request(data)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        data = {**data, **plan}
+        event_type, answers, lang, mode = plan['event_type'], plan['answers'], plan['language'], plan['mode']
+        no_cache = bool(data.get('no_cache', False))
+        build = lambda: build_event_plan(event_type, answers, lang, mode)
+
+        if PLAN_LLM_SLO_MS > 0:
+            job = start_plan_job(data)
+            return slo_plan_response(data, plan_jobs.wait_within(job['job_id'], PLAN_LLM_SLO_MS / 1000) or job)
+        response_payload, cache_status = get_or_build_plan(
+            event_type, answers, lang, build, no_cache=no_cache, mode=mode
         )
+        resp = jsonify({"response": response_payload})
+        resp.headers['X-Cache'] = cache_status
+        resp.headers['X-Plan-Source'] = 'llm'
+        return resp
+    except LLMUnavailable as e:
+        return plan_failure_response(data, e)
+    except Exception as e:
+        logger.error(f"/api/event-plan error: {e}")
+        return plan_failure_response(data, e)
 
-        result = llm.invoke([
-            SystemMessage(content=load_prompt()),
-            HumanMessage(content=prompt)
-        ])
-        content = result.content if isinstance(result.content, str) else str(result.content)
+def run_plan_job(data: dict, on_section) -> Tuple[dict, dict]:
+    """Plan pipeline for the job API: no SLO cut-off, sections published as they finish."""
+    event_type = data.get('event_type', 'event')
+    answers = data.get('answers', {})
+    lang = data.get('language', 'en')
 
-        plan_json = None
-        try:
-            plan_json = json.loads(content)
-        except json.JSONDecodeError:
-            # If not JSON, wrap as simple text plan
-            plan_json = {"overview": content}
-
-        # Translate plan_json values if non-English requested
-        if lang and lang != 'en':
+    def publish(section, value):
+        # Translating here warms the cache for the final translate_tree pass
+        if lang != 'en':
             try:
-                def tr(val):
-                    if isinstance(val, str):
-                        return translator.translate(val, src='en', dest=lang).text
-                    if isinstance(val, list):
-                        return [tr(v) for v in val]
-                    if isinstance(val, dict):
-                        return {k: tr(v) for k, v in val.items()}
-                    return val
-                plan_json = tr(plan_json)
+                value = translate_tree(value, dest=lang, src='en')
             except Exception:
                 pass
+        on_section(section, value)
 
-        # Create a short spoken summary (in target language)
-        summary_text = (
-            f"I've prepared a detailed {event_type} plan based on your inputs. You can review the full plan on the left panel."
+    mode = data.get('mode') or PLAN_JOB_MODE
+    build = lambda: build_event_plan(event_type, answers, lang, mode, publish)
+    try:
+        payload, cache_status = get_or_build_plan(
+            event_type, answers, lang, build, no_cache=bool(data.get('no_cache', False)), mode=mode
         )
-        if lang and lang != 'en':
-            try:
-                summary_text = translator.translate(summary_text, src='en', dest=lang).text
-            except Exception:
-                pass
-
-        plan_text_for_message = None  # avoid speaking JSON
-        response_payload = {
-            "html_response": (
-                f"<div class='bg-purple-600/70 text-white p-4 rounded-lg max-w-md mx-auto'>{summary_text}</div>"
-            ),
-            "messages": [
-                {"text": summary_text, "facialExpression": "smile", "animation": "Talking_1"}
-            ],
-            "plan_json": plan_json
-        }
-        return jsonify({"response": response_payload})
+        return payload, {"source": "llm", "cache": cache_status}
     except Exception as e:
-        logger.error(f"/api/event-plan error: {e}")
-        return jsonify({"error": "Failed to generate plan"}), 500
+        if not PLAN_OFFLINE_FALLBACK:
+            raise
+        logger.warning(f"Plan job falling back to the offline plan: {e}")
+        return offline_plan_payload(data, "error"), {"source": "offline", "cache": "bypass", "degraded": True}
+
+plan_jobs = PlanJobs(run_plan_job)
+
+metrics.gauge("plan_jobs_in_progress", "Event plan jobs queued or running in this process.",
+              lambda: {(state,): count for state, count in plan_jobs.stats().items()}, ("state",))
+
+def job_error(job: dict) -> Exception:
+    """Exception matching a failed job's error, for plan_failure_response."""
+    error = job['error'] or "generation_failed"
+    return RuntimeError(error) if error == "generation_failed" else LLMUnavailable(error)
+
+def slo_plan_response(data: dict, job: dict):
+    """Answer for a plan run as a job under the SLO.
+
+    A job still building past the SLO is answered with the offline plan and
+    the job to poll for the LLM plan.
+    """
+    if job['status'] == 'done':
+        body = {"response": job['response']}
+        if job['degraded']:
+            body['degraded'] = True
+        resp = jsonify(body)
+        resp.headers['X-Cache'] = job['cache'] or 'miss'
+        resp.headers['X-Plan-Source'] = job['source'] or 'llm'
+        return resp
+    if job['status'] == 'failed':
+        return plan_failure_response(data, job_error(job))
+    return offline_plan_response(data, "slo", "pending", job)
+
+def start_plan_job(data: dict) -> dict:
+    """Submit a plan job; one already in the plan cache completes immediately.
+
+    data must already be normalized with normalize_plan_request.
+    """
+    cached = None
+    if not data.get('no_cache'):
+        key = plan_cache_key(data['event_type'], data['answers'], data['language'], data['mode'])
+        cached = plan_cache.get(key)
+    return plan_jobs.submit(data, done=cached)
+
+@api.route('/api/event-plan/jobs', methods=['POST'])
+def submit_event_plan_job():
+    """Start a plan in the background; answers 202 with the job to poll (200 if cached)."""
+    data = request.get_json(force=True)
+    try:
+        plan = normalize_plan_request(data, PLAN_JOB_MODE)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    data = {**data, **plan}
+    try:
+        job = start_plan_job(data)
+    except LLMUnavailable as e:
+        return busy_response({"response": busy_reply(data.get('language', 'en'))}, e)
+    except Exception as e:
+        logger.error(f"/api/event-plan/jobs error: {e}")
+        return jsonify({"error": "Failed to start plan job"}), 500
+    resp = jsonify(job_view(job, len(PLAN_SECTIONS)))
+    resp.status_code = 200 if job['status'] == 'done' else 202
+    resp.headers['Location'] = f"/api/event-plan/jobs/{job['job_id']}"
+    return resp
+
+@api.route('/api/event-plan/jobs/<job_id>', methods=['GET'])
+def get_event_plan_job(job_id: str):
+    """Job status, finished sections and, once done, the response payload.
+
+    ?wait=N long-polls up to N seconds (capped) for a change past ?since=<version>.
+    """
+    try:
+        wait = float(request.args.get('wait', 0))
+        since = int(request.args.get('since', -1))
+    except ValueError:
+        return jsonify({"error": "wait and since must be numbers"}), 400
+    job = plan_jobs.wait(job_id, since, wait) if wait > 0 else plan_jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown or expired job"}), 404
+    return jsonify(job_view(job, len(PLAN_SECTIONS)))
+
+def batch_base_plan(item: dict, no_cache: bool = False) -> Tuple[dict, str, bool]:
+    """English plan shared by the batch items with the same event and answers."""
+    event_type, answers = item['event_type'], item['answers']
+    built = {}
+
+    def build():
+        payload, cacheable = build_event_plan(event_type, answers, 'en', item['mode'])
+        built['cacheable'] = cacheable
+        return payload, cacheable
+
+    payload, cache_status = get_or_build_plan(event_type, answers, 'en', build, no_cache=no_cache, mode=item['mode'])
+    return payload, cache_status, built.get('cacheable', True)
+
+def batch_localize(item: dict, base: Tuple[dict, str, bool], no_cache: bool = False) -> Tuple[dict, dict]:
+    """The item's payload: the base plan itself for English, else a cached translation of it."""
+    payload, cache_status, cacheable = base
+    lang = item['language']
+    if lang == 'en':
+        return payload, {"cache": cache_status, "source": "llm"}
+    build = lambda: (package_event_plan(payload['plan_json'], item['event_type'], lang), cacheable)
+    localized, cache_status = get_or_build_plan(item['event_type'], item['answers'], lang, build,
+                                                no_cache=no_cache, mode=item['mode'])
+    return localized, {"cache": cache_status, "source": "llm"}
+
+def batch_fallback(item: dict, error: Exception) -> Tuple[dict, dict]:
+    if not PLAN_OFFLINE_FALLBACK:
+        raise error
+    return offline_plan_payload(item, "error"), {"cache": "bypass", "source": "offline", "degraded": True}
+
+def run_plan_batch(items: List, no_cache: bool = False) -> dict:
+    """Plan a batch: one LLM plan per distinct event/answers, translated per language."""
+    results = run_batch(
+        items,
+        lambda item: batch_base_plan(item, no_cache),
+        lambda item, base: batch_localize(item, base, no_cache),
+        batch_fallback,
+    )
+    ok = sum(1 for r in results if r['status'] == 'ok')
+    return {"results": results, "succeeded": ok, "failed": len(results) - ok}
+
+@api.route('/api/event-plan/batch', methods=['POST'])
+def generate_event_plan_batch():
+    """Several plans in one request; per-item errors never fail the batch."""
+    data = request.get_json(force=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({"error": "Request body must be a JSON object"}), 400
+    items = data.get('items')
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "items must be a non-empty list"}), 400
+    if len(items) > PLAN_BATCH_MAX_ITEMS:
+        return jsonify({"error": f"at most {PLAN_BATCH_MAX_ITEMS} items per batch"}), 400
+    try:
+        return jsonify(run_plan_batch(items, bool(data.get('no_cache', False))))
+    except Exception as e:
+        logger.error(f"/api/event-plan/batch error: {e}")
+        return jsonify({"error": "Failed to generate plans"}), 500
+
+# How heavy clients are prepared: "background" (thread started by create_app),
+# "sync" (before create_app returns), "postfork" (gunicorn.conf.py starts the
+# thread in each worker after fork) or "off" (on first use).
+WARMUP = os.environ.get("WARMUP", "background").lower()
+_warm = threading.Event()
+_warm_lock = threading.Lock()
+
+def warm_up() -> None:
+    """Import the LLM and translation stacks and build their clients ahead of the first request."""
+    with _warm_lock:
+        if _warm.is_set():
+            return
+        start = time.perf_counter()
+        try:
+            import langchain_core.messages  # noqa: F401
+            get_llm("large")
+            get_llm("small")
+            get_translator()
+            warm_translation_clients()
+            prompts.token_report()
+        except Exception as e:
+            logger.error(f"Warm-up failed: {str(e)}")
+            return
+        _warm.set()
+        logger.info(f"Warm-up finished in {(time.perf_counter() - start) * 1000:.0f}ms")
+
+def is_warm() -> bool:
+    return _warm.is_set()
+
+def create_app() -> Flask:
+    """Build the Flask app; heavy clients are left to warm_up() per WARMUP."""
+    flask_app = Flask(__name__)
+    # Permissive CORS for browser deployments (Vercel/Render)
+    CORS(flask_app, resources={r"/*": {"origins": "*"}})
+    flask_app.register_blueprint(api)
+    if WARMUP == "sync":
+        warm_up()
+    elif WARMUP == "background":
+        threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+    return flask_app
+
+app = create_app()
 
 if __name__ == '__main__':
     port = int(os.environ.get("PORT", 5000))
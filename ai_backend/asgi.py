@@ -0,0 +1,289 @@
+"""Async (ASGI) serving mode with the same endpoints as the Flask app.
+
+LLM calls use ChatGroq.ainvoke, so one process can hold hundreds of in-flight
+requests; translation, SQLite and other blocking steps run on a bounded
+thread pool instead of the event loop. Run with:
+
+    hypercorn asgi:app --bind 0.0.0.0:$PORT
+"""
+import asyncio
+import contextvars
+import functools
+import logging
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from quart import Quart, Response, jsonify, request
+from quart_cors import cors
+
+import app as core
+import metrics
+from catalog import localized_event_types, localized_questions
+from offline_plan import PLAN_LLM_SLO_MS, PLAN_OFFLINE_FALLBACK
+from plan_cache import aget_or_build_plan, normalize_plan_request
+from plan_batch import PLAN_BATCH_MAX_ITEMS
+from plan_jobs import PLAN_JOB_MAX_WAIT, PLAN_JOB_MODE, TERMINAL, budget_left, job_view
+from llm_gateway import LLMUnavailable, message_tokens, start_deadline
+from model_router import contains_json, is_json_object
+from sectioned_plan import agenerate_sections
+
+logger = logging.getLogger(__name__)
+
+app = cors(Quart(__name__), allow_origin="*")
+
+# Blocking work (googletrans, SQLite, JSON post-processing) is bounded here
+_blocking = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("ASYNC_BLOCKING_WORKERS", 32)),
+    thread_name_prefix="asgi-blocking",
+)
+
+
+async def offload(fn, *args):
+    """Run a blocking helper from app.py without stalling the event loop."""
+    # Carry the request's metrics context into the worker thread
+    call = functools.partial(contextvars.copy_context().run, fn, *args)
+    return await asyncio.get_running_loop().run_in_executor(_blocking, call)
+
+
+async def ainvoke_llm(messages, decision=None, validate=is_json_object):
+    """Async counterpart of app.invoke_llm."""
+    if decision is not None:
+        return await core.router.ainvoke(messages, decision, validate)
+    with metrics.stage("llm_invoke"):
+        result = await core.gateway.acall(lambda: core.get_llm().ainvoke(messages), "background",
+                                          message_tokens(messages))
+    metrics.record_llm_usage(result)
+    return result
+
+
+def catalog_response(payload: dict, etag: str):
+    """JSON response with a strong ETag; answers 304 when the client already has it."""
+    headers = {"ETag": f'"{etag}"', "Cache-Control": "public, max-age=300"}
+    if request.if_none_match.contains(etag):
+        return Response(b"", status=304, headers=headers)
+    resp = jsonify(payload)
+    resp.headers.update(headers)
+    return resp
+
+
+def busy_response(payload: dict, error: LLMUnavailable):
+    """503 with Retry-After so clients back off while the LLM is overloaded."""
+    resp = jsonify(payload)
+    resp.status_code = 503
+    resp.headers['Retry-After'] = str(int(error.retry_after))
+    return resp
+
+
+@app.before_request
+async def begin_request_metrics():
+    metrics.begin_request(request.endpoint or "unknown")
+    start_deadline()
+
+
+@app.after_request
+async def end_request_metrics(response):
+    metrics.end_request(response.status_code)
+    return response
+
+
+@app.route('/health', methods=['GET'])
+async def health():
+    return jsonify({"status": "ok", "warm": core.is_warm()})
+
+
+@app.route('/metrics', methods=['GET'])
+async def prometheus_metrics():
+    body = await offload(metrics.registry.render)
+    return Response(body, mimetype="text/plain; version=0.0.4")
+
+
+@app.route('/api/prompts', methods=['GET'])
+async def get_prompt_stats():
+    return jsonify({"prompt_tokens": core.prompts.token_report()})
+
+
+@app.route('/chat', methods=['POST'])
+async def chat():
+    """Async /chat: same request and response shape as app.chat()."""
+    try:
+        data = await request.get_json(force=True, silent=True) or {}
+        query = data.get('message')
+        conversation_id = data.get('conversation_id') or str(uuid.uuid4())
+        language = data.get('language', 'en').lower()
+
+        if not query:
+            return jsonify({"error": "Message parameter is required"}), 400
+
+        query = await offload(core.translate_query, query, language)
+        history, needs_compaction = await offload(core.build_chat_messages, conversation_id, query)
+
+        decision = core.router.route("chat", query, core.conversation_depth(history))
+        result = await ainvoke_llm(history, decision)
+        output_str = result.content
+        await offload(core.record_chat_turn, conversation_id, query, output_str, needs_compaction)
+
+        return jsonify({
+            "response": await offload(core.parse_chat_reply, output_str, language),
+            "conversation_id": conversation_id
+        })
+    except LLMUnavailable as e:
+        return busy_response({"response": core.busy_reply(language), "conversation_id": conversation_id}, e)
+    except Exception as e:
+        logger.error(f"Error in async chat endpoint: {str(e)}")
+        return jsonify({"error": "Internal server error"}), 500
+
+
+@app.route('/api/event-types', methods=['GET'])
+async def get_event_types():
+    lang = request.args.get('lang', 'en').lower()
+    event_types, etag = await offload(localized_event_types, lang)
+    return catalog_response({"event_types": event_types}, etag)
+
+
+@app.route('/api/event-questions/<event_type>', methods=['GET'])
+async def get_event_questions(event_type: str):
+    lang = request.args.get('lang', 'en').lower()
+    qs, etag = await offload(localized_questions, event_type, lang)
+    return catalog_response({"questions": qs}, etag)
+
+
+@app.route('/api/event-plan', methods=['POST'])
+async def generate_event_plan():
+    data = {}
+    try:
+        data = await request.get_json(force=True)
+        try:
+            plan = normalize_plan_request(data)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        data = {**data, **plan}
+        event_type, answers, lang, mode = plan['event_type'], plan['answers'], plan['language'], plan['mode']
+        no_cache = bool(data.get('no_cache', False))
+
+        async def build():
+            if mode == "sectioned":
+                decision = core.router.route("plan_section")
+                plan_json, failed = await agenerate_sections(
+                    lambda messages: ainvoke_llm(messages, decision, contains_json),
+                    lambda section: core.section_messages(event_type, answers, section)
+                )
+                metrics.record_json_parse(not failed)
+                payload = await offload(core.package_event_plan, plan_json, event_type, lang)
+                return payload, not failed
+            result = await ainvoke_llm(core.plan_messages(event_type, answers), core.router.route("plan"))
+            content = result.content if isinstance(result.content, str) else str(result.content)
+            return await offload(core.finish_event_plan, content, event_type, lang)
+
+        if PLAN_LLM_SLO_MS > 0:
+            job = await offload(core.start_plan_job, data)
+            # Poll on the event loop, as the job endpoint does
+            while job['status'] not in TERMINAL and budget_left(job, PLAN_LLM_SLO_MS / 1000) > 0:
+                await asyncio.sleep(min(budget_left(job, PLAN_LLM_SLO_MS / 1000), 0.25))
+                job = await offload(core.plan_jobs.get, job['job_id']) or job
+            if job['status'] == 'failed':
+                return await plan_failure_response(data, core.job_error(job))
+            if job['status'] != 'done':
+                return await offline_plan_response(data, "slo", "pending", job)
+            resp = jsonify({"response": job['response'], **({"degraded": True} if job['degraded'] else {})})
+            resp.headers['X-Cache'] = job['cache'] or 'miss'
+            resp.headers['X-Plan-Source'] = job['source'] or 'llm'
+            return resp
+        response_payload, cache_status = await aget_or_build_plan(
+            event_type, answers, lang, build, no_cache=no_cache, mode=mode
+        )
+        resp = jsonify({"response": response_payload})
+        resp.headers['X-Cache'] = cache_status
+        resp.headers['X-Plan-Source'] = 'llm'
+        return resp
+    except LLMUnavailable as e:
+        return await plan_failure_response(data, e)
+    except Exception as e:
+        logger.error(f"async /api/event-plan error: {e}")
+        return await plan_failure_response(data, e)
+
+
+async def plan_failure_response(data: dict, error: Exception):
+    """Async counterpart of app.plan_failure_response."""
+    if PLAN_OFFLINE_FALLBACK and data:
+        try:
+            return await offline_plan_response(data, "error", "bypass")
+        except Exception as e:
+            logger.error(f"Offline plan failed: {e}")
+    if isinstance(error, LLMUnavailable):
+        return busy_response({"response": core.busy_reply(data.get('language', 'en'))}, error)
+    return jsonify({"error": "Failed to generate plan"}), 500
+
+
+@app.route('/api/event-plan/jobs', methods=['POST'])
+async def submit_event_plan_job():
+    """Job API; the plan itself runs on the Flask module's job pool."""
+    data = await request.get_json(force=True)
+    try:
+        plan = normalize_plan_request(data, PLAN_JOB_MODE)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    data = {**data, **plan}
+    try:
+        job = await offload(core.start_plan_job, data)
+    except LLMUnavailable as e:
+        return busy_response({"response": core.busy_reply(data.get('language', 'en'))}, e)
+    except Exception as e:
+        logger.error(f"async /api/event-plan/jobs error: {e}")
+        return jsonify({"error": "Failed to start plan job"}), 500
+    resp = jsonify(job_view(job, len(core.PLAN_SECTIONS)))
+    resp.status_code = 200 if job['status'] == 'done' else 202
+    resp.headers['Location'] = f"/api/event-plan/jobs/{job['job_id']}"
+    return resp
+
+
+@app.route('/api/event-plan/jobs/<job_id>', methods=['GET'])
+async def get_event_plan_job(job_id: str):
+    """Long-polls on the event loop instead of holding a thread per waiting client."""
+    try:
+        wait = min(float(request.args.get('wait', 0)), PLAN_JOB_MAX_WAIT)
+        since = int(request.args.get('since', -1))
+    except ValueError:
+        return jsonify({"error": "wait and since must be numbers"}), 400
+    deadline = asyncio.get_running_loop().time() + wait
+    while True:
+        job = await offload(core.plan_jobs.get, job_id)
+        remaining = deadline - asyncio.get_running_loop().time()
+        if job is None or job['status'] in TERMINAL or job['version'] > since or remaining <= 0:
+            break
+        await asyncio.sleep(min(remaining, 0.25))
+    if job is None:
+        return jsonify({"error": "Unknown or expired job"}), 404
+    return jsonify(job_view(job, len(core.PLAN_SECTIONS)))
+
+
+@app.route('/api/event-plan/batch', methods=['POST'])
+async def generate_event_plan_batch():
+    """Batch API; items run on the plan_batch worker pool, off the event loop."""
+    data = await request.get_json(force=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({"error": "Request body must be a JSON object"}), 400
+    items = data.get('items')
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "items must be a non-empty list"}), 400
+    if len(items) > PLAN_BATCH_MAX_ITEMS:
+        return jsonify({"error": f"at most {PLAN_BATCH_MAX_ITEMS} items per batch"}), 400
+    try:
+        return jsonify(await offload(core.run_plan_batch, items, bool(data.get('no_cache', False))))
+    except Exception as e:
+        logger.error(f"async /api/event-plan/batch error: {e}")
+        return jsonify({"error": "Failed to generate plans"}), 500
+
+
+async def offline_plan_response(data: dict, reason: str, cache_status: str, job: dict = None):
+    """Async counterpart of app.offline_plan_response."""
+    payload = await offload(core.offline_plan_payload, data, reason)
+    resp = jsonify(core.offline_plan_body(payload, job))
+    resp.headers['X-Cache'] = cache_status
+    resp.headers['X-Plan-Source'] = 'offline'
+    return resp
+
+
+if __name__ == '__main__':
+    port = int(os.environ.get("PORT", 5000))
+    app.run(host="0.0.0.0", port=port)
@@ -0,0 +1,115 @@
+"""Cold-start breakdown: import time per top-level package, time to first /health,
+and how long warm_up() takes to build the LLM and translation clients.
+
+Each measurement runs in a fresh interpreter (python -X importtime), so the
+numbers reflect a real cold start. Compare the JSON output across commits, or
+pass --budget-ms to fail when importing app exceeds a budget.
+
+    cd ai_backend
+    python -m bench.import_time --top 15 --out import_time.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+from typing import Dict, List
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in the child: import the app, hit /health, then warm up, timing each step
+_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import app
+t1 = time.perf_counter()
+resp = app.app.test_client().get('/health')
+t2 = time.perf_counter()
+sys.stderr.write("--- warm_up ---\\n")
+app.warm_up()
+t3 = time.perf_counter()
+print(json.dumps({"import_ms": (t1 - t0) * 1000, "first_health_ms": (t2 - t0) * 1000,
+                  "health_status": resp.status_code, "warm_up_ms": (t3 - t2) * 1000}))
+"""
+
+
+def parse_importtime(stderr: str) -> List[Dict]:
+    """Rows of python -X importtime output: module, self and cumulative microseconds, depth."""
+    rows = []
+    for line in stderr.splitlines():
+        if line.startswith("--- "):
+            rows.append({"marker": line.strip("- \n")})
+            continue
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        self_us, cumulative_us, name = parts
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        rows.append({"module": name.strip(), "self_us": int(self_us), "cumulative_us": int(cumulative_us),
+                     "depth": depth})
+    return rows
+
+
+def by_package(rows: List[Dict]) -> Dict[str, float]:
+    """Self time summed per top-level package, in milliseconds."""
+    totals: Dict[str, float] = defaultdict(float)
+    for row in rows:
+        totals[row["module"].split(".")[0]] += row["self_us"] / 1000
+    return dict(sorted(totals.items(), key=lambda kv: kv[1], reverse=True))
+
+
+def main(argv=None) -> Dict:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top", type=int, default=15, help="packages to print")
+    parser.add_argument("--budget-ms", type=float, default=0, help="fail if importing app takes longer")
+    parser.add_argument("--out", default="", help="write the full report as JSON")
+    args = parser.parse_args(argv)
+
+    env = dict(os.environ)
+    env.setdefault("GROQ_API_KEY", "import-time")
+    env.setdefault("DATA_DIR", tempfile.mkdtemp(prefix="event-ai-import-"))
+    # Measure the lazy path; warm_up() is timed separately by the probe
+    env["WARMUP"] = "off"
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", _PROBE], cwd=BACKEND_DIR,
+                          env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        sys.stderr.write(proc.stderr[-4000:])
+        raise SystemExit(proc.returncode)
+    timings = json.loads(proc.stdout.strip().splitlines()[-1])
+    rows = parse_importtime(proc.stderr)
+    split = next((i for i, r in enumerate(rows) if r.get("marker") == "warm_up"), len(rows))
+    startup_rows, warm_rows = rows[:split], rows[split + 1:]
+    app_row = next((r for r in startup_rows if r["module"] == "app" and r["depth"] == 0), None)
+    packages = by_package(startup_rows)
+    deferred = by_package(warm_rows)
+
+    print(f"import app:        {timings['import_ms']:8.1f} ms")
+    print(f"first /health:     {timings['first_health_ms']:8.1f} ms (status {timings['health_status']})")
+    print(f"warm_up():         {timings['warm_up_ms']:8.1f} ms")
+    for title, table in (("imported by app", packages), ("deferred to warm_up()", deferred)):
+        print(f"\nSelf import time by package, {title} (top {args.top}):")
+        for name, ms in list(table.items())[:args.top]:
+            print(f"  {name:<28} {ms:8.1f} ms")
+
+    report = {
+        "timings_ms": timings,
+        "app_cumulative_ms": app_row["cumulative_us"] / 1000 if app_row else None,
+        "packages_ms": packages,
+        "warm_up_packages_ms": deferred,
+    }
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as out:
+            json.dump(report, out, indent=2)
+        print(f"\nWrote {args.out}")
+    if args.budget_ms and timings["import_ms"] > args.budget_ms:
+        print(f"\nimport app took {timings['import_ms']:.0f} ms, over the {args.budget_ms:.0f} ms budget")
+        raise SystemExit(1)
+    return report
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""Exercise knowledge.KnowledgeSource against a local stand-in for the courses API.
+
+The stand-in serves a fixed course list with a configurable delay and can be
+switched to fail, so the script walks through a cold fetch, fresh hits, a
+stale hit with background refresh, an upstream outage (last good snapshot
+served) and a cold start with the upstream down (fallback without waiting).
+
+    cd ai_backend
+    python -m bench.knowledge_source --delay 0.2 --out knowledge.json
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+COURSES = [
+    {"courseId": f"c{i}", "courseName": f"Course {i}", "courseDescription": f"Description of course {i}"}
+    for i in range(20)
+]
+
+
+class StandIn:
+    """Local courses API: serves COURSES after delay seconds, or 503 while failing."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.failing = False
+        self.requests = 0
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stand_in.requests += 1
+                time.sleep(stand_in.delay)
+                if stand_in.failing:
+                    self.send_response(503)
+                    self.end_headers()
+                    return
+                body = json.dumps(COURSES).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/api/courses/all"
+
+
+def timed(source) -> Dict:
+    start = time.perf_counter()
+    block = source.get()
+    return {"ms": round((time.perf_counter() - start) * 1000, 2), "lines": block.count("\n"),
+            "fallback": block == source.fallback}
+
+
+def main(argv=None) -> Dict:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--delay", type=float, default=0.2, help="stand-in response delay (seconds)")
+    parser.add_argument("--hits", type=int, default=200, help="lookups timed while the snapshot is fresh")
+    parser.add_argument("--out", default="", help="write the results as JSON")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("DATA_DIR", tempfile.mkdtemp(prefix="event-ai-knowledge-"))
+    from cache import TieredCache
+    from knowledge import KnowledgeSource, format_courses
+
+    stand_in = StandIn(args.delay)
+    snapshots = TieredCache("knowledge_bench", max_entries=4, ttl=3600, persistent=False)
+    source = KnowledgeSource("courses", stand_in.url, format_courses, fallback="unavailable",
+                             fresh_ttl=1.0, retry_after=1.0, snapshots=snapshots)
+    results: Dict = {"cold": timed(source)}
+
+    start = time.perf_counter()
+    for _ in range(args.hits):
+        source.get()
+    results["fresh_avg_ms"] = round((time.perf_counter() - start) * 1000 / args.hits, 4)
+
+    time.sleep(1.1)
+    results["stale"] = timed(source)
+    time.sleep(args.delay + 0.2)
+    results["after_refresh"] = timed(source)
+
+    stand_in.failing = True
+    time.sleep(1.1)
+    results["outage_stale"] = timed(source)
+    time.sleep(args.delay + 0.2)
+    results["outage_snapshot"] = timed(source)
+
+    cold_down = KnowledgeSource("courses_down", stand_in.url, format_courses, fallback="unavailable",
+                                retry_after=30, snapshots=snapshots)
+    results["cold_outage"] = timed(cold_down)
+    results["cold_outage_again"] = timed(cold_down)
+    results["upstream_requests"] = stand_in.requests
+    stand_in.server.shutdown()
+
+    for name, value in results.items():
+        print(f"{name:<18} {value}")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as out:
+            json.dump(results, out, indent=2)
+        print(f"\nWrote {args.out}")
+    return results
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,249 @@
+"""Offline load test for the backend.
+
+Starts the Flask app on a local port with the stand-in LLM and translator from
+bench/stubs.py, drives /chat, /api/event-plan and /api/event-questions at the
+requested concurrency, and writes throughput, latency percentiles and memory
+growth to a JSON file so results can be compared across commits.
+
+    cd ai_backend
+    python -m bench.run --requests 200 --concurrency 16 --languages en,ta --out bench.json
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+import requests  # noqa: E402
+
+from bench.stubs import StubChatModel, StubTranslator, install_translator_stub  # noqa: E402
+
+
+def rss_bytes() -> int:
+    """Current resident set size of this process (server and load generator)."""
+    try:
+        with open("/proc/self/status", "r") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict:
+    done = len(latencies)
+    return {
+        "requests": done + errors,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(done / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50) * 1000, 1),
+            "p95": round(percentile(latencies, 95) * 1000, 1),
+            "p99": round(percentile(latencies, 99) * 1000, 1),
+            "max": round(max(latencies) * 1000, 1) if latencies else 0.0,
+        },
+    }
+
+
+class Driver:
+    def __init__(self, base_url: str, languages: List[str], turns: int, no_cache: bool, seed: int,
+                 plan_mode: str = None):
+        self.base_url = base_url
+        self.plan_mode = plan_mode
+        self.languages = languages
+        self.turns = turns
+        self.no_cache = no_cache
+        self.random = random.Random(seed)
+        self.degraded = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            self._local.session = session
+        return session
+
+    def chat_session(self, i: int) -> List[float]:
+        """One multi-turn conversation; returns the latency of every turn."""
+        lang = self.languages[i % len(self.languages)]
+        conversation_id = None
+        latencies = []
+        for turn in range(self.turns):
+            body = {"message": f"Turn {turn}: help me plan a wedding for 300 guests", "language": lang}
+            if conversation_id:
+                body["conversation_id"] = conversation_id
+            start = time.perf_counter()
+            resp = self.session().post(f"{self.base_url}/chat", json=body, timeout=300)
+            latencies.append(time.perf_counter() - start)
+            resp.raise_for_status()
+            conversation_id = resp.json()["conversation_id"]
+        return latencies
+
+    def event_plan(self, i: int) -> List[float]:
+        from event_data import EVENT_QUESTIONS, EVENT_TYPES
+        event_type = list(EVENT_TYPES)[i % len(EVENT_TYPES)]
+        answers = {q["key"]: q["placeholder"] for q in EVENT_QUESTIONS[event_type]}
+        if i % 3:
+            answers["people"] = f"{100 + i} guests"
+        body = {"event_type": event_type, "answers": answers,
+                "language": self.languages[i % len(self.languages)], "no_cache": self.no_cache}
+        if self.plan_mode:
+            body["mode"] = self.plan_mode
+        start = time.perf_counter()
+        resp = self.session().post(f"{self.base_url}/api/event-plan", json=body, timeout=300)
+        latency = time.perf_counter() - start
+        resp.raise_for_status()
+        if resp.json().get("degraded"):
+            with self._lock:
+                self.degraded += 1
+        return [latency]
+
+    def event_questions(self, i: int) -> List[float]:
+        from event_data import EVENT_TYPES
+        event_type = list(EVENT_TYPES)[i % len(EVENT_TYPES)]
+        lang = self.languages[i % len(self.languages)]
+        start = time.perf_counter()
+        resp = self.session().get(f"{self.base_url}/api/event-questions/{event_type}?lang={lang}", timeout=60)
+        latency = time.perf_counter() - start
+        resp.raise_for_status()
+        return [latency]
+
+
+def run_scenario(fn, count: int, concurrency: int) -> Dict:
+    latencies: List[float] = []
+    errors = 0
+    lock = threading.Lock()
+
+    def one(i):
+        nonlocal errors
+        try:
+            result = fn(i)
+            with lock:
+                latencies.extend(result)
+        except Exception:
+            with lock:
+                errors += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(count)))
+    return summarize(latencies, errors, time.perf_counter() - start)
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        return "unknown"
+
+
+def main(argv=None) -> Dict:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default="chat,plan,questions")
+    parser.add_argument("--requests", type=int, default=100, help="requests (chat: sessions) per scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--turns", type=int, default=3, help="turns per chat session")
+    parser.add_argument("--languages", default="en,ta")
+    parser.add_argument("--llm-latency", type=float, default=0.3, help="seconds before the first token")
+    parser.add_argument("--token-rate", type=float, default=400.0, help="generated tokens per second, 0 = instant")
+    parser.add_argument("--broken-rate", type=float, default=0.0, help="fraction of replies with invalid JSON")
+    parser.add_argument("--translate-latency", type=float, default=0.05)
+    parser.add_argument("--plan-mode", choices=("single", "sectioned"), help="plan generation mode to request")
+    parser.add_argument("--rpm", type=float, default=15,
+                        help="LLM requests per minute per worker (15 as in render.yaml), 0 = unlimited")
+    parser.add_argument("--no-cache", action="store_true", help="send no_cache with every plan request")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", default="bench_results.json")
+    args = parser.parse_args(argv)
+
+    # Isolate caches and stores from any real deployment data
+    os.environ.setdefault("DATA_DIR", tempfile.mkdtemp(prefix="event-ai-bench-"))
+    os.environ.setdefault("GROQ_API_KEY", "bench")
+    # Shed load the way production does; --rpm 0 measures the app without the limiter
+    os.environ["LLM_REQUESTS_PER_MINUTE"] = str(args.rpm)
+    # The warm-up thread would race the stub models assigned after import
+    os.environ["WARMUP"] = "off"
+    install_translator_stub(args.translate_latency)
+
+    rss_before_import = rss_bytes()
+    import app as backend
+    from werkzeug.serving import make_server
+
+    backend.llm = StubChatModel(args.llm_latency, args.token_rate, args.broken_rate, args.seed)
+    # The small tier answers faster but breaks JSON more often
+    backend.small_llm = StubChatModel(args.llm_latency / 3, args.token_rate * 3,
+                                      min(1.0, args.broken_rate * 2), args.seed, model_name="stub-small")
+    server = make_server("127.0.0.1", 0, backend.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    driver = Driver(base_url, [l.strip() for l in args.languages.split(",") if l.strip()],
+                    args.turns, args.no_cache, args.seed, args.plan_mode)
+    scenarios = {
+        "chat": driver.chat_session,
+        "plan": driver.event_plan,
+        "questions": driver.event_questions,
+    }
+
+    rss_start = rss_bytes()
+    results = {}
+    for name in [s.strip() for s in args.scenarios.split(",") if s.strip()]:
+        llm_calls = backend.llm.calls + backend.small_llm.calls
+        translate_calls = StubTranslator.calls
+        degraded = driver.degraded
+        before = rss_bytes()
+        results[name] = run_scenario(scenarios[name], args.requests, args.concurrency)
+        results[name]["llm_calls"] = backend.llm.calls + backend.small_llm.calls - llm_calls
+        results[name]["translation_calls"] = StubTranslator.calls - translate_calls
+        results[name]["degraded"] = driver.degraded - degraded
+        results[name]["rss_growth_mb"] = round((rss_bytes() - before) / 2**20, 2)
+        print(f"{name:>10}: {json.dumps(results[name])}")
+    server.shutdown()
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": vars(args),
+        "memory_mb": {
+            "import": round((rss_start - rss_before_import) / 2**20, 2),
+            "start": round(rss_start / 2**20, 2),
+            "end": round(rss_bytes() / 2**20, 2),
+            "growth": round((rss_bytes() - rss_start) / 2**20, 2),
+        },
+        "scenarios": results,
+    }
+    with open(args.out, "w", encoding="utf-8") as out:
+        json.dump(report, out, indent=2)
+    print(f"Wrote {args.out}")
+    return report
+
+
+if __name__ == '__main__':
+    main()
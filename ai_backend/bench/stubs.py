@@ -0,0 +1,157 @@
+"""Local stand-ins for ChatGroq and googletrans used by the benchmark suite.
+
+Nothing here touches the network: the LLM stand-in sleeps for a configurable
+first-token latency plus a per-token generation time, and returns chat replies,
+event plans or summaries in the shapes the real model produces (optionally
+broken JSON). The translator stand-in prefixes each text segment with the
+target language.
+"""
+import asyncio
+import json
+import os
+import random
+import sys
+import threading
+import time
+import types
+from typing import Iterator, List
+
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from event_data import PLAN_SECTIONS  # noqa: E402
+
+# translation.py packs several texts into one request with this separator
+_SEPARATOR = "\n|||\n"
+
+
+def _chat_reply(query: str) -> str:
+    return json.dumps({
+        "html_response": f"<div class='bg-purple-600/70 text-white p-4 rounded-lg max-w-md mx-auto'>Here is my answer about {query[:40]}.</div>",
+        "messages": [
+            {"text": "Here is a quick answer for your event.", "facialExpression": "smile", "animation": "Talking_1"},
+            {"text": "Let me know if you want a detailed plan.", "facialExpression": "default", "animation": "Idle"},
+        ],
+    })
+
+
+def _plan_reply(sections: List[str]) -> str:
+    plan = {}
+    for section in sections:
+        if section == "timeline":
+            plan[section] = [{"time": f"{h}:00", "activity": f"Session {h}", "owner": "Coordinator"} for h in range(8, 20)]
+        elif section == "budget_breakdown":
+            plan[section] = [{"item": f"Item {i}", "amount": f"₹{(i + 1) * 25000:,}"} for i in range(8)]
+        elif section == "vendors":
+            plan[section] = [{"name": f"Vendor {i}", "service": "Catering", "contact": "+91 90000 0000"} for i in range(6)]
+        else:
+            plan[section] = [f"{section.replace('_', ' ').title()} point {i}" for i in range(5)]
+    return json.dumps(plan, ensure_ascii=False)
+
+
+class StubChatModel:
+    """Drop-in for ChatGroq's invoke/ainvoke/stream with simulated latency.
+
+    latency: seconds before the first token; token_rate: generated tokens per
+    second (0 = instant); broken_rate: fraction of replies returned as invalid JSON.
+    """
+
+    def __init__(self, latency: float = 0.5, token_rate: float = 200.0,
+                 broken_rate: float = 0.0, seed: int = 7, model_name: str = "stub-llm"):
+        self.latency = latency
+        self.token_rate = token_rate
+        self.broken_rate = broken_rate
+        self.model_name = model_name
+        self.calls = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _reply(self, messages) -> str:
+        system = messages[0].content if messages else ""
+        last = messages[-1].content if messages else ""
+        with self._lock:
+            self.calls += 1
+            broken = self._random.random() < self.broken_rate
+        if "running summary" in system:
+            return "The user is planning an event; key facts so far were discussed."
+        if "event management plan" in last or "event planner" in last:
+            requested = [s for s in PLAN_SECTIONS if s in last] or list(PLAN_SECTIONS)
+            text = _plan_reply(requested)
+        else:
+            text = _chat_reply(last)
+        if broken:
+            # Truncated output, the most common real-world failure
+            text = "Sure! " + text[: len(text) // 2]
+        return text
+
+    def _generation_time(self, text: str) -> float:
+        tokens = max(1, len(text) // 4)
+        return tokens / self.token_rate if self.token_rate > 0 else 0.0
+
+    def _message(self, text: str) -> AIMessage:
+        tokens = max(1, len(text) // 4)
+        return AIMessage(content=text, usage_metadata={
+            "input_tokens": 0, "output_tokens": tokens, "total_tokens": tokens,
+        })
+
+    def invoke(self, messages, **kwargs) -> AIMessage:
+        text = self._reply(messages)
+        time.sleep(self.latency + self._generation_time(text))
+        return self._message(text)
+
+    async def ainvoke(self, messages, **kwargs) -> AIMessage:
+        text = self._reply(messages)
+        await asyncio.sleep(self.latency + self._generation_time(text))
+        return self._message(text)
+
+    def stream(self, messages, **kwargs) -> Iterator[AIMessageChunk]:
+        text = self._reply(messages)
+        time.sleep(self.latency)
+        step = 16
+        per_chunk = self._generation_time(text[:step])
+        for i in range(0, len(text), step):
+            if per_chunk:
+                time.sleep(per_chunk)
+            yield AIMessageChunk(content=text[i:i + step])
+
+
+class _Translated:
+    def __init__(self, text: str, src: str, dest: str):
+        self.text = text
+        self.src = src
+        self.dest = dest
+
+
+class StubTranslator:
+    """googletrans.Translator stand-in with a fixed per-call latency."""
+
+    latency = 0.05
+    calls = 0
+    _lock = threading.Lock()
+
+    def translate(self, text, dest: str = 'en', src: str = 'auto'):
+        with StubTranslator._lock:
+            StubTranslator.calls += 1
+        time.sleep(self.latency)
+        if isinstance(text, list):
+            return [_Translated(self._translate(t, dest, src), src, dest) for t in text]
+        return _Translated(self._translate(text, dest, src), src, dest)
+
+    @staticmethod
+    def _translate(text: str, dest: str, src: str) -> str:
+        if dest == src:
+            return text
+        # Each packed segment is translated on its own, as the real service does
+        return _SEPARATOR.join(f"[{dest}] {segment}" for segment in text.split(_SEPARATOR))
+
+
+def install_translator_stub(latency: float) -> None:
+    """Register the stand-in as the googletrans module before the app imports it."""
+    StubTranslator.latency = latency
+    module = types.ModuleType("googletrans")
+    module.Translator = StubTranslator
+    module.LANGUAGES = {"en": "english", "ta": "tamil", "te": "telugu", "ml": "malayalam", "hi": "hindi"}
+    sys.modules["googletrans"] = module
@@ -0,0 +1,53 @@
+"""Precompile every static API string into catalog/<lang>.json.
+
+Usage: python build_catalog.py [--force] [lang ...]
+
+Only strings missing from an existing catalog are translated unless --force is
+given, so hand-corrected entries survive a rebuild. Strings that fail to
+translate are left out and served through live translation at runtime.
+"""
+import json
+import logging
+import os
+import sys
+
+from catalog import CATALOG_DIR, CATALOG_LANGUAGES, catalog_path, static_strings
+from translation import get_translator
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def build(lang: str, force: bool = False) -> int:
+    path = catalog_path(lang)
+    strings = {}
+    if not force and os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as file:
+            strings = json.load(file).get("strings", {})
+
+    sources = static_strings()
+    failed = 0
+    for text in sources:
+        if text in strings:
+            continue
+        try:
+            strings[text] = get_translator().translate(text, src='en', dest=lang).text
+        except Exception as e:
+            failed += 1
+            logger.warning(f"[{lang}] could not translate {text!r}: {e}")
+
+    strings = {k: strings[k] for k in sorted(strings) if k in sources}
+    os.makedirs(CATALOG_DIR, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({"lang": lang, "strings": strings}, file, ensure_ascii=False, indent=2)
+        file.write("\n")
+    logger.info(f"[{lang}] {len(strings)}/{len(sources)} strings compiled to {path}")
+    return failed
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    force = "--force" in args
+    langs = [a for a in args if not a.startswith("--")] or CATALOG_LANGUAGES
+    for lang in langs:
+        build(lang, force=force)
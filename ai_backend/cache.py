@@ -0,0 +1,189 @@
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Shared on-disk location for caches and stores; every gunicorn worker on the
+# host points at the same files.
+DATA_DIR = os.environ.get("DATA_DIR", os.path.join(tempfile.gettempdir(), "event-ai"))
+
+
+def data_path(filename: str) -> str:
+    """Return the absolute path of a file inside DATA_DIR, creating the directory."""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    return os.path.join(DATA_DIR, filename)
+
+
+def open_sqlite(path: str) -> sqlite3.Connection:
+    """Open a SQLite connection tuned for many readers and one writer at a time."""
+    conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class SQLiteConnections:
+    """open_sqlite connections kept per thread, and per process so none is reused across fork."""
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def get(self, path: str) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        # Never reuse a connection inherited across fork (gunicorn --preload)
+        if conn is None or self._local.pid != os.getpid() or self._local.path != path:
+            conn = open_sqlite(path)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+            self._local.path = path
+        return conn
+
+
+class TieredCache:
+    """Two-tier key/value cache: an in-process LRU in front of a shared SQLite table.
+
+    Values must be JSON-serializable. Both tiers honour the same TTL; the memory
+    tier is bounded by max_entries and the disk tier by max_disk_entries (least
+    recently used rows are evicted first). If the disk tier cannot be opened the
+    cache keeps working in memory only.
+    """
+
+    _PRUNE_EVERY = 200
+
+    def __init__(self, name: str, max_entries: int = 2048, ttl: float = 7 * 24 * 3600,
+                 max_disk_entries: int = 50000, db_path: Optional[str] = None,
+                 persistent: bool = True):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_disk_entries = max_disk_entries
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._connections = SQLiteConnections()
+        self._writes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._db_path = None
+        if persistent:
+            try:
+                self._db_path = db_path or data_path(f"{name}.sqlite3")
+                conn = self._conn()
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS entries ("
+                    "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                    "created REAL NOT NULL, accessed REAL NOT NULL)"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries(accessed)")
+                conn.commit()
+            except Exception as e:
+                logger.warning(f"{name} cache: disk tier disabled ({e})")
+                self._db_path = None
+
+    def _conn(self) -> sqlite3.Connection:
+        return self._connections.get(self._db_path)
+
+    def get(self, key: str) -> Any:
+        """Return the cached value for key, or None on a miss."""
+        now = time.time()
+        with self._lock:
+            item = self._memory.get(key)
+            if item is not None:
+                created, value = item
+                if now - created <= self.ttl:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._memory[key]
+
+        if self._db_path:
+            try:
+                conn = self._conn()
+                row = conn.execute(
+                    "SELECT value, created FROM entries WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and now - row[1] <= self.ttl:
+                    conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+                    conn.commit()
+                    value = json.loads(row[0])
+                    self._remember(key, row[1], value)
+                    with self._lock:
+                        self.disk_hits += 1
+                    return value
+            except Exception as e:
+                logger.warning(f"{self.name} cache read failed: {e}")
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key: str, value: Any) -> None:
+        """Store value under key in both tiers."""
+        now = time.time()
+        self._remember(key, now, value)
+        if not self._db_path:
+            return
+        try:
+            conn = self._conn()
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), now, now),
+            )
+            conn.commit()
+            with self._lock:
+                self._writes += 1
+                prune = self._writes % self._PRUNE_EVERY == 0
+            if prune:
+                self.prune()
+        except Exception as e:
+            logger.warning(f"{self.name} cache write failed: {e}")
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._memory.pop(key, None)
+        if self._db_path:
+            try:
+                conn = self._conn()
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                conn.commit()
+            except Exception as e:
+                logger.warning(f"{self.name} cache delete failed: {e}")
+
+    def prune(self) -> None:
+        """Drop expired rows and trim the disk tier to max_disk_entries."""
+        if not self._db_path:
+            return
+        conn = self._conn()
+        conn.execute("DELETE FROM entries WHERE created < ?", (time.time() - self.ttl,))
+        conn.execute(
+            "DELETE FROM entries WHERE key IN ("
+            "SELECT key FROM entries ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+            (self.max_disk_entries,),
+        )
+        conn.commit()
+
+    def _remember(self, key: str, created: float, value: Any) -> None:
+        with self._lock:
+            self._memory[key] = (created, value)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "memory_entries": len(self._memory),
+                "memory_hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+                "persistent": bool(self._db_path),
+            }
@@ -0,0 +1,112 @@
+import hashlib
+import json
+import logging
+import os
+from typing import Dict, List, Tuple
+
+from event_data import (BUSY_MESSAGE, EVENT_QUESTIONS, EVENT_TYPES, FALLBACK_FOLLOW_UPS, PLAN_SUMMARY,
+                        SPEECH_SUMMARY)
+from translation import translate_text
+
+logger = logging.getLogger(__name__)
+
+# Languages offered by the language picker in frontend/src/components/UI.jsx
+CATALOG_LANGUAGES = ["ta", "te", "ml", "hi"]
+CATALOG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "catalog")
+
+_catalogs: Dict[str, Dict[str, str]] = {}
+_memo: Dict[Tuple, Tuple[object, str]] = {}
+
+
+def static_strings() -> List[str]:
+    """Every fixed English string the API may have to localize."""
+    strings = [SPEECH_SUMMARY, BUSY_MESSAGE, *FALLBACK_FOLLOW_UPS]
+    strings += [PLAN_SUMMARY.format(event_type=t) for t in ["event", *EVENT_TYPES]]
+    strings += [info["name"] for info in EVENT_TYPES.values()]
+    for questions in EVENT_QUESTIONS.values():
+        for q in questions:
+            strings += [q[k] for k in ("label", "question", "placeholder") if isinstance(q.get(k), str)]
+    return sorted(set(strings))
+
+
+def catalog_path(lang: str) -> str:
+    return os.path.join(CATALOG_DIR, f"{lang}.json")
+
+
+def load_catalogs() -> None:
+    """Load every compiled catalog file once; missing files are not an error."""
+    _catalogs.clear()
+    _memo.clear()
+    for lang in CATALOG_LANGUAGES:
+        try:
+            with open(catalog_path(lang), "r", encoding="utf-8") as file:
+                _catalogs[lang] = json.load(file).get("strings", {})
+        except FileNotFoundError:
+            logger.info(f"No compiled catalog for '{lang}'; using live translation")
+        except Exception as e:
+            logger.error(f"Error loading catalog for '{lang}': {str(e)}")
+
+
+def catalog_text(text: str, lang: str) -> str:
+    """Localize a static string from the catalog, translating live only on a miss."""
+    if not lang or lang == 'en' or not isinstance(text, str):
+        return text
+    hit = _catalogs.get(lang, {}).get(text)
+    if hit is not None:
+        return hit
+    try:
+        return translate_text(text, dest=lang, src='en')
+    except Exception:
+        return text
+
+
+def _is_compiled(texts: List[str], lang: str) -> bool:
+    strings = _catalogs.get(lang, {})
+    return lang == 'en' or all(t in strings for t in texts)
+
+
+def _memoized(key: Tuple, texts: List[str], lang: str, build) -> Tuple[object, str]:
+    """Build a payload and its strong ETag, memoizing when the catalog covered it fully."""
+    cached = _memo.get(key)
+    if cached is not None:
+        return cached
+    payload = build()
+    body = json.dumps(payload, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    result = (payload, hashlib.sha256(body).hexdigest()[:32])
+    if _is_compiled(texts, lang):
+        _memo[key] = result
+    return result
+
+
+def localized_questions(event_type: str, lang: str) -> Tuple[List[dict], str]:
+    """Wizard questions for event_type in lang, plus an ETag for the payload."""
+    qs = EVENT_QUESTIONS.get(event_type, EVENT_QUESTIONS["default"]) or []
+    texts = [q[k] for q in qs for k in ("label", "question", "placeholder") if isinstance(q.get(k), str)]
+
+    def build():
+        translated = []
+        for q in qs:
+            if not isinstance(q, dict):
+                continue
+            q2 = dict(q)
+            for field in ("label", "question", "placeholder"):
+                if field in q2 and isinstance(q2[field], str):
+                    q2[field] = catalog_text(q2[field], lang)
+            translated.append(q2)
+        return translated
+
+    key = ("questions", event_type if event_type in EVENT_QUESTIONS else "default", lang)
+    return _memoized(key, texts, lang, build)
+
+
+def localized_event_types(lang: str) -> Tuple[Dict[str, dict], str]:
+    """EVENT_TYPES with display names in lang, plus an ETag for the payload."""
+    texts = [info["name"] for info in EVENT_TYPES.values()]
+
+    def build():
+        return {k: {**info, "name": catalog_text(info["name"], lang)} for k, info in EVENT_TYPES.items()}
+
+    return _memoized(("event_types", lang), texts, lang, build)
+
+
+load_catalogs()
@@ -0,0 +1,83 @@
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Per-request prompt budget (system prompt + summary + history + query) and the
+# number of most recent user/assistant turns that are always sent verbatim.
+CHAT_TOKEN_BUDGET = int(os.environ.get("CHAT_TOKEN_BUDGET", 6000))
+CHAT_KEEP_TURNS = int(os.environ.get("CHAT_KEEP_TURNS", 4))
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for Llama tokenizers)."""
+    if not text:
+        return 0
+    return max(1, (len(text) + 3) // 4)
+
+
+def fit_to_budget(fixed_tokens: int, records: List[Dict], budget: int = CHAT_TOKEN_BUDGET,
+                  keep_turns: int = CHAT_KEEP_TURNS) -> Tuple[List[Dict], bool]:
+    """Select the history records to send for one request.
+
+    fixed_tokens covers the system prompt, summary and new query. Returns the
+    records to send and whether the session should be compacted. The last
+    keep_turns turns are always kept; older records are dropped oldest-first
+    until the request fits the budget.
+    """
+    sizes = [estimate_tokens(r.get("content", "")) for r in records]
+    total = fixed_tokens + sum(sizes)
+    if total <= budget:
+        return records, False
+    keep = keep_turns * 2
+    start = 0
+    while total > budget and start < len(records) - keep:
+        total -= sizes[start]
+        start += 1
+    return records[start:], len(records) > keep
+
+
+class Compactor:
+    """Folds older turns into a rolling summary on a background thread.
+
+    summarize(previous_summary, records) -> str produces the new summary; it is
+    called off the request path, at most once at a time per conversation.
+    """
+
+    def __init__(self, store, summarize: Callable[[str, List[Dict]], str],
+                 keep_turns: int = CHAT_KEEP_TURNS, max_workers: int = 1):
+        self.store = store
+        self.summarize = summarize
+        self.keep_turns = keep_turns
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="compactor")
+        self._pending = set()
+        self._lock = threading.Lock()
+
+    def schedule(self, conversation_id: str) -> bool:
+        """Queue a compaction unless one is already pending for this conversation."""
+        with self._lock:
+            if conversation_id in self._pending:
+                return False
+            self._pending.add(conversation_id)
+        self._executor.submit(self._run, conversation_id)
+        return True
+
+    def _run(self, conversation_id: str) -> None:
+        try:
+            records = self.store.load(conversation_id) or []
+            keep = self.keep_turns * 2
+            if len(records) <= keep:
+                return
+            older = records[:-keep]
+            summary = self.summarize(self.store.get_summary(conversation_id), older)
+            if summary:
+                self.store.compact(conversation_id, older[-1]["ts"], summary)
+                logger.info(f"Compacted {len(older)} messages of conversation {conversation_id}")
+        except Exception as e:
+            logger.error(f"Compaction failed for {conversation_id}: {str(e)}")
+        finally:
+            with self._lock:
+                self._pending.discard(conversation_id)
@@ -0,0 +1,268 @@
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from cache import SQLiteConnections, data_path
+
+logger = logging.getLogger(__name__)
+
+# Rough per-record bookkeeping overhead added to the UTF-8 size of the content
+RECORD_OVERHEAD = 64
+
+
+def make_record(role: str, content: str) -> Dict[str, Any]:
+    """Compact chat record stored instead of a LangChain message object."""
+    return {"role": role, "content": content, "ts": time.time()}
+
+
+def record_size(record: Dict[str, Any]) -> int:
+    return len(record.get("content", "").encode("utf-8")) + RECORD_OVERHEAD
+
+
+class MemoryConversationStore:
+    """Per-process store with LRU and idle-TTL eviction under a session and byte cap."""
+
+    def __init__(self, max_sessions: int = 1000, idle_ttl: float = 6 * 3600,
+                 max_bytes: int = 64 * 1024 * 1024):
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.max_bytes = max_bytes
+        self._sessions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def exists(self, conversation_id: str) -> bool:
+        return self.load(conversation_id) is not None
+
+    def load(self, conversation_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Return a copy of the session's records, or None if it is unknown or expired."""
+        with self._lock:
+            self._expire(time.time())
+            session = self._sessions.get(conversation_id)
+            if session is None:
+                return None
+            self._sessions.move_to_end(conversation_id)
+            return list(session["messages"])
+
+    def append(self, conversation_id: str, records: List[Dict[str, Any]]) -> None:
+        """Append records to a session, creating it if needed."""
+        now = time.time()
+        added = sum(record_size(r) for r in records)
+        with self._lock:
+            session = self._sessions.get(conversation_id)
+            if session is None:
+                session = {"messages": [], "summary": "", "bytes": 0, "updated": now}
+                self._sessions[conversation_id] = session
+            session["messages"].extend(records)
+            session["bytes"] += added
+            session["updated"] = now
+            self._bytes += added
+            self._sessions.move_to_end(conversation_id)
+            self._expire(now)
+            self._evict()
+
+    def get_summary(self, conversation_id: str) -> str:
+        with self._lock:
+            now = time.time()
+            self._expire(now)
+            session = self._sessions.get(conversation_id)
+            return session["summary"] if session and now - session["updated"] <= self.idle_ttl else ""
+
+    def compact(self, conversation_id: str, upto_ts: float, summary: str) -> None:
+        """Replace records with ts <= upto_ts by a rolling summary."""
+        with self._lock:
+            session = self._sessions.get(conversation_id)
+            if session is None:
+                return
+            kept = [r for r in session["messages"] if r["ts"] > upto_ts]
+            size = sum(record_size(r) for r in kept) + len(summary.encode("utf-8"))
+            self._bytes += size - session["bytes"]
+            session.update(messages=kept, summary=summary, bytes=size)
+
+    def delete(self, conversation_id: str) -> None:
+        with self._lock:
+            session = self._sessions.pop(conversation_id, None)
+            if session is not None:
+                self._bytes -= session["bytes"]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"backend": "memory", "sessions": len(self._sessions), "bytes": self._bytes}
+
+    def _expire(self, now: float) -> None:
+        while self._sessions:
+            cid, session = next(iter(self._sessions.items()))
+            if now - session["updated"] <= self.idle_ttl:
+                break
+            self._sessions.popitem(last=False)
+            self._bytes -= session["bytes"]
+
+    def _evict(self) -> None:
+        while len(self._sessions) > 1 and (
+            len(self._sessions) > self.max_sessions or self._bytes > self.max_bytes
+        ):
+            _, session = self._sessions.popitem(last=False)
+            self._bytes -= session["bytes"]
+
+
+class SQLiteConversationStore:
+    """SQLite (WAL) store shared by every worker process on the host.
+
+    Same eviction policy as the memory store: sessions idle longer than idle_ttl
+    are dropped, then the least recently updated ones until both caps hold.
+    """
+
+    _EVICT_EVERY = 50
+
+    def __init__(self, path: Optional[str] = None, max_sessions: int = 10000,
+                 idle_ttl: float = 6 * 3600, max_bytes: int = 256 * 1024 * 1024):
+        self.path = path or data_path("conversations.sqlite3")
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.max_bytes = max_bytes
+        self._connections = SQLiteConnections()
+        self._writes = 0
+        self._lock = threading.Lock()
+        with self._conn() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "id TEXT PRIMARY KEY, updated REAL NOT NULL, bytes INTEGER NOT NULL DEFAULT 0, "
+                "summary TEXT NOT NULL DEFAULT '')"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS messages ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, session_id TEXT NOT NULL, "
+                "role TEXT NOT NULL, content TEXT NOT NULL, ts REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_messages_session ON messages(session_id, id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_updated ON sessions(updated)")
+            # Databases created before rolling summaries existed lack the column
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(sessions)")]
+            if "summary" not in columns:
+                conn.execute("ALTER TABLE sessions ADD COLUMN summary TEXT NOT NULL DEFAULT ''")
+
+    def _conn(self):
+        return self._connections.get(self.path)
+
+    def exists(self, conversation_id: str) -> bool:
+        row = self._conn().execute(
+            "SELECT updated FROM sessions WHERE id = ?", (conversation_id,)
+        ).fetchone()
+        return row is not None and time.time() - row[0] <= self.idle_ttl
+
+    def load(self, conversation_id: str) -> Optional[List[Dict[str, Any]]]:
+        if not self.exists(conversation_id):
+            return None
+        rows = self._conn().execute(
+            "SELECT role, content, ts FROM messages WHERE session_id = ? ORDER BY id",
+            (conversation_id,),
+        ).fetchall()
+        return [{"role": r[0], "content": r[1], "ts": r[2]} for r in rows]
+
+    def append(self, conversation_id: str, records: List[Dict[str, Any]]) -> None:
+        now = time.time()
+        added = sum(record_size(r) for r in records)
+        with self._conn() as conn:
+            # An idle-expired session not yet evicted starts over instead of coming back
+            cutoff = now - self.idle_ttl
+            conn.execute(
+                "DELETE FROM messages WHERE session_id = ? AND EXISTS ("
+                "SELECT 1 FROM sessions WHERE id = ? AND updated < ?)",
+                (conversation_id, conversation_id, cutoff),
+            )
+            conn.execute("DELETE FROM sessions WHERE id = ? AND updated < ?", (conversation_id, cutoff))
+            conn.execute(
+                "INSERT INTO sessions (id, updated, bytes) VALUES (?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET updated = excluded.updated, bytes = bytes + excluded.bytes",
+                (conversation_id, now, added),
+            )
+            conn.executemany(
+                "INSERT INTO messages (session_id, role, content, ts) VALUES (?, ?, ?, ?)",
+                [(conversation_id, r["role"], r["content"], r.get("ts", now)) for r in records],
+            )
+        with self._lock:
+            self._writes += 1
+            evict = self._writes % self._EVICT_EVERY == 1
+        if evict:
+            self.evict()
+
+    def get_summary(self, conversation_id: str) -> str:
+        row = self._conn().execute(
+            "SELECT summary, updated FROM sessions WHERE id = ?", (conversation_id,)
+        ).fetchone()
+        return row[0] if row and time.time() - row[1] <= self.idle_ttl else ""
+
+    def compact(self, conversation_id: str, upto_ts: float, summary: str) -> None:
+        """Replace records with ts <= upto_ts by a rolling summary."""
+        with self._conn() as conn:
+            conn.execute(
+                "DELETE FROM messages WHERE session_id = ? AND ts <= ?", (conversation_id, upto_ts)
+            )
+            remaining = conn.execute(
+                "SELECT COALESCE(SUM(LENGTH(CAST(content AS BLOB))), 0) + COUNT(*) * ? "
+                "FROM messages WHERE session_id = ?",
+                (RECORD_OVERHEAD, conversation_id),
+            ).fetchone()[0]
+            conn.execute(
+                "UPDATE sessions SET summary = ?, bytes = ? WHERE id = ?",
+                (summary, remaining + len(summary.encode("utf-8")), conversation_id),
+            )
+
+    def delete(self, conversation_id: str) -> None:
+        with self._conn() as conn:
+            conn.execute("DELETE FROM messages WHERE session_id = ?", (conversation_id,))
+            conn.execute("DELETE FROM sessions WHERE id = ?", (conversation_id,))
+
+    def evict(self) -> None:
+        """Drop idle sessions, then least recently updated ones over the caps."""
+        try:
+            with self._conn() as conn:
+                conn.execute("DELETE FROM sessions WHERE updated < ?", (time.time() - self.idle_ttl,))
+                conn.execute(
+                    "DELETE FROM sessions WHERE id IN ("
+                    "SELECT id FROM sessions ORDER BY updated DESC LIMIT -1 OFFSET ?)",
+                    (self.max_sessions,),
+                )
+                total = conn.execute("SELECT COALESCE(SUM(bytes), 0) FROM sessions").fetchone()[0]
+                if total > self.max_bytes:
+                    running = 0
+                    keep = []
+                    for cid, size in conn.execute("SELECT id, bytes FROM sessions ORDER BY updated DESC"):
+                        running += size
+                        if running > self.max_bytes and keep:
+                            break
+                        keep.append(cid)
+                    conn.execute(
+                        "DELETE FROM sessions WHERE updated < (SELECT updated FROM sessions WHERE id = ?)",
+                        (keep[-1],),
+                    )
+                conn.execute("DELETE FROM messages WHERE session_id NOT IN (SELECT id FROM sessions)")
+        except Exception as e:
+            logger.warning(f"Conversation store eviction failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        count, total = self._conn().execute(
+            "SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM sessions WHERE updated >= ?",
+            (time.time() - self.idle_ttl,),
+        ).fetchone()
+        return {"backend": "sqlite", "sessions": count, "bytes": total}
+
+
+def create_conversation_store():
+    """Build the store selected by CONVERSATION_STORE (sqlite by default, or memory)."""
+    backend = os.environ.get("CONVERSATION_STORE", "sqlite").lower()
+    max_sessions = int(os.environ.get("CONVERSATION_MAX_SESSIONS", 10000))
+    idle_ttl = float(os.environ.get("CONVERSATION_IDLE_TTL", 6 * 3600))
+    max_bytes = int(os.environ.get("CONVERSATION_MAX_BYTES", 64 * 1024 * 1024))
+    if backend == "sqlite":
+        try:
+            return SQLiteConversationStore(
+                path=os.environ.get("CONVERSATION_DB_PATH"),
+                max_sessions=max_sessions, idle_ttl=idle_ttl, max_bytes=max_bytes,
+            )
+        except Exception as e:
+            logger.warning(f"SQLite conversation store unavailable ({e}); using memory store")
+    return MemoryConversationStore(max_sessions=max_sessions, idle_ttl=idle_ttl, max_bytes=max_bytes)
@@ -0,0 +1,353 @@
+"""Static event catalog data shared by the API, the catalog builder and the planners."""
+
+EVENT_TYPES = {
+    "hackathon": {"name": "Hackathon AI", "icon": "💻", "color": "from-blue-500 to-indigo-600"},
+    "wedding": {"name": "Wedding AI", "icon": "💒", "color": "from-pink-500 to-rose-600"},
+    "birthday": {"name": "Birthday AI", "icon": "🎂", "color": "from-yellow-400 to-orange-500"},
+    "corporate": {"name": "Corporate AI", "icon": "🏢", "color": "from-gray-500 to-blue-700"},
+    "concert": {"name": "Concert AI", "icon": "🎵", "color": "from-purple-500 to-fuchsia-600"},
+    "festival": {"name": "Fest AI", "icon": "🎪", "color": "from-green-500 to-teal-600"},
+    "sports": {"name": "Sports AI", "icon": "⚽", "color": "from-red-500 to-orange-600"},
+    "school": {"name": "School AI", "icon": "🏫", "color": "from-emerald-500 to-teal-600"},
+    "christmas": {"name": "Christmas AI", "icon": "🎄", "color": "from-red-500 to-green-600"}
+}
+
+EVENT_QUESTIONS = {
+    "default": [
+        {"step": 1, "key": "date", "label": "Date", "question": "When is the event?", "placeholder": "20 Oct 2025"},
+        {"step": 2, "key": "venue", "label": "Venue", "question": "Where will it take place?", "placeholder": "Convention Center"},
+        {"step": 3, "key": "people", "label": "People", "question": "How many attendees?", "placeholder": "300 attendees"},
+        {"step": 4, "key": "time", "label": "Time", "question": "What's the duration or start time?", "placeholder": "2 days"},
+        {"step": 5, "key": "budget", "label": "Budget", "question": "What's your budget?", "placeholder": "₹5,00,000"},
+    ],
+    "hackathon": [
+        {"step": 1, "key": "date", "label": "Hackathon Dates", "question": "When will the hackathon run?", "placeholder": "12-14 Dec 2025"},
+        {"step": 2, "key": "venue", "label": "Venue", "question": "Where is the venue (campus/tech park)?", "placeholder": "NIT Auditorium"},
+        {"step": 3, "key": "people", "label": "Participants", "question": "Expected number of hackers/teams?", "placeholder": "200 hackers"},
+        {"step": 4, "key": "time", "label": "Duration", "question": "Event duration and daily schedule?", "placeholder": "48 hours with opening/closing"},
+        {"step": 5, "key": "budget", "label": "Budget", "question": "Overall budget?", "placeholder": "₹8,00,000"},
+    ],
+    "wedding": [
+        {"step": 1, "key": "date", "label": "Wedding Date", "question": "What is the wedding date?", "placeholder": "21 Jan 2026"},
+        {"step": 2, "key": "venue", "label": "Venue", "question": "Which venue or city?", "placeholder": "Sri Mahal, Coimbatore"},
+        {"step": 3, "key": "people", "label": "Guests", "question": "Approximate guest count?", "placeholder": "500 guests"},
+        {"step": 4, "key": "time", "label": "Ceremony Timing", "question": "Muhurtham / ceremony start time?", "placeholder": "6:30 AM"},
+        {"step": 5, "key": "budget", "label": "Budget", "question": "Overall budget?", "placeholder": "₹15,00,000"},
+    ],
+    "birthday": [
+        {"step": 1, "key": "date", "label": "Date", "question": "When is the birthday?", "placeholder": "10 Feb 2026"},
+        {"step": 2, "key": "venue", "label": "Venue", "question": "Where is the party venue?", "placeholder": "Home / Party Hall"},
+        {"step": 3, "key": "people", "label": "Guests", "question": "Guest count (kids/adults)?", "placeholder": "30 kids, 20 adults"},
+        {"step": 4, "key": "time", "label": "Time", "question": "Start time and duration?", "placeholder": "5 PM, 3 hours"},
+        {"step": 5, "key": "budget", "label": "Budget", "question": "Budget range?", "placeholder": "₹50,000"},
+    ],
+    "corporate": [
+        {"step": 1, "key": "date", "label": "Event Date", "question": "When is the corporate event?", "placeholder": "5 Mar 2026"},
+        {"step": 2, "key": "venue", "label": "Venue", "question": "Where will it be hosted?", "placeholder": "Hotel Ballroom"},
+        {"step": 3, "key": "people", "label": "Attendees", "question": "Expected attendee count?", "placeholder": "250"},
+        {"step": 4, "key": "time", "label": "Agenda", "question": "Agenda duration and key sessions?", "placeholder": "9 AM–6 PM"},
+        {"step": 5, "key": "budget", "label": "Budget", "question": "Budget?", "placeholder": "₹10,00,000"},
+    ],
+    "concert": [
+        {"step": 1, "key": "date", "label": "Concert Date", "question": "When is the concert?", "placeholder": "18 Apr 2026"},
+        {"step": 2, "key": "venue", "label": "Venue", "question": "Which venue?", "placeholder": "Open Grounds"},
+        {"step": 3, "key": "people", "label": "Audience", "question": "Expected audience size?", "placeholder": "5,000"},
+        {"step": 4, "key": "time", "label": "Show Time", "question": "Start time and run time?", "placeholder": "7 PM, 3 hours"},
+        {"step": 5, "key": "budget", "label": "Budget", "question": "Budget?", "placeholder": "₹50,00,000"},
+    ],
+    "festival": [
+        {"step": 1, "key": "date", "label": "Festival Dates", "question": "Festival dates?", "placeholder": "1–3 May 2026"},
+        {"step": 2, "key": "venue", "label": "Venue", "question": "Location and grounds?", "placeholder": "City Fairgrounds"},
+        {"step": 3, "key": "people", "label": "Crowd", "question": "Expected daily footfall?", "placeholder": "10,000/day"},
+        {"step": 4, "key": "time", "label": "Hours", "question": "Daily operating hours?", "placeholder": "10 AM–10 PM"},
+        {"step": 5, "key": "budget", "label": "Budget", "question": "Budget?", "placeholder": "₹1,00,00,000"},
+    ],
+    "sports": [
+        {"step": 1, "key": "date", "label": "Match Dates", "question": "Event dates?", "placeholder": "8–10 Jun 2026"},
+        {"step": 2, "key": "venue", "label": "Venue", "question": "Stadium/ground?", "placeholder": "City Stadium"},
+        {"step": 3, "key": "people", "label": "Teams/Players", "question": "How many teams/players?", "placeholder": "8 teams"},
+        {"step": 4, "key": "time", "label": "Schedule", "question": "Match schedule pattern?", "placeholder": "League + Finals"},
+        {"step": 5, "key": "budget", "label": "Budget", "question": "Budget?", "placeholder": "₹12,00,000"},
+    ],
+    "school": [
+        {"step": 1, "key": "date", "label": "Event Date", "question": "When is the school event?", "placeholder": "15 Aug 2026"},
+        {"step": 2, "key": "venue", "label": "Venue", "question": "School block / ground?", "placeholder": "Main Auditorium"},
+        {"step": 3, "key": "people", "label": "Participants", "question": "Students/parents/teachers count?", "placeholder": "800 students, 200 parents"},
+        {"step": 4, "key": "time", "label": "Agenda", "question": "Start time and schedule?", "placeholder": "9 AM–1 PM"},
+        {"step": 5, "key": "budget", "label": "Budget", "question": "Budget?", "placeholder": "₹2,50,000"},
+    ],
+    "christmas": [
+        {"step": 1, "key": "date", "label": "Celebration Date", "question": "When is the celebration?", "placeholder": "24–25 Dec 2026"},
+        {"step": 2, "key": "venue", "label": "Venue", "question": "Church/Hall/Community center?", "placeholder": "St. Mary's Church Hall"},
+        {"step": 3, "key": "people", "label": "Attendees", "question": "Expected attendees?", "placeholder": "600"},
+        {"step": 4, "key": "time", "label": "Program Timing", "question": "Mass/time & cultural programs?", "placeholder": "7 PM Mass, 8–10 PM cultural"},
+        {"step": 5, "key": "budget", "label": "Budget", "question": "Budget?", "placeholder": "₹3,00,000"},
+    ],
+}
+
+# Event-specific guidance appended to the plan prompt
+EVENT_PROMPTS = {
+    "hackathon": "Focus on tracks, judging criteria, mentor slots, API partners, and submission process.",
+    "wedding": "Include rituals timeline, vendor coordination (decor, catering, photography), guest flow, and contingency for weather.",
+    "birthday": "Suggest theme, games/activities, decor, cake timing, return gifts, and kid-friendly logistics.",
+    "corporate": "Emphasize agenda, AV needs, registration flow, speaker management, and breakout sessions.",
+    "concert": "Cover stage plot, sound/lighting, artist rider, security, ticketing, and entry/exit flow.",
+    "festival": "Include multi-stage scheduling, stall/vendor zoning, crowd control, permissions, and sanitation.",
+    "sports": "Detail fixtures/schedule, officials, equipment, medical/safety, scorekeeping, and audience seating.",
+    "school": "Plan inauguration, student performances, prize distribution, safety, discipline committees, and parent management.",
+    "christmas": "Plan Mass/service timings, carols, nativity play, decor/lights, food distribution, crowd and parking management."
+}
+
+# Sections of plan_json, in display order, with what each one should contain
+PLAN_SECTIONS = {
+    "overview": "a short narrative of the event concept, goals and key numbers.",
+    "timeline": "a chronological list of objects with time, activity and owner.",
+    "venue_layout": "zones, seating or stage arrangement, entry/exit flow and signage.",
+    "logistics": "AV, seating, registration, transport, catering and permissions.",
+    "staffing_roles": "a list of roles with headcount and responsibilities.",
+    "budget_breakdown": "a list of line items with category and amount in ₹ that adds up to the stated budget.",
+    "vendors": "a list of vendor categories with what to book and selection tips.",
+    "risk_contingency": "a list of risks with likelihood, impact and mitigation.",
+    "next_steps": "an ordered list of concrete next actions with owners and deadlines.",
+}
+
+# Templates for the offline plan generator (offline_plan.py). Each event type
+# gives a default start time and hours, a per-head cost used when no budget is
+# given, agenda items (activity, owner) for the opening, core and closing parts
+# of a day, venue zones, the budget split in percent (sums to 100), vendor
+# categories with a booking tip, and event-specific risks
+# (risk, likelihood, impact, mitigation). Missing keys fall back to "default".
+PLAN_TEMPLATES = {
+    "default": {
+        "start": "09:00", "hours": 8, "per_head": 1500,
+        "agenda": {
+            "opening": [("Setup and vendor check-in", "Operations lead"), ("Registration and welcome", "Registration desk")],
+            "core": [("Main program", "Program lead"), ("Meals and refreshments", "Catering lead")],
+            "closing": [("Closing remarks and thanks", "Host"), ("Teardown and venue handover", "Operations lead")],
+        },
+        "zones": ["Entrance and registration", "Main seating facing the stage", "Catering area",
+                  "Restrooms and first-aid point", "Parking and drop-off"],
+        "budget": [("Venue", 25), ("Catering", 30), ("Decor and production", 15), ("AV and lighting", 10),
+                   ("Staffing", 10), ("Contingency", 10)],
+        "vendors": [("Venue", "Confirm capacity, power backup and permitted hours in the contract."),
+                    ("Caterer", "Hold a tasting and lock per-plate pricing against the final headcount."),
+                    ("AV", "Ask for a technician on site for the whole event."),
+                    ("Decorator", "Share the floor plan and approve a mock-up before the event."),
+                    ("Photographer", "Agree on deliverables and turnaround in writing.")],
+        "risks": [],
+    },
+    "hackathon": {
+        "start": "09:00", "hours": 12, "per_head": 3000,
+        "agenda": {
+            "opening": [("Registration and check-in", "Registration desk"),
+                        ("Opening ceremony and problem statements", "Host"), ("Team formation", "Mentors")],
+            "core": [("Hacking sprint", "Participants"), ("Mentor office hours", "Mentors"),
+                     ("Meals and networking", "Catering lead"), ("Checkpoint review", "Track leads")],
+            "closing": [("Submission deadline", "Tech team"), ("Judging and demos", "Judges"),
+                        ("Awards and closing ceremony", "Host")],
+        },
+        "zones": ["Registration desk at the entrance", "Main hall with team tables and power strips",
+                  "Stage and projection for demos", "Mentor corner", "Food and rest area", "Quiet room for sleeping"],
+        "budget": [("Venue and power", 20), ("Food and beverages", 30), ("Prizes", 20), ("Swag and printing", 10),
+                   ("Internet and AV", 10), ("Contingency", 10)],
+        "vendors": [("Internet provider", "Get a dedicated line with a mobile-data backup."),
+                    ("Caterer", "Confirm overnight service and dietary options."),
+                    ("AV", "Projectors and microphones for the demo stage."),
+                    ("Swag and printing", "Order T-shirts in a size mix collected at registration."),
+                    ("Security", "Round-the-clock guards for overnight hacking.")],
+        "risks": [("Internet outage during hacking", "Medium", "High",
+                   "Dedicated line plus a mobile-data backup; share offline API docs."),
+                  ("Late or incomplete submissions", "High", "Medium",
+                   "Announce the deadline early and use a portal that closes automatically.")],
+    },
+    "wedding": {
+        "start": "06:30", "hours": 12, "per_head": 2500,
+        "agenda": {
+            "opening": [("Decor setup and final checks", "Decorator"), ("Guest arrival and welcome", "Hospitality team")],
+            "core": [("Muhurtham and main ceremony", "Priest and families"), ("Family photographs", "Photographer"),
+                     ("Lunch service", "Caterer")],
+            "closing": [("Reception and music", "Emcee"), ("Dinner service", "Caterer"),
+                        ("Send-off and venue handover", "Coordinator")],
+        },
+        "zones": ["Entrance welcome arch with gift counter", "Mandap or stage facing guest seating",
+                  "Dining hall with separate service lanes", "Green rooms for the couple and families",
+                  "Parking with a drop-off point"],
+        "budget": [("Venue", 20), ("Catering", 35), ("Decor and flowers", 15), ("Photography and video", 10),
+                   ("Attire and makeup", 8), ("Music and entertainment", 5), ("Contingency", 7)],
+        "vendors": [("Caterer", "Fix the menu and per-plate price after a tasting."),
+                    ("Decorator and florist", "Approve the mandap design with photos of earlier work."),
+                    ("Photographer and videographer", "Share a shot list and the ritual timings."),
+                    ("Priest", "Confirm the muhurtham and the items needed for rituals."),
+                    ("Makeup artist", "Book a trial session."),
+                    ("Sound and lighting", "Check power load for lights and music.")],
+        "risks": [("Rain during outdoor functions", "Medium", "High",
+                   "Keep a covered backup area or hire waterproof shamianas."),
+                  ("Delay to the muhurtham", "Medium", "High",
+                   "Run a rehearsal and keep a coordinator with the families.")],
+    },
+    "birthday": {
+        "start": "17:00", "hours": 3, "per_head": 1000,
+        "agenda": {
+            "opening": [("Theme decor setup", "Decor team"), ("Guest arrival and welcome", "Host family")],
+            "core": [("Games and activities", "Entertainer"), ("Cake cutting", "Host family"),
+                     ("Food service", "Caterer")],
+            "closing": [("Return gifts and thank-you", "Host family"), ("Cleanup", "Venue staff")],
+        },
+        "zones": ["Welcome area with photo booth", "Games and activity area", "Cake table with backdrop",
+                  "Food counter", "Safe play corner for young kids"],
+        "budget": [("Venue", 20), ("Food and cake", 35), ("Decor and theme", 15), ("Entertainment and games", 15),
+                   ("Return gifts", 10), ("Contingency", 5)],
+        "vendors": [("Baker", "Order the cake a week ahead and confirm the delivery time."),
+                    ("Decorator", "Share the theme and colour palette."),
+                    ("Entertainer", "Ask for an age-appropriate act list."),
+                    ("Caterer", "Plan kid-friendly portions."),
+                    ("Photographer", "Book for the cake cutting and group photos.")],
+        "risks": [("Food allergies among children", "Medium", "High",
+                   "Collect allergy details with RSVPs and label all food."),
+                  ("Child safety in play areas", "Low", "High",
+                   "Assign adult supervisors to each activity area.")],
+    },
+    "corporate": {
+        "start": "09:00", "hours": 9, "per_head": 4000,
+        "agenda": {
+            "opening": [("Registration and badge pickup", "Registration desk"), ("Welcome address", "Emcee"),
+                        ("Keynote", "Speaker manager")],
+            "core": [("Panel and breakout sessions", "Program lead"), ("Networking lunch", "Catering lead"),
+                     ("Sponsor and expo time", "Sponsor manager")],
+            "closing": [("Closing remarks and feedback", "Host"), ("Networking dinner", "Hospitality lead")],
+        },
+        "zones": ["Registration and badge desk", "Main hall with theatre seating", "Breakout rooms",
+                  "Sponsor and expo booths", "Speaker green room", "Dining area"],
+        "budget": [("Venue and AV", 30), ("Catering", 25), ("Speakers and content", 15), ("Branding and printing", 10),
+                   ("Registration and event tech", 8), ("Staffing", 5), ("Contingency", 7)],
+        "vendors": [("AV company", "Rehearse the keynote with the actual slides and microphones."),
+                    ("Caterer", "Plan tea breaks to match session timings."),
+                    ("Registration platform", "Use QR badges for fast check-in."),
+                    ("Printing and branding", "Freeze the sponsor logos two weeks before."),
+                    ("Photographer", "Cover the keynote, panels and sponsor booths.")],
+        "risks": [("Speaker no-show", "Low", "High", "Keep a backup speaker or a panel ready to extend."),
+                  ("AV failure during the keynote", "Medium", "High",
+                   "Keep a spare laptop, clicker and wireless microphone on stage.")],
+    },
+    "concert": {
+        "start": "19:00", "hours": 3, "per_head": 1000,
+        "agenda": {
+            "opening": [("Gates open and security check", "Security lead"), ("Opening act", "Stage manager")],
+            "core": [("Headline performance", "Artist manager"), ("Intermission and food stalls", "F&B lead")],
+            "closing": [("Encore and close", "Stage manager"), ("Controlled exit and load-out", "Security lead")],
+        },
+        "zones": ["Ticket scanning and frisking at the gates", "Stage with front-of-house mixing position",
+                  "Audience sections separated by barricades", "Food and beverage stalls",
+                  "First-aid and lost-and-found", "Artist backstage area"],
+        "budget": [("Artist fees", 35), ("Sound, lighting and stage", 20), ("Venue and permits", 10),
+                   ("Security and crowd control", 10), ("Marketing and ticketing", 10),
+                   ("Hospitality and rider", 5), ("Contingency", 10)],
+        "vendors": [("Sound and lighting", "Match the rig to the artist's technical rider."),
+                    ("Stage fabrication", "Get a structural safety certificate."),
+                    ("Ticketing platform", "Use scannable tickets with duplicate detection."),
+                    ("Security agency", "Plan one guard per 100 people plus barricade teams."),
+                    ("Food concessions", "Agree on revenue share and cashless payments.")],
+        "risks": [("Crowd crush at gates or barricades", "Medium", "High",
+                   "Stagger entry, add queue lanes and station barricade teams."),
+                  ("Artist arrives late", "Low", "High", "Extend the opening act and keep announcements ready.")],
+    },
+    "festival": {
+        "start": "10:00", "hours": 12, "per_head": 800,
+        "agenda": {
+            "opening": [("Grounds setup and safety check", "Operations lead"), ("Gates open", "Security lead"),
+                        ("Inauguration", "Host")],
+            "core": [("Stage programs", "Stage manager"), ("Stalls and food court open", "Vendor manager"),
+                     ("Competitions and cultural events", "Program lead")],
+            "closing": [("Headline evening show", "Stage manager"), ("Gates close and cleanup", "Sanitation lead")],
+        },
+        "zones": ["Entry gates with queue lanes", "Main and secondary stages", "Stall and vendor zone", "Food court",
+                  "Sanitation and drinking water points", "Medical and police booth", "Parking"],
+        "budget": [("Stages and production", 25), ("Infrastructure and tents", 20), ("Permits and security", 12),
+                   ("Artists and programs", 15), ("Sanitation and utilities", 10), ("Marketing", 8),
+                   ("Contingency", 10)],
+        "vendors": [("Tents and structures", "Get load and fire safety certificates."),
+                    ("Sound and lighting", "Separate rigs for each stage."),
+                    ("Sanitation", "Plan one toilet per 100 visitors and hourly cleaning."),
+                    ("Security agency", "Cover gates, stages and cash points."),
+                    ("Generators", "Size for peak load with a standby unit.")],
+        "risks": [("Overcrowding at peak hours", "High", "High",
+                   "Cap entry by counting footfall and open overflow zones."),
+                  ("Permissions not granted in time", "Medium", "High",
+                   "Apply to police, fire and municipal offices at least a month ahead.")],
+    },
+    "sports": {
+        "start": "08:00", "hours": 10, "per_head": 1200,
+        "agenda": {
+            "opening": [("Ground preparation and equipment check", "Ground staff"),
+                        ("Team reporting and accreditation", "Team coordinator"), ("Opening ceremony", "Host")],
+            "core": [("League matches", "Match officials"), ("Hydration and medical breaks", "Medical team"),
+                     ("Score updates", "Scorers")],
+            "closing": [("Finals", "Match officials"), ("Prize distribution", "Host"),
+                        ("Ground handover", "Ground staff")],
+        },
+        "zones": ["Playing field with team benches", "Officials and scoring table", "Spectator seating",
+                  "Medical tent", "Team changing rooms", "Equipment store"],
+        "budget": [("Venue and ground", 25), ("Equipment", 15), ("Officials", 10), ("Medical and safety", 10),
+                   ("Trophies and prizes", 15), ("Food and hydration", 15), ("Contingency", 10)],
+        "vendors": [("Ground or stadium", "Confirm floodlights and changing rooms."),
+                    ("Sports equipment", "Order spares for balls and nets."),
+                    ("Medical and ambulance", "Keep an ambulance on standby during matches."),
+                    ("Trophies", "Order two weeks ahead with engraving."),
+                    ("Caterer", "Plan energy food and water for players.")],
+        "risks": [("Player injuries", "Medium", "High", "Physio and first-aid at the ground with an ambulance on call."),
+                  ("Rain delays", "Medium", "Medium", "Keep reserve slots and a reduced-overs or short-format rule.")],
+    },
+    "school": {
+        "start": "09:00", "hours": 4, "per_head": 300,
+        "agenda": {
+            "opening": [("Assembly and seating", "Discipline committee"), ("Inauguration and lamp lighting", "Principal"),
+                        ("Welcome speech", "Student council")],
+            "core": [("Student performances", "Cultural coordinator"), ("Chief guest address", "Principal"),
+                     ("Prize distribution", "Awards committee")],
+            "closing": [("Vote of thanks and national anthem", "Student council"),
+                        ("Dispersal and parent pickup", "Discipline committee")],
+        },
+        "zones": ["Auditorium with class-wise seating", "Stage with backstage for performers", "Parents' seating",
+                  "Chief guest lounge", "First-aid room", "Pickup and drop zone"],
+        "budget": [("Stage and decor", 25), ("Sound and lighting", 20), ("Prizes and certificates", 20),
+                   ("Refreshments", 20), ("Printing", 5), ("Contingency", 10)],
+        "vendors": [("Sound and lighting", "Test microphones for student performers."),
+                    ("Decorator", "Keep decor clear of emergency exits."),
+                    ("Trophies and certificates", "Verify names and spellings before printing."),
+                    ("Refreshments", "Pack snacks class-wise for quick distribution."),
+                    ("Photographer", "Cover the prize distribution in full.")],
+        "risks": [("Child separation during dispersal", "Medium", "High",
+                   "Release students only to registered guardians by class."),
+                  ("Heat exhaustion", "Medium", "Medium", "Shade, water points and short outdoor segments.")],
+    },
+    "christmas": {
+        "start": "19:00", "hours": 4, "per_head": 500,
+        "agenda": {
+            "opening": [("Decor and lights check", "Decor team"), ("Welcome and carols", "Choir lead")],
+            "core": [("Mass or service", "Parish priest"), ("Nativity play", "Drama coordinator"),
+                     ("Cultural programs", "Program lead")],
+            "closing": [("Cake and food distribution", "Food committee"), ("Parking and dispersal", "Volunteers")],
+        },
+        "zones": ["Church or hall seating", "Crib and nativity display", "Choir area", "Food distribution counters",
+                  "Parking with marshals"],
+        "budget": [("Decor and lights", 25), ("Food and cake", 30), ("Sound", 15), ("Programs and costumes", 10),
+                   ("Gifts and charity", 10), ("Contingency", 10)],
+        "vendors": [("Lighting and decor", "Check the power load for serial lights."),
+                    ("Caterer or baker", "Order plum cakes in bulk early in December."),
+                    ("Sound", "Wireless microphones for the choir and play."),
+                    ("Costume rental", "Book nativity costumes in advance."),
+                    ("Printing", "Print carol sheets and the program order.")],
+        "risks": [("Power overload from lighting", "Medium", "High",
+                   "Get an electrician to check the load and keep a generator."),
+                  ("Parking congestion", "High", "Medium", "Marshals, one-way routes and overflow parking.")],
+    },
+}
+
+# Fixed sentences spoken by the avatar; precompiled into catalog/<lang>.json.
+SPEECH_SUMMARY = "I've prepared an updated structured response. Please review the left panel."
+PLAN_SUMMARY = "I've prepared a detailed {event_type} plan based on your inputs. You can review the full plan on the left panel."
+BUSY_MESSAGE = "I'm handling a lot of requests right now. Please try again in a moment."
+FALLBACK_FOLLOW_UPS = [
+    "Is there anything else I can help with?",
+    "Please let me know if you have more questions.",
+]
@@ -0,0 +1,25 @@
+"""Gunicorn settings: gunicorn -c gunicorn.conf.py app:app
+
+The app module is preloaded in the master; its heavy clients (LangChain,
+ChatGroq, googletrans and the per-thread translation clients) are warmed in
+each worker by a background thread started after fork, so workers serve
+/health (warm: false) straight away instead of waiting on the master.
+"""
+import os
+import threading
+
+# Warm in post_fork below; a warm-up thread must never be running at fork time
+if os.environ.get("WARMUP", "").lower() != "off":
+    os.environ["WARMUP"] = "postfork"
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", 2))
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+timeout = 120
+preload_app = True
+
+
+def post_fork(server, worker):
+    import app
+    if app.WARMUP == "postfork":
+        threading.Thread(target=app.warm_up, name="warm-up", daemon=True).start()
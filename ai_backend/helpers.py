@@ -1,4 +1,6 @@
-import requests
+from functools import lru_cache
+
+from knowledge import courses
 
 def personal_prompt():
     personal_prompt = """
@@ -16,30 +18,15 @@ def personal_prompt():
 
 
 def get_courses_from_api():
-    """Fetch courses data from the API endpoint."""
-    try:
-        response = requests.get("https://courses-npmj.vercel.app/api/courses/all")
-        response.raise_for_status()  # Raise an exception for 4XX/5XX responses
-        courses_data = response.json()
-        
-        print(courses_data)
-        
-        # Format the courses data as a string
-        formatted_courses = ""
-        for course in courses_data:
-            formatted_courses += f"- {course.get('courseName', 'No Title')}: {course.get('courseDescription', 'No Description')}, URl link: https://hackverse2025.vercel.app/home/{course.get('courseId', 'No Price')}\n"
-        
-        return formatted_courses
-    except Exception as e:
-        print(f"Error fetching courses: {e}")
-        return "Unable to fetch courses at this time."
+    """Formatted course list from the courses API (cached, see knowledge.py)."""
+    return courses.get()
 
-def get_mixed_prompt():
-    # Fetch courses from API instead of using empty string
-    current_cources = get_courses_from_api()
+
+@lru_cache(maxsize=4)
+def _compose_mixed_prompt(current_courses: str) -> str:
     course_prompt = f"""
     The following are the courses available:
-    {current_cources}
+    {current_courses}
     """
     past_stakes = ""
     past_stakes_prompt = f"""
@@ -52,3 +39,7 @@ def get_mixed_prompt():
     """
     
     return personal_prompt() + course_prompt + past_stakes_prompt
+
+def get_mixed_prompt():
+    # Rebuilt only when the course block changes
+    return _compose_mixed_prompt(get_courses_from_api())
@@ -0,0 +1,63 @@
+import html
+import re
+from typing import List, Tuple
+
+# Inside a tag, quoted attribute values may contain ">"
+_ATTRS = r"""(?:[^>"']|"[^"]*"|'[^']*')*"""
+# One pass over the markup: comments, raw-text elements and tags are kept
+# verbatim, everything between them is a text node.
+_MARKUP = re.compile(
+    r"<!--.*?-->"
+    rf"|<(script|style|code|pre)\b{_ATTRS}>.*?</\1\s*>"
+    r"|<![^>]*>"
+    rf"|</?[A-Za-z]{_ATTRS}>",
+    re.DOTALL | re.IGNORECASE,
+)
+# Text nodes that are only numbers, prices, dates or punctuation
+_NON_WORDS = re.compile(
+    r"^[\s\d₹$€£%.,:;/()\[\]+\-–—×x*#@!?&|'\"]*"
+    r"(?:(?:Rs\.?|INR|lakhs?|crores?|k|am|pm|hrs?)\b[\s\d₹.,:/()\-–]*)*$",
+    re.IGNORECASE,
+)
+
+
+def segment_html(markup: str) -> List[Tuple[str, bool]]:
+    """Split markup into (chunk, is_text) pieces whose concatenation is the input."""
+    pieces: List[Tuple[str, bool]] = []
+    pos = 0
+    for match in _MARKUP.finditer(markup):
+        if match.start() > pos:
+            pieces.append((markup[pos:match.start()], True))
+        pieces.append((match.group(0), False))
+        pos = match.end()
+    if pos < len(markup):
+        pieces.append((markup[pos:], True))
+    return pieces
+
+
+def needs_translation(text: str) -> bool:
+    """False for whitespace, numbers, ₹ amounts and other text with no words to translate."""
+    return any(ch.isalpha() for ch in text) and not _NON_WORDS.match(text)
+
+
+def text_nodes(markup: str) -> Tuple[List[Tuple[str, bool]], List[int], List[str]]:
+    """Segment markup and pick out the translatable text nodes (entities decoded)."""
+    pieces = segment_html(markup)
+    indices: List[int] = []
+    texts: List[str] = []
+    for i, (chunk, is_text) in enumerate(pieces):
+        if is_text:
+            text = html.unescape(chunk)
+            if needs_translation(text):
+                indices.append(i)
+                texts.append(text)
+    return pieces, indices, texts
+
+
+def splice(pieces: List[Tuple[str, bool]], indices: List[int], translated: List[str]) -> str:
+    """Put translated text nodes back into the original markup."""
+    chunks = [chunk for chunk, _ in pieces]
+    for i, text in zip(indices, translated):
+        chunks[i] = html.escape(text, quote=False)
+    return "".join(chunks)
+
@@ -0,0 +1,147 @@
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from cache import TieredCache
+from metrics import KNOWLEDGE_LOOKUPS
+
+logger = logging.getLogger(__name__)
+
+COURSES_API_URL = os.environ.get("COURSES_API_URL", "https://courses-npmj.vercel.app/api/courses/all")
+COURSE_LINK_BASE = os.environ.get("COURSE_LINK_BASE", "https://hackverse2025.vercel.app/home/")
+# Connect/read timeouts for the upstream API (seconds)
+KNOWLEDGE_CONNECT_TIMEOUT = float(os.environ.get("KNOWLEDGE_CONNECT_TIMEOUT", 3))
+KNOWLEDGE_READ_TIMEOUT = float(os.environ.get("KNOWLEDGE_READ_TIMEOUT", 5))
+# A snapshot is served as-is while younger than this; older ones are served
+# while a background refresh fetches a new one
+KNOWLEDGE_FRESH_TTL = float(os.environ.get("KNOWLEDGE_FRESH_TTL", 600))
+# Longest a last good snapshot is kept for when the upstream stays down
+KNOWLEDGE_SNAPSHOT_TTL = float(os.environ.get("KNOWLEDGE_SNAPSHOT_TTL", 7 * 24 * 3600))
+# With no snapshot at all, a failed fetch is not retried inline for this long
+KNOWLEDGE_RETRY_AFTER = float(os.environ.get("KNOWLEDGE_RETRY_AFTER", 30))
+
+UNAVAILABLE = "Unable to fetch courses at this time."
+
+_snapshots = TieredCache(
+    "knowledge",
+    max_entries=16,
+    ttl=KNOWLEDGE_SNAPSHOT_TTL,
+    max_disk_entries=64,
+    persistent=os.environ.get("KNOWLEDGE_CACHE_DISK", "1") != "0",
+)
+
+
+def make_session(pool_size: int = 4) -> requests.Session:
+    """Session with a small keep-alive pool; retries are left to the refresh cycle."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["Accept"] = "application/json"
+    return session
+
+
+def format_courses(courses: List[Dict[str, Any]]) -> str:
+    """One line per course, the shape the chat prompt expects."""
+    lines = []
+    for course in courses:
+        lines.append(
+            f"- {course.get('courseName', 'No Title')}: {course.get('courseDescription', 'No Description')}, "
+            f"URl link: {COURSE_LINK_BASE}{course.get('courseId', '')}"
+        )
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+class KnowledgeSource:
+    """Formatted text block from a JSON API, cached with stale-while-revalidate.
+
+    get() answers from the snapshot whenever one exists: a fresh one as-is, a
+    stale one while a single background refresh replaces it. Only the very
+    first call (no snapshot in memory or on disk) waits for the upstream.
+    Failed fetches keep the last good snapshot; with none, fallback is returned
+    and after any failure the upstream is not asked again for retry_after
+    seconds.
+    """
+
+    def __init__(self, name: str, url: str, format_block: Callable[[Any], str],
+                 fallback: str = "", fresh_ttl: float = KNOWLEDGE_FRESH_TTL,
+                 retry_after: float = KNOWLEDGE_RETRY_AFTER,
+                 timeout=(KNOWLEDGE_CONNECT_TIMEOUT, KNOWLEDGE_READ_TIMEOUT),
+                 session: Optional[requests.Session] = None, snapshots: TieredCache = _snapshots):
+        self.name = name
+        self.url = url
+        self.format_block = format_block
+        self.fallback = fallback
+        self.fresh_ttl = fresh_ttl
+        self.retry_after = retry_after
+        self.timeout = timeout
+        self.session = session or make_session()
+        self.snapshots = snapshots
+        self._refreshing = False
+        self._failed_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def _key(self) -> str:
+        return f"{self.name}\x1f{self.url}"
+
+    def fetch(self) -> str:
+        """Fetch and format the upstream payload; raises on any failure."""
+        response = self.session.get(self.url, timeout=self.timeout)
+        response.raise_for_status()
+        return self.format_block(response.json())
+
+    def refresh(self) -> Optional[str]:
+        """Fetch now and store the snapshot; returns None (keeping the old one) on failure."""
+        start = time.perf_counter()
+        try:
+            block = self.fetch()
+        except Exception as e:
+            logger.warning(f"Knowledge source {self.name} fetch failed: {e}")
+            self._failed_at = time.monotonic()
+            KNOWLEDGE_LOOKUPS.inc(source=self.name, result="fetch_error")
+            return None
+        self.snapshots.set(self._key, {"block": block, "fetched": time.time()})
+        logger.info(f"Knowledge source {self.name} refreshed in {(time.perf_counter() - start) * 1000:.0f}ms")
+        return block
+
+    def _refresh_in_background(self) -> None:
+        with self._lock:
+            recently_failed = self._failed_at and time.monotonic() - self._failed_at < self.retry_after
+            if self._refreshing or recently_failed:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                self.refresh()
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=run, name=f"knowledge-{self.name}", daemon=True).start()
+
+    def get(self) -> str:
+        snapshot = self.snapshots.get(self._key)
+        if snapshot is None:
+            # Do not make every request wait on an upstream that just failed
+            if self._failed_at and time.monotonic() - self._failed_at < self.retry_after:
+                KNOWLEDGE_LOOKUPS.inc(source=self.name, result="unavailable")
+                return self.fallback
+            block = self.refresh()
+            KNOWLEDGE_LOOKUPS.inc(source=self.name, result="miss" if block is not None else "unavailable")
+            return block if block is not None else self.fallback
+        if time.time() - snapshot["fetched"] > self.fresh_ttl:
+            self._refresh_in_background()
+            KNOWLEDGE_LOOKUPS.inc(source=self.name, result="stale")
+        else:
+            KNOWLEDGE_LOOKUPS.inc(source=self.name, result="fresh")
+        return snapshot["block"]
+
+
+courses = KnowledgeSource("courses", COURSES_API_URL, format_courses, fallback=UNAVAILABLE)
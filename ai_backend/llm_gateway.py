@@ -0,0 +1,341 @@
+import asyncio
+import contextvars
+import heapq
+import itertools
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from compaction import estimate_tokens
+from metrics import LLM_GATEWAY_REJECTIONS, LLM_QUEUE_SECONDS, stage
+
+logger = logging.getLogger(__name__)
+
+# Limits are per process: divide the account quota by the number of workers.
+# Rate limits apply to each model tier separately, as the provider's quotas do.
+LLM_MAX_CONCURRENCY = int(os.environ.get("LLM_MAX_CONCURRENCY", 8))
+LLM_REQUESTS_PER_MINUTE = float(os.environ.get("LLM_REQUESTS_PER_MINUTE", 30))
+LLM_TOKENS_PER_MINUTE = float(os.environ.get("LLM_TOKENS_PER_MINUTE", 0))
+LLM_SMALL_REQUESTS_PER_MINUTE = float(os.environ.get("LLM_SMALL_REQUESTS_PER_MINUTE", LLM_REQUESTS_PER_MINUTE))
+LLM_SMALL_TOKENS_PER_MINUTE = float(os.environ.get("LLM_SMALL_TOKENS_PER_MINUTE", LLM_TOKENS_PER_MINUTE))
+LLM_BURST = int(os.environ.get("LLM_BURST", 10))
+LLM_MAX_QUEUE = int(os.environ.get("LLM_MAX_QUEUE", 64))
+# Retries ChatGroq makes after a failed request
+LLM_MAX_RETRIES = int(os.environ.get("LLM_MAX_RETRIES", 1))
+# Longest one model call may take over all its attempts; kept well under the
+# gunicorn worker timeout (120s) to leave room for queueing and translation
+LLM_CALL_BUDGET = float(os.environ.get("LLM_CALL_BUDGET", 80))
+# Upstream timeout for a single ChatGroq request (seconds)
+LLM_REQUEST_TIMEOUT = float(os.environ.get("LLM_REQUEST_TIMEOUT", LLM_CALL_BUDGET / (LLM_MAX_RETRIES + 1)))
+# Longest an HTTP request may spend on all its model calls (queueing, router
+# fallback and section retries included), under the gunicorn worker timeout.
+# A call is only admitted while a whole LLM_CALL_BUDGET still fits before it.
+LLM_REQUEST_BUDGET = float(os.environ.get("LLM_REQUEST_BUDGET", 100))
+
+# Monotonic deadline of the current request's model calls (None: unbounded)
+_deadline: contextvars.ContextVar = contextvars.ContextVar("llm_deadline", default=None)
+# Consecutive upstream failures that open the circuit, and how long it stays open
+LLM_BREAKER_FAILURES = int(os.environ.get("LLM_BREAKER_FAILURES", 5))
+LLM_BREAKER_COOLDOWN = float(os.environ.get("LLM_BREAKER_COOLDOWN", 30))
+
+# Lower value is admitted first; deadline is the longest a request may queue
+PRIORITIES = {"chat": 0, "plan": 1, "background": 2}
+QUEUE_TIMEOUTS = {
+    "chat": float(os.environ.get("LLM_CHAT_QUEUE_TIMEOUT", 10)),
+    "plan": float(os.environ.get("LLM_PLAN_QUEUE_TIMEOUT", 30)),
+    "background": float(os.environ.get("LLM_BACKGROUND_QUEUE_TIMEOUT", 60)),
+}
+
+
+def start_deadline(budget: Optional[float] = LLM_REQUEST_BUDGET) -> None:
+    """Bound the model calls made from this context to budget seconds from now (None: unbounded)."""
+    _deadline.set(None if budget is None else time.monotonic() + budget)
+
+
+def current_deadline() -> Optional[float]:
+    return _deadline.get()
+
+
+def fits_call(deadline: Optional[float] = None) -> bool:
+    """Whether one more model call (all its attempts) can finish before the deadline."""
+    deadline = current_deadline() if deadline is None else deadline
+    return deadline is None or deadline - time.monotonic() > LLM_CALL_BUDGET
+
+
+def message_tokens(messages: List) -> int:
+    """Estimated prompt tokens of a message list (rate-limit cost)."""
+    return sum(estimate_tokens(m.content if isinstance(m.content, str) else str(m.content)) for m in messages)
+
+
+class LLMUnavailable(Exception):
+    """Raised instead of calling the LLM when the gateway sheds load."""
+
+    def __init__(self, reason: str, retry_after: float = 1.0):
+        super().__init__(f"LLM unavailable: {reason}")
+        self.reason = reason
+        self.retry_after = max(1.0, retry_after)
+
+
+class TokenBucket:
+    """Classic token bucket; callers hold the gateway lock."""
+
+    def __init__(self, per_minute: float, capacity: float):
+        self.rate = per_minute / 60.0
+        self.capacity = max(capacity, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, cost: float, now: float) -> float:
+        """Seconds until cost tokens are available (0 when they are now)."""
+        if self.rate <= 0:
+            return 0.0
+        self._refill(now)
+        cost = min(cost, self.capacity)
+        return 0.0 if self.tokens >= cost else (cost - self.tokens) / self.rate
+
+    def take(self, cost: float) -> None:
+        if self.rate > 0:
+            self.tokens -= min(cost, self.capacity)
+
+
+class CircuitBreaker:
+    """Opens after consecutive upstream failures; one trial call is let through per cooldown."""
+
+    def __init__(self, failures: int = LLM_BREAKER_FAILURES, cooldown: float = LLM_BREAKER_COOLDOWN):
+        self.threshold = failures
+        self.cooldown = cooldown
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "closed":
+                return True
+            now = time.monotonic()
+            if now - self._opened_at < self.cooldown or now - self._trial_at < self.cooldown:
+                return False
+            self.state = "half_open"
+            self._trial_at = now
+            return True
+
+    def retry_after(self) -> float:
+        with self._lock:
+            return max(0.0, self._opened_at + self.cooldown - time.monotonic())
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != "closed":
+                logger.info("LLM circuit closed")
+            self.state = "closed"
+            self._failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self.state == "half_open" or self._failures >= self.threshold:
+                if self.state == "closed":
+                    logger.warning(f"LLM circuit opened after {self._failures} consecutive failures")
+                self.state = "open"
+                self._opened_at = time.monotonic()
+
+
+class LLMGateway:
+    """Admission control in front of the chat models.
+
+    Requests wait in a bounded priority queue (chat before plans before
+    background work) until a concurrency slot and the rate-limit budget of
+    their model tier are free; a request whose tier is out of budget does not
+    hold up requests for the other tier queued behind it.
+    A request that cannot be admitted before its deadline, or that arrives
+    while the circuit is open, fails immediately with LLMUnavailable instead
+    of tying up a worker thread.
+    """
+
+    def __init__(self, max_concurrency: int = LLM_MAX_CONCURRENCY,
+                 requests_per_minute: float = LLM_REQUESTS_PER_MINUTE,
+                 tokens_per_minute: float = LLM_TOKENS_PER_MINUTE,
+                 burst: int = LLM_BURST, max_queue: int = LLM_MAX_QUEUE,
+                 breaker: Optional[CircuitBreaker] = None,
+                 small_requests_per_minute: float = LLM_SMALL_REQUESTS_PER_MINUTE,
+                 small_tokens_per_minute: float = LLM_SMALL_TOKENS_PER_MINUTE):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        # (requests, tokens) buckets per model tier
+        self.limits = {
+            "large": (TokenBucket(requests_per_minute, burst),
+                      TokenBucket(tokens_per_minute, tokens_per_minute / 60.0 * burst)),
+            "small": (TokenBucket(small_requests_per_minute, burst),
+                      TokenBucket(small_tokens_per_minute, small_tokens_per_minute / 60.0 * burst)),
+        }
+        self.breaker = breaker or CircuitBreaker()
+        self._active = 0
+        self._queue: List[tuple] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+
+    def _rate_wait(self, tier: str, cost: float, now: float) -> float:
+        requests, tokens = self.limits.get(tier, self.limits["large"])
+        return max(requests.wait_time(1, now), tokens.wait_time(cost, now))
+
+    def _enqueue(self, priority: str, timeout: Optional[float], tier: str, cost: float,
+                 deadline: Optional[float]) -> tuple:
+        if not self.breaker.allow():
+            self._reject("circuit_open", priority)
+            raise LLMUnavailable("circuit_open", self.breaker.retry_after())
+        timeout = QUEUE_TIMEOUTS.get(priority, 30.0) if timeout is None else timeout
+        deadline = current_deadline() if deadline is None else deadline
+        if deadline is not None:
+            # Stop queueing once the call could no longer finish before the deadline
+            timeout = min(timeout, deadline - time.monotonic() - LLM_CALL_BUDGET)
+            if timeout <= 0:
+                self._reject("deadline", priority)
+                raise LLMUnavailable("deadline")
+        entry = (PRIORITIES.get(priority, 1), next(self._seq), time.monotonic() + timeout, priority, tier, cost)
+        with self._cond:
+            if len(self._queue) >= self.max_queue:
+                self._reject("queue_full", priority)
+                raise LLMUnavailable("queue_full")
+            heapq.heappush(self._queue, entry)
+        return entry
+
+    def _first_eligible(self, entry: tuple, now: float) -> bool:
+        """True when every request queued ahead of entry is for another tier and out of budget."""
+        for ahead in self._queue:
+            if ahead < entry and (ahead[4] == entry[4] or not self._rate_wait(ahead[4], ahead[5], now)):
+                return False
+        return True
+
+    def _poll(self, entry: tuple) -> float:
+        """Admit entry if possible (returns 0), else return how long to wait. Holds the lock."""
+        now = time.monotonic()
+        deadline, priority, tier, cost = entry[2:]
+        if now >= deadline:
+            self._reject("queue_timeout", priority)
+            raise LLMUnavailable("queue_timeout")
+        if self._active >= self.max_concurrency or not self._first_eligible(entry, now):
+            return deadline - now
+        wait = self._rate_wait(tier, cost, now)
+        if wait > deadline - now:
+            # The rate limit cannot admit this request before its deadline
+            self._reject("rate_limited", priority)
+            raise LLMUnavailable("rate_limited", wait)
+        if wait > 0:
+            return wait
+        requests, tokens = self.limits.get(tier, self.limits["large"])
+        requests.take(1)
+        tokens.take(cost)
+        self._queue.remove(entry)
+        heapq.heapify(self._queue)
+        self._active += 1
+        self._cond.notify_all()
+        return 0.0
+
+    def _discard(self, entry: tuple) -> None:
+        with self._cond:
+            if entry in self._queue:
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+            self._cond.notify_all()
+
+    def _release(self) -> None:
+        with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+    def _reject(self, reason: str, priority: str) -> None:
+        LLM_GATEWAY_REJECTIONS.inc(reason=reason, priority=priority)
+        logger.warning(f"LLM gateway rejected {priority} request: {reason}")
+
+    def acquire(self, priority: str, cost: float = 0, timeout: Optional[float] = None,
+                tier: str = "large", deadline: Optional[float] = None) -> None:
+        """Block until admitted; raises LLMUnavailable when shedding load.
+
+        deadline (monotonic, default: the request's from start_deadline) bounds
+        queueing so the admitted call can still finish before it.
+        """
+        start = time.perf_counter()
+        entry = self._enqueue(priority, timeout, tier, cost, deadline)
+        try:
+            with stage("llm_queue"), self._cond:
+                while True:
+                    wait = self._poll(entry)
+                    if not wait:
+                        break
+                    self._cond.wait(wait)
+        except BaseException:
+            self._discard(entry)
+            raise
+        LLM_QUEUE_SECONDS.observe(time.perf_counter() - start, priority=priority)
+
+    async def aacquire(self, priority: str, cost: float = 0, timeout: Optional[float] = None,
+                       tier: str = "large", deadline: Optional[float] = None) -> None:
+        """asyncio counterpart of acquire; polls instead of blocking the event loop."""
+        start = time.perf_counter()
+        entry = self._enqueue(priority, timeout, tier, cost, deadline)
+        try:
+            with stage("llm_queue"):
+                while True:
+                    with self._cond:
+                        wait = self._poll(entry)
+                    if not wait:
+                        break
+                    await asyncio.sleep(min(wait, 0.05))
+        except BaseException:
+            self._discard(entry)
+            raise
+        LLM_QUEUE_SECONDS.observe(time.perf_counter() - start, priority=priority)
+
+    @contextmanager
+    def slot(self, priority: str, cost: float = 0, timeout: Optional[float] = None, tier: str = "large",
+             deadline: Optional[float] = None):
+        """Hold one admitted slot; exceptions inside count as upstream failures."""
+        self.acquire(priority, cost, timeout, tier, deadline)
+        try:
+            yield
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        else:
+            self.breaker.record_success()
+        finally:
+            self._release()
+
+    def call(self, fn: Callable[[], Any], priority: str, cost: float = 0, tier: str = "large",
+             deadline: Optional[float] = None) -> Any:
+        with self.slot(priority, cost, tier=tier, deadline=deadline):
+            return fn()
+
+    async def acall(self, fn: Callable[[], Awaitable[Any]], priority: str, cost: float = 0,
+                    tier: str = "large", deadline: Optional[float] = None) -> Any:
+        await self.aacquire(priority, cost, tier=tier, deadline=deadline)
+        try:
+            result = await fn()
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        else:
+            self.breaker.record_success()
+            return result
+        finally:
+            self._release()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "in_flight": self._active,
+                "queued": len(self._queue),
+                "circuit": self.breaker.state,
+            }
+
+
+gateway = LLMGateway()
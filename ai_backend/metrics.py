@@ -0,0 +1,270 @@
+import contextvars
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Requests slower than this (ms) are logged with their per-stage breakdown; 0 disables
+SLOW_REQUEST_MS = float(os.environ.get("SLOW_REQUEST_MS", 0))
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Tuple[str, ...], values: Tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [f"{self.name}{_labels(self.labelnames, k)} {_fmt(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    """Gauge whose samples are read from a callback at scrape time."""
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = (),
+                 callback: Optional[Callable[[], Dict[Tuple, float]]] = None):
+        super().__init__(name, help_text, labelnames)
+        self.callback = callback
+
+    def render(self) -> List[str]:
+        try:
+            samples = self.callback() if self.callback else {}
+        except Exception as e:
+            logger.warning(f"Gauge {self.name} callback failed: {e}")
+            samples = {}
+        lines = self.header()
+        for key, value in sorted(samples.items()):
+            key = key if isinstance(key, tuple) else (key,)
+            lines.append(f"{self.name}{_labels(self.labelnames, key)} {_fmt(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple, List] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = [[0] * len(self.buckets), 0.0, 0]
+                self._series[key] = series
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, ([*v[0]], v[1], v[2])) for k, v in self._series.items())
+        lines = self.header()
+        for key, (counts, total, count) in items:
+            for bound, c in zip(self.buckets, counts):
+                le = 'le="%s"' % _fmt(bound)
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {c}")
+            inf = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, inf)} {count}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_fmt(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+REQUESTS = registry.register(Counter(
+    "http_requests_total", "HTTP requests by endpoint and status.", ("endpoint", "status")))
+REQUEST_SECONDS = registry.register(Histogram(
+    "http_request_duration_seconds", "End-to-end request latency.", ("endpoint",)))
+STAGE_SECONDS = registry.register(Histogram(
+    "stage_duration_seconds", "Latency of each pipeline stage.", ("endpoint", "stage")))
+LLM_TOKENS = registry.register(Counter(
+    "llm_tokens_total", "LLM tokens by endpoint and kind (prompt/completion).", ("endpoint", "kind")))
+LLM_JSON_PARSE = registry.register(Counter(
+    "llm_json_parse_total", "LLM outputs by JSON parse result (ok/error).", ("endpoint", "result")))
+LLM_ROUTE_DECISIONS = registry.register(Counter(
+    "llm_route_decisions_total", "Model router decisions by request kind, tier and reason.", ("kind", "tier", "reason")))
+LLM_ROUTE_FALLBACKS = registry.register(Counter(
+    "llm_route_fallbacks_total",
+    "Small-model outputs that failed to parse, by whether they were redone on the large model.",
+    ("kind", "result")))
+LLM_TIER_SECONDS = registry.register(Histogram(
+    "llm_tier_duration_seconds", "LLM call latency by model tier and request kind.", ("tier", "kind")))
+LLM_TIER_JSON = registry.register(Counter(
+    "llm_tier_json_total", "Routed LLM outputs by model tier and JSON validity (ok/error).", ("tier", "result")))
+LLM_GATEWAY_REJECTIONS = registry.register(Counter(
+    "llm_gateway_rejections_total", "LLM calls shed by the gateway by reason and priority.", ("reason", "priority")))
+LLM_QUEUE_SECONDS = registry.register(Histogram(
+    "llm_queue_wait_seconds", "Time LLM calls waited for admission by priority.", ("priority",)))
+PLAN_DEGRADED = registry.register(Counter(
+    "plan_degraded_total", "Event plans answered by the offline generator, by reason (slo/error).", ("reason",)))
+PLAN_JOBS = registry.register(Counter(
+    "plan_jobs_total", "Event plan jobs by outcome (done/degraded/failed/rejected).", ("status",)))
+KNOWLEDGE_LOOKUPS = registry.register(Counter(
+    "knowledge_source_lookups_total", "Knowledge source lookups by source and result (fresh/stale/miss/unavailable/fetch_error).",
+    ("source", "result")))
+TRANSLATION_CALLS = registry.register(Counter(
+    "translation_calls_total", "Network calls made to the translation service.", ("kind",)))
+TRANSLATION_SEGMENTS = registry.register(Counter(
+    "translation_segments_total",
+    "Strings given to the translator by outcome (translated/cache_hit/skipped_script/skipped_no_words).",
+    ("result",)))
+
+# Request-scoped state: endpoint label and per-stage breakdown of the current request
+_endpoint: contextvars.ContextVar = contextvars.ContextVar("metrics_endpoint", default="background")
+_breakdown: contextvars.ContextVar = contextvars.ContextVar("metrics_breakdown", default=None)
+
+
+def begin_request(endpoint: str) -> None:
+    _endpoint.set(endpoint or "unknown")
+    _breakdown.set({"_start": time.perf_counter()})
+
+
+def end_request(status: int) -> None:
+    breakdown = _breakdown.get()
+    if breakdown is None:
+        return
+    endpoint = _endpoint.get()
+    elapsed = time.perf_counter() - breakdown.pop("_start")
+    REQUESTS.inc(endpoint=endpoint, status=status)
+    REQUEST_SECONDS.observe(elapsed, endpoint=endpoint)
+    if SLOW_REQUEST_MS and elapsed * 1000 >= SLOW_REQUEST_MS:
+        stages = ", ".join(f"{name}={seconds * 1000:.0f}ms" for name, seconds in breakdown.items())
+        logger.warning(f"Slow request {endpoint} ({status}) {elapsed * 1000:.0f}ms: {stages or 'no stages'}")
+    _breakdown.set(None)
+
+
+def current_endpoint() -> str:
+    return _endpoint.get()
+
+
+@contextmanager
+def stage(name: str):
+    """Time a pipeline stage and attribute it to the current request."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.observe(elapsed, endpoint=_endpoint.get(), stage=name)
+        breakdown = _breakdown.get()
+        if breakdown is not None:
+            breakdown[name] = breakdown.get(name, 0.0) + elapsed
+
+
+def record_llm_usage(result) -> None:
+    """Count prompt/completion tokens from a LangChain AIMessage, when reported."""
+    usage = getattr(result, "usage_metadata", None) or {}
+    prompt = usage.get("input_tokens")
+    completion = usage.get("output_tokens")
+    if prompt is None and completion is None:
+        token_usage = (getattr(result, "response_metadata", None) or {}).get("token_usage") or {}
+        prompt = token_usage.get("prompt_tokens")
+        completion = token_usage.get("completion_tokens")
+    endpoint = _endpoint.get()
+    if prompt:
+        LLM_TOKENS.inc(prompt, endpoint=endpoint, kind="prompt")
+    if completion:
+        LLM_TOKENS.inc(completion, endpoint=endpoint, kind="completion")
+
+
+def record_json_parse(ok: bool) -> None:
+    LLM_JSON_PARSE.inc(endpoint=_endpoint.get(), result="ok" if ok else "error")
+
+
+def gauge(name: str, help_text: str, callback: Callable[[], Dict], labelnames: Iterable[str] = ()) -> Gauge:
+    """Register a scrape-time gauge."""
+    return registry.register(Gauge(name, help_text, labelnames, callback))
+
+
+def stage_iter(name: str, iterable):
+    """Attribute the time spent producing an iterator's items to one stage observation."""
+    endpoint = _endpoint.get()
+    breakdown = _breakdown.get()
+    total = 0.0
+    iterator = iter(iterable)
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                total += time.perf_counter() - start
+            yield item
+    finally:
+        STAGE_SECONDS.observe(total, endpoint=endpoint, stage=name)
+        if breakdown is not None:
+            breakdown[name] = breakdown.get(name, 0.0) + total
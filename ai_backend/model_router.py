@@ -0,0 +1,201 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from llm_gateway import LLMGateway, fits_call, message_tokens
+from metrics import (LLM_ROUTE_DECISIONS, LLM_ROUTE_FALLBACKS, LLM_TIER_JSON, LLM_TIER_SECONDS,
+                     record_llm_usage, stage)
+from sectioned_plan import load_json
+
+logger = logging.getLogger(__name__)
+
+# Model tiers: "small" answers trivial turns, "large" everything else
+SMALL_MODEL = os.environ.get("SMALL_MODEL", "llama-3.1-8b-instant")
+LARGE_MODEL = os.environ.get("LARGE_MODEL", "llama-3.3-70b-versatile")
+
+# Set MODEL_ROUTER=off to send every request to the large model
+ROUTER_ENABLED = os.environ.get("MODEL_ROUTER", "on").lower() not in ("0", "off", "false", "no")
+# Chat turns up to this many (estimated) tokens can go to the small model
+ROUTER_MAX_QUERY_TOKENS = int(os.environ.get("ROUTER_MAX_QUERY_TOKENS", 40))
+# ...as long as the conversation has had at most this many assistant turns
+ROUTER_MAX_DEPTH = int(os.environ.get("ROUTER_MAX_DEPTH", 6))
+# The small tier is skipped while its recent JSON-valid rate is below this
+ROUTER_MIN_JSON_RATE = float(os.environ.get("ROUTER_MIN_JSON_RATE", 0.9))
+ROUTER_JSON_WINDOW = int(os.environ.get("ROUTER_JSON_WINDOW", 50))
+ROUTER_MIN_SAMPLES = int(os.environ.get("ROUTER_MIN_SAMPLES", 10))
+# Plan sections stay on the large model unless this is on, since cached plans
+# do not record which tier wrote them
+ROUTER_SMALL_SECTIONS = os.environ.get("ROUTER_SMALL_SECTIONS", "off").lower() in ("1", "on", "true", "yes")
+# While the small tier is benched, every Nth eligible request still probes it
+ROUTER_PROBE_EVERY = int(os.environ.get("ROUTER_PROBE_EVERY", 20))
+
+# Queries that ask for planning work need the large model
+PLAN_WORDS = re.compile(
+    r"\b(plan|planning|budget|schedule|timeline|itinerary|checklist|vendors?|logistics|"
+    r"estimate|breakdown|compare|list)\b",
+    re.IGNORECASE,
+)
+# Gateway priority of each request kind
+KIND_PRIORITY = {"chat": "chat", "plan": "plan", "plan_section": "plan"}
+
+
+@dataclass(frozen=True)
+class RouteDecision:
+    tier: str
+    reason: str
+    kind: str
+
+
+def is_json_object(content: str) -> bool:
+    """Strict check used for chat replies: the whole output must be a JSON object."""
+    try:
+        return isinstance(json.loads(content), dict)
+    except (TypeError, ValueError):
+        return False
+
+
+def contains_json(content: str) -> bool:
+    """Lenient check used for plan sections (fences and surrounding prose allowed)."""
+    return isinstance(load_json(content), dict)
+
+
+def _content(result) -> str:
+    return result.content if isinstance(result.content, str) else str(result.content)
+
+
+class ModelRouter:
+    """Chooses a model tier per request from cheap features and falls back on bad JSON.
+
+    get_model(tier) returns the chat model for "small" or "large"; it is looked up
+    on every call so the models can be swapped (e.g. by the benchmark stubs).
+    Calls go through gateway when one is given.
+    """
+
+    def __init__(self, get_model: Callable[[str], Any], enabled: bool = ROUTER_ENABLED,
+                 gateway: Optional[LLMGateway] = None):
+        self.get_model = get_model
+        self.gateway = gateway
+        self.enabled = enabled
+        self._json: Dict[str, Deque[bool]] = {
+            tier: deque(maxlen=ROUTER_JSON_WINDOW) for tier in ("small", "large")
+        }
+        self._benched = 0
+        self._lock = threading.Lock()
+
+    def json_rate(self, tier: str) -> Optional[float]:
+        """Recent JSON-valid rate of a tier, or None until enough samples exist."""
+        with self._lock:
+            window = self._json[tier]
+            if len(window) < ROUTER_MIN_SAMPLES:
+                return None
+            return sum(window) / len(window)
+
+    def record_output(self, tier: str, ok: bool) -> None:
+        with self._lock:
+            self._json[tier].append(ok)
+        LLM_TIER_JSON.inc(tier=tier, result="ok" if ok else "error")
+
+    def route(self, kind: str, query: str = "", depth: int = 0) -> RouteDecision:
+        """Pick a tier for a "chat", "plan" or "plan_section" request."""
+        tier, reason = self._choose(kind, query, depth)
+        LLM_ROUTE_DECISIONS.inc(kind=kind, tier=tier, reason=reason)
+        logger.debug(f"Routed {kind} to {tier} ({reason})")
+        return RouteDecision(tier=tier, reason=reason, kind=kind)
+
+    def _choose(self, kind: str, query: str, depth: int):
+        if not self.enabled:
+            return "large", "disabled"
+        if kind == "plan":
+            return "large", "plan"
+        if kind == "plan_section" and not ROUTER_SMALL_SECTIONS:
+            return "large", "plan"
+        if kind == "chat":
+            if PLAN_WORDS.search(query or ""):
+                return "large", "plan_request"
+            if len(query or "") / 4 > ROUTER_MAX_QUERY_TOKENS:
+                return "large", "long_query"
+            if depth > ROUTER_MAX_DEPTH:
+                return "large", "deep_conversation"
+        rate = self.json_rate("small")
+        if rate is not None and rate < ROUTER_MIN_JSON_RATE:
+            # Keep sampling the small tier so its history can recover
+            with self._lock:
+                self._benched += 1
+                probe = ROUTER_PROBE_EVERY > 0 and self._benched % ROUTER_PROBE_EVERY == 0
+            if not probe:
+                return "large", "json_history"
+            return "small", "probe"
+        return "small", "section" if kind == "plan_section" else "short_query"
+
+    def invoke(self, messages: List, decision: RouteDecision,
+               validate: Callable[[str], bool] = is_json_object):
+        """Invoke the chosen tier; small-tier output that fails validate is redone on large."""
+        result = self._invoke(decision.tier, messages, decision.kind)
+        ok = validate(_content(result))
+        self.record_output(decision.tier, ok)
+        if ok or decision.tier == "large":
+            return result
+        if not fits_call():
+            # The caller copes with invalid JSON; a worker killed mid-call helps nobody
+            LLM_ROUTE_FALLBACKS.inc(kind=decision.kind, result="skipped")
+            logger.warning(f"Small model returned invalid JSON for {decision.kind}; no time left to retry")
+            return result
+        LLM_ROUTE_FALLBACKS.inc(kind=decision.kind, result="retried")
+        logger.warning(f"Small model returned invalid JSON for {decision.kind}; retrying on large")
+        result = self._invoke("large", messages, decision.kind)
+        self.record_output("large", validate(_content(result)))
+        return result
+
+    async def ainvoke(self, messages: List, decision: RouteDecision,
+                      validate: Callable[[str], bool] = is_json_object):
+        """asyncio counterpart of invoke for the ASGI app."""
+        result = await self._ainvoke(decision.tier, messages, decision.kind)
+        ok = validate(_content(result))
+        self.record_output(decision.tier, ok)
+        if ok or decision.tier == "large":
+            return result
+        if not fits_call():
+            LLM_ROUTE_FALLBACKS.inc(kind=decision.kind, result="skipped")
+            logger.warning(f"Small model returned invalid JSON for {decision.kind}; no time left to retry")
+            return result
+        LLM_ROUTE_FALLBACKS.inc(kind=decision.kind, result="retried")
+        logger.warning(f"Small model returned invalid JSON for {decision.kind}; retrying on large")
+        result = await self._ainvoke("large", messages, decision.kind)
+        self.record_output("large", validate(_content(result)))
+        return result
+
+    def _invoke(self, tier: str, messages: List, kind: str):
+        start = time.perf_counter()
+        model = self.get_model(tier)
+        priority = KIND_PRIORITY.get(kind, "plan")
+        with stage("llm_invoke"):
+            if self.gateway is not None:
+                result = self.gateway.call(lambda: model.invoke(messages), priority, message_tokens(messages), tier)
+            else:
+                result = model.invoke(messages)
+        LLM_TIER_SECONDS.observe(time.perf_counter() - start, tier=tier, kind=kind)
+        record_llm_usage(result)
+        return result
+
+    async def _ainvoke(self, tier: str, messages: List, kind: str):
+        start = time.perf_counter()
+        model = self.get_model(tier)
+        priority = KIND_PRIORITY.get(kind, "plan")
+        with stage("llm_invoke"):
+            if self.gateway is not None:
+                result = await self.gateway.acall(lambda: model.ainvoke(messages), priority,
+                                                  message_tokens(messages), tier)
+            else:
+                result = await model.ainvoke(messages)
+        LLM_TIER_SECONDS.observe(time.perf_counter() - start, tier=tier, kind=kind)
+        record_llm_usage(result)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {tier: {"json_rate": self.json_rate(tier)} for tier in self._json}
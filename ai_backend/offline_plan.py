@@ -0,0 +1,345 @@
+"""Deterministic, template-driven event plans for when the LLM is slow or down.
+
+build_offline_plan() turns the questionnaire answers into a plan_json with every
+PLAN_SECTIONS key, using PLAN_TEMPLATES and EVENT_TYPES from
+event_data. It does no I/O and returns in well under a millisecond.
+"""
+import math
+import os
+import re
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from event_data import EVENT_TYPES, PLAN_SECTIONS, PLAN_TEMPLATES
+
+# Answer /api/event-plan with the offline plan when the LLM plan has been
+# building for longer than this (0, the default, disables it). The LLM plan
+# carries on as a plan job; the response names the job to poll for it.
+PLAN_LLM_SLO_MS = float(os.environ.get("PLAN_LLM_SLO_MS", 0))
+# Serve the offline plan instead of an error when the LLM call fails
+PLAN_OFFLINE_FALLBACK = os.environ.get("PLAN_OFFLINE_FALLBACK", "1") != "0"
+# Longest event the offline plan lays out (festivals and exhibitions run about
+# two weeks); longer answers are capped so the timeline stays a few hundred rows
+OFFLINE_MAX_DAYS = int(os.environ.get("OFFLINE_PLAN_MAX_DAYS", 14))
+MAX_HOURS_PER_DAY = 24.0
+
+MONTHS = {m: i for i, m in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], start=1)}
+
+_DASH = r"\s*(?:-|–|—|to)\s*"
+_DAY = r"(?<!\d)(\d{1,2})(?:st|nd|rd|th)?(?!\d)"
+_MONTH = r"([A-Za-z]{3,9})\.?"
+_YEAR = r"(?:,?\s*(\d{4}))?"
+_DAY_RANGE = re.compile(_DAY + _DASH + _DAY + r"\s+" + _MONTH + _YEAR)
+_DAY_MONTH = re.compile(_DAY + r"\s+" + _MONTH + _YEAR)
+_MONTH_DAY = re.compile(_MONTH + r"\s+" + _DAY + r"(?:" + _DASH + _DAY + r")?" + _YEAR)
+_ISO = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})")
+_NUMERIC = re.compile(r"(?<!\d)(\d{1,2})[/.](\d{1,2})[/.](\d{4})(?!\d)")
+
+_AMOUNT = re.compile(r"(\d[\d,]*(?:\.\d+)?)\s*(crores?|cr|lakhs?|lacs?|l|k|thousand)?(?![a-z])")
+_MULTIPLIERS = {"crore": 10 ** 7, "crores": 10 ** 7, "cr": 10 ** 7, "lakh": 10 ** 5, "lakhs": 10 ** 5,
+                "lac": 10 ** 5, "lacs": 10 ** 5, "l": 10 ** 5, "k": 1000, "thousand": 1000}
+_COUNT = re.compile(r"(\d[\d,]*(?:\.\d+)?)\s*(?:(k|thousand|lakhs?)\b)?\s*([a-z]+)?")
+
+_CLOCK = re.compile(r"(?<![\d:])(\d{1,2})(?:[:.](\d{2}))?\s*(am|pm)?(?![\d])", re.IGNORECASE)
+_HOURS = re.compile(r"(\d+(?:\.\d+)?)\s*(?:hours?|hrs?|h)\b", re.IGNORECASE)
+_DAYS = re.compile(r"(\d+)\s*days?\b", re.IGNORECASE)
+
+OUTDOOR_WORDS = ("ground", "open", "lawn", "garden", "beach", "stadium", "field", "outdoor", "terrace", "park")
+TEAM_SIZE = 15
+
+# (role, one per this many people, minimum, responsibilities)
+STAFF_RATIOS = [
+    ("Event lead", 0, 1, "Owns the run-of-show, vendor coordination and decisions on the day."),
+    ("Registration and hospitality", 150, 2, "Check-in, guest queries and VIP handling."),
+    ("Volunteers and ushers", 50, 2, "Seating, directions and crowd flow."),
+    ("Security", 100, 2, "Entry checks, crowd control and emergency exits."),
+    ("Catering staff", 25, 2, "Food service, water and cleanliness of dining areas."),
+    ("First-aid", 250, 1, "Medical kit, first response and ambulance coordination."),
+    ("AV technician", 500, 1, "Sound, projection, lighting and power backup."),
+]
+
+COMMON_RISKS = [
+    ("Vendor no-show or late delivery", "Medium", "High",
+     "Keep a backup vendor for each critical category and confirm 48 hours before."),
+    ("Power outage", "Medium", "High", "Generator with fuel for the full duration and UPS for AV."),
+    ("Medical emergency", "Low", "High", "First-aid desk, ambulance contact and a clear evacuation route."),
+    ("Attendance above capacity", "Medium", "Medium", "Track RSVPs or ticket sales and cap entry at the gate."),
+    ("Budget overrun", "Medium", "Medium", "Hold the contingency line and approve changes against it."),
+]
+WEATHER_RISK = ("Rain or extreme heat at an outdoor venue", "Medium", "High",
+                "Book covered backup space or tents and keep water and shade available.")
+
+# (days before the event, action, owner)
+MILESTONES = [
+    (60, "Confirm the venue booking and sign the contract", "Event lead"),
+    (45, "Shortlist and book the key vendors", "Event lead"),
+    (30, "Finalise the budget allocation and release advances", "Finance lead"),
+    (21, "Send invitations or open registration", "Registration and hospitality"),
+    (14, "Confirm the headcount and catering numbers", "Catering staff"),
+    (7, "Walk through the venue with vendors and share the run-of-show", "Event lead"),
+    (2, "Brief staff and volunteers and print signage", "Volunteers and ushers"),
+    (1, "Complete setup and final checks at the venue", "Event lead"),
+]
+
+
+def template(event_type: str) -> Dict[str, Any]:
+    """PLAN_TEMPLATES entry for event_type with missing keys taken from "default"."""
+    merged = dict(PLAN_TEMPLATES["default"])
+    merged.update(PLAN_TEMPLATES.get(event_type, {}))
+    return merged
+
+
+def _month(name: str) -> Optional[int]:
+    return MONTHS.get(name[:3].lower())
+
+
+def _make_date(year: Optional[int], month: Optional[int], day: int, today: date) -> Optional[date]:
+    if not month:
+        return None
+    try:
+        if year:
+            return date(year, month, day)
+        candidate = date(today.year, month, day)
+        return candidate if candidate >= today else date(today.year + 1, month, day)
+    except ValueError:
+        return None
+
+
+def parse_dates(text: str, today: Optional[date] = None) -> Optional[Tuple[date, date]]:
+    """First and last day mentioned in text, e.g. "12-14 Dec 2025" or "21 Jan 2026".
+
+    Missing years take the year written elsewhere in the text, else the next
+    occurrence of that day.
+    """
+    today = today or date.today()
+    text = text or ""
+    explicit_years = [int(y) for y in re.findall(r"(?<!\d)(\d{4})(?!\d)", text)]
+    year_hint = explicit_years[0] if explicit_years else None
+    found: List[date] = []
+
+    def add(year, month, day):
+        d = _make_date(int(year) if year else year_hint, month, int(day), today)
+        if d:
+            found.append(d)
+
+    for y, m, d in _ISO.findall(text):
+        add(y, int(m), d)
+    for d, m, y in _NUMERIC.findall(text):
+        add(y, int(m), d)
+    for d1, d2, m, y in _DAY_RANGE.findall(text):
+        add(y, _month(m), d1)
+        add(y, _month(m), d2)
+    for d, m, y in _DAY_MONTH.findall(text):
+        add(y, _month(m), d)
+    for m, d1, d2, y in _MONTH_DAY.findall(text):
+        add(y, _month(m), d1)
+        if d2:
+            add(y, _month(m), d2)
+    if not found:
+        return None
+    return min(found), max(found)
+
+
+def parse_budget(text: str) -> Optional[int]:
+    """Rupee amount in text: "₹5,00,000", "2.5 lakh", "1 crore", "50k". Ranges give the upper bound."""
+    text = (text or "").lower().replace("₹", " ").replace("rs.", " ").replace("inr", " ")
+    amounts = []
+    for number, unit in _AMOUNT.findall(text):
+        try:
+            value = float(number.replace(",", ""))
+        except ValueError:
+            continue
+        amounts.append(value * _MULTIPLIERS.get(unit, 1))
+    amounts = [a for a in amounts if a > 0]
+    return int(round(max(amounts))) if amounts else None
+
+
+def parse_head_count(text: str) -> Tuple[Optional[int], bool]:
+    """Total people in text ("30 kids, 20 adults" -> 50) and whether it counted teams."""
+    total = 0
+    teams = False
+    for number, unit, word in _COUNT.findall((text or "").lower()):
+        try:
+            value = float(number.replace(",", ""))
+        except ValueError:
+            continue
+        value *= _MULTIPLIERS.get(unit, 1)
+        if word and word.startswith("team"):
+            teams = True
+            value *= TEAM_SIZE
+        total += value
+    return (int(total) if total else None), teams
+
+
+def parse_schedule(text: str, default_start: str, default_hours: float) -> Tuple[int, float, int]:
+    """(start minute of day, hours per day, days) from answers like "5 PM, 3 hours" or "9 AM–6 PM"."""
+    text = text or ""
+    times = []
+    meridiem = None
+    for hour, minute, ampm in reversed(_CLOCK.findall(text)):
+        # "8–10 PM": a bare hour takes the meridiem of the time after it
+        ampm = (ampm or "").lower() or None
+        if ampm:
+            meridiem = ampm
+        elif not minute and not meridiem:
+            continue
+        h, m = int(hour), int(minute or 0)
+        ampm = ampm or meridiem
+        if h > 23 or m > 59:
+            continue
+        if ampm == "pm" and h < 12:
+            h += 12
+        elif ampm == "am" and h == 12:
+            h = 0
+        times.append(h * 60 + m)
+    times.reverse()
+
+    hours_match = _HOURS.search(text)
+    days_match = _DAYS.search(text)
+    dh, dm = (int(p) for p in default_start.split(":"))
+    start = times[0] if times else dh * 60 + dm
+    hours = float(default_hours)
+    days = 1
+    if len(times) >= 2 and times[-1] > start:
+        hours = (times[-1] - start) / 60
+    if hours_match:
+        total = float(hours_match.group(1))
+        if total > 16:
+            days = max(1, math.ceil(total / 24))
+        else:
+            hours = total
+    if days_match:
+        days = max(days, int(days_match.group(1)))
+    return start, min(max(1.0, hours), MAX_HOURS_PER_DAY), min(days, OFFLINE_MAX_DAYS)
+
+
+def format_inr(amount: int) -> str:
+    """Indian digit grouping: 1500000 -> ₹15,00,000."""
+    digits = str(int(round(amount)))
+    if len(digits) > 3:
+        head, tail = digits[:-3], digits[-3:]
+        head = ",".join(re.findall(r"\d{1,2}", head[::-1]))[::-1]
+        digits = f"{head},{tail}"
+    return f"₹{digits}"
+
+
+def _day(d: date) -> str:
+    return f"{d.day} {d:%b %Y}"
+
+
+def _clock(minutes: int) -> str:
+    return datetime(2000, 1, 1, (minutes // 60) % 24, minutes % 60).strftime("%I:%M %p").lstrip("0")
+
+
+def _timeline(tpl: Dict[str, Any], start: int, hours: float, days: int) -> List[Dict[str, str]]:
+    agenda = tpl["agenda"]
+    timeline = []
+    for day in range(1, days + 1):
+        items = list(agenda["core"])
+        if day == 1:
+            items = agenda["opening"] + items
+        if day == days:
+            items = items + agenda["closing"]
+        step = hours * 60 / len(items)
+        for i, (activity, owner) in enumerate(items):
+            at = _clock(int(start + i * step))
+            timeline.append({
+                "time": f"Day {day}, {at}" if days > 1 else at,
+                "activity": activity,
+                "owner": owner,
+            })
+    return timeline
+
+
+def _budget(tpl: Dict[str, Any], budget: int) -> List[Dict[str, str]]:
+    # Whole ₹100 units split by largest remainder, so no line goes negative and
+    # the lines add up to the budget; the odd rupees go to the last line
+    shares = tpl["budget"]
+    total = sum(share for _, share in shares) or 1
+    units, odd = divmod(int(budget), 100)
+    exact = [units * share / total for _, share in shares]
+    counts = [math.floor(x) for x in exact]
+    by_remainder = sorted(range(len(shares)), key=lambda i: exact[i] - counts[i], reverse=True)
+    for i in by_remainder[:units - sum(counts)]:
+        counts[i] += 1
+    lines = []
+    for i, (category, share) in enumerate(shares):
+        amount = counts[i] * 100 + (odd if i == len(shares) - 1 else 0)
+        lines.append({"category": category, "share": f"{share}%", "amount": format_inr(amount)})
+    return lines
+
+
+def build_offline_plan(event_type: str, answers: Dict[str, Any], today: Optional[date] = None) -> Dict[str, Any]:
+    """A complete plan_json (every PLAN_SECTIONS key) from the questionnaire answers."""
+    today = today or date.today()
+    answers = {k: str(v) for k, v in (answers or {}).items() if v not in (None, "")}
+    tpl = template(event_type)
+    name = EVENT_TYPES.get(event_type, {}).get("name", "Event").replace(" AI", "")
+
+    dates = parse_dates(answers.get("date", ""), today)
+    people, teams = parse_head_count(answers.get("people", ""))
+    start, hours, days = parse_schedule(answers.get("time", ""), tpl["start"], tpl["hours"])
+    if dates:
+        days = min(max(days, (dates[1] - dates[0]).days + 1), OFFLINE_MAX_DAYS)
+    budget = parse_budget(answers.get("budget", ""))
+    estimated = budget is None
+    if estimated:
+        budget = tpl["per_head"] * (people or 100) * days
+    headcount = people or 100
+    venue = answers.get("venue", "the venue")
+    outdoor = any(word in venue.lower() for word in OUTDOOR_WORDS)
+
+    when = _day(dates[0]) if dates else answers.get("date", "a date to be confirmed")
+    if dates and dates[1] > dates[0]:
+        when = f"{dates[0].day} {dates[0]:%b} to {_day(dates[1])}"
+    overview = (
+        f"{name} at {venue} on {when} for about {headcount:,} "
+        f"{'participants (from team count)' if teams else 'people'}, "
+        f"{days} day{'s' if days > 1 else ''} from {_clock(start)}, "
+        f"with {'an estimated' if estimated else 'a'} budget of {format_inr(budget)} "
+        f"(about {format_inr(budget / headcount)} per person)."
+    )
+
+    plan = {
+        "overview": overview,
+        "timeline": _timeline(tpl, start, hours, days),
+        "venue_layout": tpl["zones"] + [
+            f"Seating for {headcount:,} needs about {headcount * 10:,} sq ft (10 sq ft per seated guest).",
+            f"Plan {max(2, math.ceil(headcount / 100))} entry lanes and keep emergency exits unobstructed.",
+        ],
+        "logistics": [
+            f"Registration: {max(1, math.ceil(headcount / 150))} check-in desks.",
+            f"Catering: about {headcount * days:,} meals plus 10% buffer; {math.ceil(headcount * days * 2 / 1000):,} kL drinking water.",
+            f"Restrooms: at least {max(2, math.ceil(headcount / 75))}, cleaned every two hours.",
+            f"Parking: about {max(10, math.ceil(headcount / 4)):,} vehicle slots or a shuttle service.",
+            "AV: PA system, wireless microphones, projector or LED wall and a backup power source.",
+            "Permissions: police, fire and venue approvals; sound limits after 10 PM.",
+        ],
+        "staffing_roles": [
+            {"role": role, "count": max(minimum, math.ceil(headcount / per) if per else minimum),
+             "responsibilities": duty}
+            for role, per, minimum, duty in STAFF_RATIOS
+        ],
+        "budget_breakdown": _budget(tpl, budget),
+        "vendors": [{"category": category, "tip": tip} for category, tip in tpl["vendors"]],
+        "risk_contingency": [
+            {"risk": risk, "likelihood": likelihood, "impact": impact, "mitigation": mitigation}
+            for risk, likelihood, impact, mitigation in (
+                list(tpl["risks"]) + ([WEATHER_RISK] if outdoor else []) + COMMON_RISKS
+            )
+        ],
+        "next_steps": [],
+    }
+    for days_before, action, owner in MILESTONES:
+        if dates:
+            try:
+                due = dates[0] - timedelta(days=days_before)
+            except OverflowError:
+                due = date.min
+            deadline = _day(due) if due >= today else "As soon as possible"
+        else:
+            deadline = f"{days_before} days before the event"
+        plan["next_steps"].append({"action": action, "owner": owner, "deadline": deadline})
+
+    return {section: plan[section] for section in PLAN_SECTIONS}
@@ -0,0 +1,101 @@
+import contextvars
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout, as_completed
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from llm_gateway import LLMUnavailable
+from plan_cache import normalize_plan_request, plan_cache_key
+
+logger = logging.getLogger(__name__)
+
+# Largest batch accepted by /api/event-plan/batch
+PLAN_BATCH_MAX_ITEMS = int(os.environ.get("PLAN_BATCH_MAX_ITEMS", 20))
+# Plans built and translated at the same time for batches (shared by all batches in the process)
+PLAN_BATCH_WORKERS = int(os.environ.get("PLAN_BATCH_WORKERS", 4))
+# Items not planned within this many seconds are reported as errors, so a
+# batch answers well inside the gunicorn worker timeout (120s)
+PLAN_BATCH_DEADLINE = float(os.environ.get("PLAN_BATCH_DEADLINE", 90))
+
+DEADLINE_EXCEEDED = "deadline_exceeded"
+
+_pool = ThreadPoolExecutor(max_workers=PLAN_BATCH_WORKERS, thread_name_prefix="plan-batch")
+
+
+def _submit(fn, *args):
+    # Keep the request's metrics context in the worker thread
+    return _pool.submit(contextvars.copy_context().run, fn, *args)
+
+
+def _error(e: Exception) -> str:
+    return e.reason if isinstance(e, LLMUnavailable) else "generation_failed"
+
+
+def run_batch(items: List[Any],
+              build_base: Callable[[Dict[str, Any]], Any],
+              localize: Callable[[Dict[str, Any], Any], Tuple[dict, Dict[str, Any]]],
+              fallback: Optional[Callable[[Dict[str, Any], Exception], Tuple[dict, Dict[str, Any]]]] = None,
+              deadline: float = PLAN_BATCH_DEADLINE) -> List[Dict[str, Any]]:
+    """Plan every item, generating each distinct (event_type, answers, mode) once.
+
+    build_base(item) produces the English plan shared by the items of a group;
+    localize(item, base) turns it into the item's payload and info (cache,
+    source). When a group's base cannot be built, fallback(item, error) may
+    still answer each of its items. Failures are reported per item, in input
+    order; the batch as a whole never fails. Items unfinished after deadline
+    seconds fail with DEADLINE_EXCEEDED (their work still fills the plan cache).
+    """
+    expires = time.monotonic() + deadline
+    remaining = lambda: max(0.0, expires - time.monotonic())
+    results: List[Dict[str, Any]] = [{} for _ in items]
+    groups: Dict[str, List[Tuple[int, Dict[str, Any]]]] = {}
+    for index, raw in enumerate(items):
+        try:
+            item = normalize_plan_request(raw)
+        except ValueError as e:
+            results[index] = {"index": index, "status": "error", "error": str(e)}
+            continue
+        key = plan_cache_key(item["event_type"], item["answers"], "en", item["mode"])
+        groups.setdefault(key, []).append((index, item))
+
+    bases = {_submit(build_base, members[0][1]): key for key, members in groups.items()}
+    pending = []
+    # Fan out each group's languages as soon as its base plan is ready
+    try:
+        for base_future in as_completed(bases, timeout=remaining()):
+            members = groups[bases.pop(base_future)]
+            try:
+                base, error = base_future.result(), None
+            except Exception as e:
+                logger.error(f"Batch plan for {members[0][1]['event_type']} failed: {e}")
+                base, error = None, e
+            for index, item in members:
+                if error is None:
+                    future = _submit(localize, item, base)
+                elif fallback is not None:
+                    future = _submit(fallback, item, error)
+                else:
+                    future = None
+                pending.append((index, item, future, error))
+    except FutureTimeout:
+        logger.warning(f"Batch deadline ({deadline}s) passed with {len(bases)} plans unfinished")
+        for key in bases.values():
+            pending.extend((index, item, None, None) for index, item in groups[key])
+
+    for index, item, future, error in pending:
+        result = {"index": index, "event_type": item["event_type"], "language": item["language"]}
+        if future is None:
+            result.update(status="error", error=_error(error) if error else DEADLINE_EXCEEDED)
+        else:
+            try:
+                payload, info = future.result(timeout=remaining())
+                result.update(status="ok", response=payload, **info)
+            except FutureTimeout:
+                future.cancel()
+                result.update(status="error", error=DEADLINE_EXCEEDED)
+            except Exception as e:
+                logger.error(f"Batch item {index} ({item['language']}) failed: {e}")
+                result.update(status="error", error=_error(e))
+        results[index] = result
+    return results
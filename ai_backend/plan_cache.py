@@ -0,0 +1,198 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import unicodedata
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from cache import TieredCache
+from sectioned_plan import PLAN_GENERATION_MODE, PLAN_MODES, plan_mode
+
+logger = logging.getLogger(__name__)
+
+plan_cache = TieredCache(
+    "event_plans",
+    max_entries=int(os.environ.get("PLAN_CACHE_SIZE", 256)),
+    ttl=float(os.environ.get("PLAN_CACHE_TTL", 6 * 3600)),
+    max_disk_entries=int(os.environ.get("PLAN_CACHE_DISK_SIZE", 5000)),
+    persistent=os.environ.get("PLAN_CACHE_DISK", "1") != "0",
+)
+
+_SPACE = re.compile(r"\s+")
+
+
+def _canon(value: Any) -> Any:
+    if isinstance(value, str):
+        return _SPACE.sub(" ", unicodedata.normalize("NFKC", value)).strip().lower()
+    if isinstance(value, dict):
+        return {str(k).strip().lower(): _canon(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_canon(v) for v in value]
+    return value
+
+
+def normalize_plan_request(data: Any, default_mode: str = PLAN_GENERATION_MODE) -> Dict[str, Any]:
+    """Validated plan fields of a request body or batch item; raises ValueError with a client-facing message."""
+    if not isinstance(data, dict):
+        raise ValueError("Request body must be a JSON object")
+    answers = data.get("answers", {})
+    if not isinstance(answers, dict):
+        raise ValueError("answers must be an object")
+    language = data.get("language", "en") or "en"
+    if not isinstance(language, str):
+        raise ValueError("language must be a string")
+    mode = plan_mode(data.get("mode"), default_mode)
+    if mode is None:
+        raise ValueError(f"mode must be one of {', '.join(PLAN_MODES)}")
+    return {
+        "event_type": str(data.get("event_type") or "event"),
+        "answers": answers,
+        "language": language,
+        "mode": mode,
+    }
+
+
+def plan_cache_key(event_type: str, answers: Dict[str, Any], lang: str, mode: str = "single") -> str:
+    """Key on canonicalized (event_type, answers, language) and the generation mode.
+
+    Case, Unicode width forms and whitespace runs are ignored, and empty answers
+    are dropped, so trivially different submissions share one cached plan.
+    """
+    canonical = {
+        "event_type": _canon(event_type or "event"),
+        "answers": {k: v for k, v in _canon(answers or {}).items() if v not in ("", None)},
+        "lang": _canon(lang or "en"),
+        "mode": mode,
+    }
+    body = json.dumps(canonical, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into one execution."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Run fn once per in-flight key; returns (result, shared_with_another_caller)."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+        return call.result, False
+
+
+plan_flight = SingleFlight()
+
+
+def get_or_build_plan(event_type: str, answers: Dict[str, Any], lang: str,
+                      build: Callable[[], Tuple[dict, bool]], no_cache: bool = False,
+                      mode: str = "single") -> Tuple[dict, str]:
+    """Return (payload, cache_status) where status is hit, miss, shared or bypass.
+
+    build() returns (payload, cacheable). Identical requests in flight at the
+    same time share a single build; no_cache forces a fresh build whose result
+    replaces the cached entry.
+    """
+    key = plan_cache_key(event_type, answers, lang, mode)
+    if no_cache:
+        payload, cacheable = build()
+        if cacheable:
+            plan_cache.set(key, payload)
+        return payload, "bypass"
+
+    cached = plan_cache.get(key)
+    if cached is not None:
+        return cached, "hit"
+
+    def run():
+        # A build that finished between our lookup and becoming leader already cached it
+        cached = plan_cache.get(key)
+        if cached is not None:
+            return cached
+        payload, cacheable = build()
+        if cacheable:
+            plan_cache.set(key, payload)
+        return payload
+
+    payload, shared = plan_flight.do(key, run)
+    return payload, "shared" if shared else "miss"
+
+
+class AsyncSingleFlight:
+    """asyncio counterpart of SingleFlight for the ASGI app (one event loop per process)."""
+
+    def __init__(self):
+        self._calls: Dict[str, "asyncio.Future"] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        future = self._calls.get(key)
+        if future is not None:
+            return await asyncio.shield(future), True
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await fn()
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so a call nobody else awaited does not log a warning
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            self._calls.pop(key, None)
+        return result, False
+
+
+plan_flight_async = AsyncSingleFlight()
+
+
+async def aget_or_build_plan(event_type: str, answers: Dict[str, Any], lang: str,
+                             build: Callable[[], Awaitable[Tuple[dict, bool]]],
+                             no_cache: bool = False, mode: str = "single") -> Tuple[dict, str]:
+    """Async variant of get_or_build_plan; cache I/O runs off the event loop."""
+    key = plan_cache_key(event_type, answers, lang, mode)
+    if not no_cache:
+        cached = await asyncio.to_thread(plan_cache.get, key)
+        if cached is not None:
+            return cached, "hit"
+
+    async def run():
+        payload, cacheable = await build()
+        if cacheable:
+            await asyncio.to_thread(plan_cache.set, key, payload)
+        return payload
+
+    if no_cache:
+        return await run(), "bypass"
+    payload, shared = await plan_flight_async.do(key, run)
+    return payload, "shared" if shared else "miss"
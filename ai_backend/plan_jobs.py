@@ -0,0 +1,265 @@
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from cache import SQLiteConnections, data_path
+from llm_gateway import LLMUnavailable
+from metrics import PLAN_JOBS, begin_request
+
+logger = logging.getLogger(__name__)
+
+# Plans generated by the job API (and /api/event-plan under an SLO) run on
+# this many threads per process
+PLAN_JOB_WORKERS = int(os.environ.get("PLAN_JOB_WORKERS", 4))
+# Jobs allowed to wait for a worker before submits are refused with 503
+PLAN_JOB_MAX_PENDING = int(os.environ.get("PLAN_JOB_MAX_PENDING", 32))
+# Finished jobs are kept this long (seconds), in SQLite so other workers and restarts see them
+PLAN_JOB_TTL = float(os.environ.get("PLAN_JOB_TTL", 3600))
+# Longest a long-poll request is held open (well under the gunicorn worker timeout)
+PLAN_JOB_MAX_WAIT = float(os.environ.get("PLAN_JOB_MAX_WAIT", 25))
+# A queued/running job with no progress for this long was lost with its worker
+PLAN_JOB_STALE_AFTER = float(os.environ.get("PLAN_JOB_STALE_AFTER", 300))
+# Generation mode for jobs. "sectioned" lets clients see sections as they
+# finish but spends one LLM request per section against the per-minute limit
+PLAN_JOB_MODE = os.environ.get("PLAN_JOB_MODE", "single").lower()
+
+TERMINAL = ("done", "failed")
+
+
+def new_job(data: Dict[str, Any], status: str = "queued") -> Dict[str, Any]:
+    now = time.time()
+    return {
+        "job_id": uuid.uuid4().hex,
+        "status": status,
+        "event_type": data.get("event_type", "event"),
+        "language": data.get("language", "en"),
+        "sections": {},
+        "response": None,
+        "degraded": False,
+        "source": None,
+        "cache": None,
+        "error": None,
+        "created": now,
+        "started": None,
+        "updated": now,
+        "version": 0,
+    }
+
+
+class JobStore:
+    """Job records keyed by id: a SQLite (WAL) table shared by the workers on the host.
+
+    Only the process running a job writes it. Records older than ttl are
+    evicted; if the database cannot be opened jobs live in process memory.
+    """
+
+    _EVICT_EVERY = 50
+
+    def __init__(self, path: Optional[str] = None, ttl: float = PLAN_JOB_TTL):
+        self.ttl = ttl
+        self._connections = SQLiteConnections()
+        self._lock = threading.Lock()
+        self._memory: Dict[str, Dict[str, Any]] = {}
+        self._writes = 0
+        self._db_path = None
+        try:
+            self._db_path = path or data_path("plan_jobs.sqlite3")
+            with self._conn() as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS jobs ("
+                    "id TEXT PRIMARY KEY, data TEXT NOT NULL, updated REAL NOT NULL)"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_updated ON jobs(updated)")
+        except Exception as e:
+            logger.warning(f"Plan job store: SQLite unavailable ({e}); keeping jobs in memory")
+            self._db_path = None
+
+    def _conn(self):
+        return self._connections.get(self._db_path)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        cutoff = time.time() - self.ttl
+        if self._db_path is None:
+            with self._lock:
+                job = self._memory.get(job_id)
+                return dict(job) if job and job["updated"] >= cutoff else None
+        row = self._conn().execute(
+            "SELECT data FROM jobs WHERE id = ? AND updated >= ?", (job_id, cutoff)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, job: Dict[str, Any]) -> None:
+        if self._db_path is None:
+            with self._lock:
+                self._memory[job["job_id"]] = dict(job)
+        else:
+            with self._conn() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO jobs (id, data, updated) VALUES (?, ?, ?)",
+                    (job["job_id"], json.dumps(job, ensure_ascii=False), job["updated"]),
+                )
+        with self._lock:
+            self._writes += 1
+            evict = self._writes % self._EVICT_EVERY == 1
+        if evict:
+            self.evict()
+
+    def evict(self) -> None:
+        """Drop jobs not updated within the TTL."""
+        cutoff = time.time() - self.ttl
+        try:
+            if self._db_path is None:
+                with self._lock:
+                    for job_id in [k for k, job in self._memory.items() if job["updated"] < cutoff]:
+                        del self._memory[job_id]
+            else:
+                with self._conn() as conn:
+                    conn.execute("DELETE FROM jobs WHERE updated < ?", (cutoff,))
+        except Exception as e:
+            logger.warning(f"Plan job eviction failed: {e}")
+
+
+class PlanJobs:
+    """Runs event plans in the background for the submit/poll job API.
+
+    run_plan(data, on_section) returns (payload, info) where info may set
+    "source", "cache" and "degraded"; on_section(section, value) publishes a
+    finished section before the whole plan is ready.
+    """
+
+    def __init__(self, run_plan: Callable[[Dict[str, Any], Callable[[str, Any], None]], Tuple[dict, Dict[str, Any]]],
+                 store: Optional[JobStore] = None, workers: int = PLAN_JOB_WORKERS,
+                 max_pending: int = PLAN_JOB_MAX_PENDING):
+        self.run_plan = run_plan
+        self.store = store or JobStore()
+        self.workers = workers
+        self.max_pending = max_pending
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="plan-job")
+        self._pending = 0
+        self._running = 0
+        self._cond = threading.Condition()
+
+    def submit(self, data: Dict[str, Any], done: Optional[dict] = None) -> Dict[str, Any]:
+        """Create a job and queue it; a ready payload (e.g. a cache hit) completes it at once.
+
+        Raises LLMUnavailable when too many jobs are already waiting.
+        """
+        if done is not None:
+            job = new_job(data, status="done")
+            job.update(response=done, source="llm", cache="hit")
+            self.store.put(job)
+            PLAN_JOBS.inc(status="done")
+            return job
+        with self._cond:
+            if self._pending >= self.workers + self.max_pending:
+                PLAN_JOBS.inc(status="rejected")
+                raise LLMUnavailable("job_queue_full", 5.0)
+            self._pending += 1
+        job = new_job(data)
+        try:
+            self.store.put(job)
+            # The worker owns job from here on; the caller gets a snapshot
+            self._pool.submit(contextvars.Context().run, self._run, job, data)
+        except BaseException:
+            with self._cond:
+                self._pending -= 1
+            raise
+        return dict(job)
+
+    def _update(self, job: Dict[str, Any], **fields) -> None:
+        job.update(fields)
+        job["updated"] = time.time()
+        job["version"] += 1
+        try:
+            self.store.put(job)
+        except Exception as e:
+            logger.warning(f"Plan job {job['job_id']} could not be saved: {e}")
+        with self._cond:
+            self._cond.notify_all()
+
+    def _run(self, job: Dict[str, Any], data: Dict[str, Any]) -> None:
+        begin_request("plan_job")
+        with self._cond:
+            self._running += 1
+        self._update(job, status="running", started=time.time())
+
+        def on_section(section: str, value: Any) -> None:
+            self._update(job, sections={**job["sections"], section: value})
+
+        try:
+            payload, info = self.run_plan(data, on_section)
+            self._update(job, status="done", response=payload, source=info.get("source", "llm"),
+                         cache=info.get("cache"), degraded=bool(info.get("degraded")))
+        except Exception as e:
+            logger.error(f"Plan job {job['job_id']} failed: {e}")
+            reason = e.reason if isinstance(e, LLMUnavailable) else "generation_failed"
+            self._update(job, status="failed", error=reason)
+        finally:
+            with self._cond:
+                self._pending -= 1
+                self._running -= 1
+        PLAN_JOBS.inc(status=job["status"] if not job["degraded"] else "degraded")
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self.store.get(job_id)
+        if job and job["status"] not in TERMINAL and time.time() - job["updated"] > PLAN_JOB_STALE_AFTER:
+            # The worker that owned it went away (restart or crash)
+            job.update(status="failed", error="interrupted")
+        return job
+
+    def wait(self, job_id: str, since: int = -1, timeout: float = 0) -> Optional[Dict[str, Any]]:
+        """Long-poll: return once the job's version passes since, it finishes, or timeout expires.
+
+        Jobs run by this process wake the waiter immediately; jobs owned by
+        another worker are re-read from the store every half second.
+        """
+        deadline = time.monotonic() + min(max(timeout, 0.0), PLAN_JOB_MAX_WAIT)
+        while True:
+            job = self.get(job_id)
+            remaining = deadline - time.monotonic()
+            if job is None or job["status"] in TERMINAL or job["version"] > since or remaining <= 0:
+                return job
+            with self._cond:
+                self._cond.wait(min(remaining, 0.5))
+
+    def wait_within(self, job_id: str, budget: float) -> Optional[Dict[str, Any]]:
+        """Wait for a job to finish, giving it budget seconds from when it starts running.
+
+        Time spent queued for a worker is bounded by the same budget.
+        """
+        while True:
+            job = self.get(job_id)
+            if job is None or job["status"] in TERMINAL or past_budget(job, budget):
+                return job
+            with self._cond:
+                self._cond.wait(min(budget_left(job, budget), 0.5))
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {"running": self._running, "queued": self._pending - self._running}
+
+
+def budget_left(job: Dict[str, Any], budget: float) -> float:
+    """Seconds of budget a job has left: counted from its start, or from submit while queued."""
+    return budget - (time.time() - (job.get("started") or job["created"]))
+
+
+def past_budget(job: Dict[str, Any], budget: float) -> bool:
+    return budget_left(job, budget) <= 0
+
+
+def job_view(job: Dict[str, Any], total_sections: int) -> Dict[str, Any]:
+    """Public shape of a job for the poll endpoint."""
+    view = {key: job[key] for key in ("job_id", "status", "version", "sections", "event_type", "language")}
+    view["progress"] = {"sections_done": len(job["sections"]), "sections_total": total_sections}
+    if job["status"] == "done":
+        view.update(response=job["response"], degraded=job["degraded"], source=job["source"])
+    elif job["status"] == "failed":
+        view["error"] = job["error"]
+    return view
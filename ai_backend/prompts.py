@@ -0,0 +1,120 @@
+import logging
+import os
+import string
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+from compaction import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+PROMPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+@dataclass(frozen=True)
+class Prompt:
+    """An immutable, validated prompt template with its precomputed token size."""
+    name: str
+    text: str
+    tokens: int
+    mtime: float
+    fields: Tuple[str, ...] = field(default_factory=tuple)
+    template: bool = False
+
+    def render(self, **values) -> str:
+        """Fill a template prompt; plain prompts are returned unchanged."""
+        if not self.template:
+            return self.text
+        return self.text.format(**{f: values.get(f, '') for f in self.fields})
+
+
+class PromptRegistry:
+    """Loads prompt files once and reloads them only when their mtime changes.
+
+    get() stats the file at most every check_interval seconds, so the request
+    path never reads prompt files. A file that fails to load or validate keeps
+    the previously loaded version (or the registered default).
+    """
+
+    def __init__(self, directory: str = PROMPT_DIR, check_interval: float = 2.0):
+        self.directory = directory
+        self.check_interval = check_interval
+        self._specs: Dict[str, Dict] = {}
+        self._prompts: Dict[str, Prompt] = {}
+        self._checked: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, filename: str, fields: Tuple[str, ...] = (),
+                 default: str = "") -> Prompt:
+        """Register a prompt file. Templates declare their str.format fields."""
+        self._specs[name] = {
+            "path": os.path.join(self.directory, filename),
+            "fields": tuple(fields),
+            "template": bool(fields),
+            "default": default,
+        }
+        self._prompts[name] = self._load(name) or Prompt(
+            name=name, text=default, tokens=estimate_tokens(default), mtime=0.0,
+            fields=tuple(fields), template=bool(fields),
+        )
+        self._checked[name] = time.monotonic()
+        return self._prompts[name]
+
+    def get(self, name: str) -> Prompt:
+        now = time.monotonic()
+        if now - self._checked.get(name, 0.0) >= self.check_interval:
+            with self._lock:
+                if now - self._checked.get(name, 0.0) >= self.check_interval:
+                    self._checked[name] = now
+                    self._refresh(name)
+        return self._prompts[name]
+
+    def token_report(self) -> Dict[str, int]:
+        """Token size of every registered prompt template."""
+        return {name: self.get(name).tokens for name in self._specs}
+
+    def _refresh(self, name: str) -> None:
+        spec = self._specs[name]
+        try:
+            mtime = os.stat(spec["path"]).st_mtime
+        except OSError:
+            return
+        if mtime != self._prompts[name].mtime:
+            prompt = self._load(name)
+            if prompt is not None:
+                self._prompts[name] = prompt
+                logger.info(f"Reloaded prompt '{name}' ({prompt.tokens} tokens)")
+
+    def _load(self, name: str) -> Optional[Prompt]:
+        spec = self._specs[name]
+        try:
+            mtime = os.stat(spec["path"]).st_mtime
+            with open(spec["path"], "r", encoding="utf-8") as file:
+                text = file.read()
+            if spec["template"]:
+                used = {f for _, f, _, _ in string.Formatter().parse(text) if f is not None}
+                missing = set(spec["fields"]) - used
+                unknown = used - set(spec["fields"])
+                if missing or unknown:
+                    raise ValueError(f"fields mismatch (missing={sorted(missing)}, unknown={sorted(unknown)})")
+            if not text.strip():
+                raise ValueError("empty prompt")
+        except Exception as e:
+            logger.error(f"Error loading prompt '{name}': {str(e)}")
+            return None
+        return Prompt(
+            name=name, text=text, tokens=estimate_tokens(text), mtime=mtime,
+            fields=spec["fields"], template=spec["template"],
+        )
+
+
+prompts = PromptRegistry()
+prompts.register("system", "web3_prompt.txt", default="You are a helpful assistant.")
+prompts.register("event_plan", "event_plan_prompt.txt",
+                 fields=("event_type", "guidance", "date", "venue", "people", "time", "budget"))
+prompts.register("event_plan_section", "event_plan_section_prompt.txt",
+                 fields=("event_type", "section", "section_hint", "guidance",
+                         "date", "venue", "people", "time", "budget"))
+prompts.register("summary", "summary_prompt.txt")
@@ -0,0 +1,179 @@
+import asyncio
+import contextvars
+import json
+import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from event_data import PLAN_SECTIONS
+from llm_gateway import LLMUnavailable, current_deadline, fits_call
+
+logger = logging.getLogger(__name__)
+
+# "single" asks for the whole plan in one completion; "sectioned" asks for each
+# section concurrently. Requests can override this with "mode".
+PLAN_GENERATION_MODE = os.environ.get("PLAN_GENERATION_MODE", "single").lower()
+PLAN_MODES = ("single", "sectioned")
+PLAN_SECTION_WORKERS = int(os.environ.get("PLAN_SECTION_WORKERS", 9))
+PLAN_SECTION_RETRIES = int(os.environ.get("PLAN_SECTION_RETRIES", 1))
+
+_pool = ThreadPoolExecutor(max_workers=PLAN_SECTION_WORKERS, thread_name_prefix="plan-section")
+
+_MISSING = object()
+
+
+def plan_mode(mode: Any, default: str = PLAN_GENERATION_MODE) -> Optional[str]:
+    """Normalized generation mode of a request (default when unset), or None if unknown."""
+    if mode in (None, ""):
+        mode = default
+    if not isinstance(mode, str):
+        return None
+    mode = mode.strip().lower()
+    return mode if mode in PLAN_MODES else None
+
+
+_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+
+def load_json(content: str) -> Any:
+    """JSON value of model output, tolerating a ```json fence and prose around a {...}; _MISSING if none."""
+    text = _FENCE.sub("", (content or "").strip())
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        start, end = text.find("{"), text.rfind("}")
+        if start < 0 or end <= start:
+            return _MISSING
+        try:
+            return json.loads(text[start:end + 1])
+        except json.JSONDecodeError:
+            return _MISSING
+
+
+def parse_section(section: str, content: str) -> Any:
+    """Extract one section's value from the model output, or _MISSING if invalid.
+
+    Accepts {"<section>": value}, a bare JSON value, and tolerates a ```json fence.
+    """
+    value = load_json(content)
+    if value is _MISSING:
+        return _MISSING
+    if isinstance(value, dict) and section in value:
+        value = value[section]
+    if value in (None, "", [], {}):
+        return _MISSING
+    return value
+
+
+def merge_sections(results: Dict[str, Any], raw: Dict[str, str]) -> Dict[str, Any]:
+    """Assemble plan_json in PLAN_SECTIONS order; unparsed sections keep the raw text."""
+    plan_json = {}
+    for section in PLAN_SECTIONS:
+        if section in results:
+            plan_json[section] = results[section]
+        elif raw.get(section):
+            plan_json[section] = raw[section]
+    return plan_json
+
+
+def generate_sections(invoke: Callable[[List], Any], build_messages: Callable[[str], List],
+                      sections: Optional[List[str]] = None,
+                      retries: int = PLAN_SECTION_RETRIES,
+                      on_section: Optional[Callable[[str, Any], None]] = None,
+                      deadline: Optional[float] = None) -> Tuple[Dict[str, Any], List[str]]:
+    """Generate plan sections concurrently and merge them.
+
+    invoke(messages) returns an AIMessage; build_messages(section) returns the
+    messages for one section. Only sections that fail to parse are retried.
+    on_section(section, value) is called as each section becomes available.
+    Returns (plan_json, sections_that_still_failed). LLMUnavailable is not
+    retried: it propagates so the caller can fail fast. No retry round starts
+    unless its calls can finish before deadline (default: the request's).
+    """
+    deadline = current_deadline() if deadline is None else deadline
+    pending = list(sections or PLAN_SECTIONS)
+    results: Dict[str, Any] = {}
+    raw: Dict[str, str] = {}
+
+    def run(section: str) -> str:
+        result = invoke(build_messages(section))
+        return result.content if isinstance(result.content, str) else str(result.content)
+
+    for attempt in range(retries + 1):
+        if not pending:
+            break
+        if attempt:
+            if not fits_call(deadline):
+                logger.warning(f"No time left to retry plan sections: {', '.join(pending)}")
+                break
+            logger.warning(f"Retrying plan sections: {', '.join(pending)}")
+        futures = {
+            _pool.submit(contextvars.copy_context().run, run, section): section
+            for section in pending
+        }
+        failed = []
+        for future in as_completed(futures):
+            section = futures[future]
+            try:
+                content = future.result()
+            except LLMUnavailable:
+                raise
+            except Exception as e:
+                logger.error(f"Plan section '{section}' failed: {str(e)}")
+                failed.append(section)
+                continue
+            value = parse_section(section, content)
+            if value is _MISSING:
+                raw[section] = content
+                failed.append(section)
+                continue
+            results[section] = value
+            if on_section:
+                on_section(section, value)
+        pending = [s for s in pending if s in failed]
+
+    return merge_sections(results, raw), pending
+
+
+async def agenerate_sections(ainvoke: Callable[[List], Awaitable[Any]], build_messages: Callable[[str], List],
+                             sections: Optional[List[str]] = None,
+                             retries: int = PLAN_SECTION_RETRIES,
+                             deadline: Optional[float] = None) -> Tuple[Dict[str, Any], List[str]]:
+    """asyncio counterpart of generate_sections for the ASGI app."""
+    deadline = current_deadline() if deadline is None else deadline
+    pending = list(sections or PLAN_SECTIONS)
+    results: Dict[str, Any] = {}
+    raw: Dict[str, str] = {}
+
+    async def run(section: str) -> str:
+        result = await ainvoke(build_messages(section))
+        return result.content if isinstance(result.content, str) else str(result.content)
+
+    for attempt in range(retries + 1):
+        if not pending:
+            break
+        if attempt:
+            if not fits_call(deadline):
+                logger.warning(f"No time left to retry plan sections: {', '.join(pending)}")
+                break
+            logger.warning(f"Retrying plan sections: {', '.join(pending)}")
+        outputs = await asyncio.gather(*(run(s) for s in pending), return_exceptions=True)
+        failed = []
+        for section, content in zip(pending, outputs):
+            if isinstance(content, LLMUnavailable):
+                raise content
+            if isinstance(content, Exception):
+                logger.error(f"Plan section '{section}' failed: {str(content)}")
+                failed.append(section)
+                continue
+            value = parse_section(section, content)
+            if value is _MISSING:
+                raw[section] = content
+                failed.append(section)
+            else:
+                results[section] = value
+        pending = failed
+
+    return merge_sections(results, raw), pending
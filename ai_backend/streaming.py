@@ -0,0 +1,120 @@
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ReplyStreamParser:
+    """Incrementally parse the LLM's JSON reply while tokens are still arriving.
+
+    The reply follows the format from web3_prompt.txt:
+    {"html_response": "...", "messages": [{...}, {...}], "plan_json": {...}}
+
+    feed() returns events for every piece that became complete with the new text:
+    each object of the top-level "messages" array and the "html_response" string.
+    Anything before the first '{' (e.g. a ```json fence) is ignored.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self._pos = 0
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = -1
+        self._string_is_value = False
+        self._last_key: Optional[str] = None
+        self._current_key: Optional[str] = None
+        self._expect_value = False
+        self._in_messages = False
+        self._object_start = -1
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """Consume a chunk of streamed text and return newly completed events."""
+        if not chunk:
+            return []
+        self.text += chunk
+        events: List[Dict[str, Any]] = []
+        text = self.text
+        while self._pos < len(text):
+            i = self._pos
+            ch = text[i]
+            self._pos += 1
+
+            if not self._started:
+                if ch == '{':
+                    self._started = True
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._on_string_end(i, events)
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._string_start = i
+                self._string_is_value = self._depth == 1 and self._expect_value
+                self._expect_value = False
+            elif ch in '{[':
+                if self._depth == 1:
+                    self._in_messages = ch == '[' and self._expect_value and self._current_key == "messages"
+                    self._expect_value = False
+                elif self._depth == 2 and self._in_messages and ch == '{':
+                    self._object_start = i
+                self._depth += 1
+            elif ch in '}]':
+                self._depth -= 1
+                if self._depth == 2 and self._in_messages and ch == '}' and self._object_start >= 0:
+                    self._emit_message(text[self._object_start:i + 1], events)
+                    self._object_start = -1
+                elif self._depth == 1:
+                    self._in_messages = False
+            elif self._depth == 1:
+                if ch == ':':
+                    self._current_key = self._last_key
+                    self._expect_value = True
+                elif ch == ',':
+                    self._expect_value = False
+                elif not ch.isspace():
+                    # Scalar value (number/true/false/null) at the top level
+                    self._expect_value = False
+        return events
+
+    def _on_string_end(self, end: int, events: List[Dict[str, Any]]) -> None:
+        if self._depth != 1:
+            return
+        raw = self.text[self._string_start:end + 1]
+        try:
+            value = json.loads(raw)
+        except json.JSONDecodeError:
+            return
+        if not self._string_is_value:
+            self._last_key = value
+        elif self._current_key == "html_response":
+            events.append({"type": "html_response", "html_response": value})
+
+    def _emit_message(self, raw: str, events: List[Dict[str, Any]]) -> None:
+        try:
+            msg = json.loads(raw)
+        except json.JSONDecodeError:
+            logger.warning("Skipping malformed streamed message object")
+            return
+        if isinstance(msg, dict):
+            events.append({"type": "message", "message": msg})
+
+
+def format_event(event: Dict[str, Any], sse: bool = False) -> str:
+    """Serialize a stream event as an NDJSON line or a Server-Sent Event."""
+    payload = json.dumps(event, ensure_ascii=False)
+    if sse:
+        return f"event: {event.get('type', 'message')}\ndata: {payload}\n\n"
+    return payload + "\n"
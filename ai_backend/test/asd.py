@@ -3,25 +3,27 @@ import requests
 # Define the URL of the Flask server
 url = "http://localhost:5000/chat"
 
-# Set the query and conversation_id
-query = "Hello, how are you?"
-conversation_id = "your-conversation-id-here"  # If no conversation ID, it will be generated by the Flask server
+# Set the message and conversation_id
+message = "Hello, how are you?"
+conversation_id = None  # If no conversation ID, it will be generated by the Flask server
 
-# Create the request parameters
-params = {
-    'query': query,
-    'conversation_id': conversation_id  # You can omit this if you want the server to generate it
+# Create the request body (same shape the frontend sends)
+payload = {
+    'message': message,
+    'language': 'en',
 }
+if conversation_id:
+    payload['conversation_id'] = conversation_id
 
-# Send the GET request to the Flask server
-response = requests.get(url, params=params, stream=True)
+# Send the POST request to the Flask server
+response = requests.post(url, json=payload, timeout=120)
 
 # Check if the request was successful
 if response.status_code == 200:
-    # Print the response content
+    data = response.json()
     print("Chatbot Response:")
-    for chunk in response.iter_lines():
-        if chunk:
-            print(chunk.decode('utf-8'))
+    print("conversation_id:", data.get('conversation_id'))
+    for msg in data.get('response', {}).get('messages', []):
+        print("-", msg.get('text'))
 else:
     print(f"Error: {response.status_code}")
@@ -0,0 +1,30 @@
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from conversation_store import SQLiteConversationStore, make_record  # noqa: E402
+
+
+def _expire(store, conversation_id):
+    # Age the session past the idle TTL without waiting for eviction
+    with store._conn() as conn:
+        conn.execute("UPDATE sessions SET updated = ? WHERE id = ?",
+                     (time.time() - store.idle_ttl - 1, conversation_id))
+
+
+def test_append_to_expired_session_starts_over(tmp_path):
+    store = SQLiteConversationStore(path=str(tmp_path / "conversations.sqlite3"), idle_ttl=60)
+    store.append("c1", [make_record("user", "old secret"), make_record("assistant", "x")])
+    store.compact("c1", 0, "summary-old")
+    _expire(store, "c1")
+
+    assert store.load("c1") is None
+    assert store.get_summary("c1") == ""
+
+    store.append("c1", [make_record("user", "new"), make_record("assistant", "y")])
+    assert [r["content"] for r in store.load("c1")] == ["new", "y"]
+    assert store.get_summary("c1") == ""
@@ -0,0 +1,361 @@
+import logging
+import os
+import re
+import threading
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from cache import TieredCache
+from metrics import TRANSLATION_CALLS, TRANSLATION_SEGMENTS
+
+logger = logging.getLogger(__name__)
+
+_translator = None
+_translator_lock = threading.Lock()
+
+
+def get_translator():
+    """Shared googletrans client, created on first use (googletrans is slow to import)."""
+    global _translator
+    if _translator is None:
+        with _translator_lock:
+            if _translator is None:
+                from googletrans import Translator
+                _translator = Translator()
+    return _translator
+
+translation_cache = TieredCache(
+    "translations",
+    max_entries=int(os.environ.get("TRANSLATION_CACHE_SIZE", 4096)),
+    ttl=float(os.environ.get("TRANSLATION_CACHE_TTL", 30 * 24 * 3600)),
+    max_disk_entries=int(os.environ.get("TRANSLATION_CACHE_DISK_SIZE", 100000)),
+    persistent=os.environ.get("TRANSLATION_CACHE_DISK", "1") != "0",
+)
+
+_INLINE_SPACE = re.compile(r"[ \t ]+")
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form used as the cache key: NFC, trimmed, runs of spaces collapsed."""
+    return _INLINE_SPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+# Pre-translation classifier: text already written in the target script, and
+# text with no words once numbers, dates, amounts and URLs are masked, never
+# reaches the translation service.
+_SCRIPT_RANGES = (
+    ("devanagari", 0x0900, 0x097F), ("bengali", 0x0980, 0x09FF), ("gurmukhi", 0x0A00, 0x0A7F),
+    ("gujarati", 0x0A80, 0x0AFF), ("oriya", 0x0B00, 0x0B7F), ("tamil", 0x0B80, 0x0BFF),
+    ("telugu", 0x0C00, 0x0C7F), ("kannada", 0x0C80, 0x0CFF), ("malayalam", 0x0D00, 0x0D7F),
+)
+LANGUAGE_SCRIPTS = {
+    "en": "latin", "hi": "devanagari", "mr": "devanagari", "ne": "devanagari", "bn": "bengali",
+    "pa": "gurmukhi", "gu": "gujarati", "or": "oriya", "ta": "tamil", "te": "telugu",
+    "kn": "kannada", "ml": "malayalam",
+}
+# Share of a string's letters that must be in one script for it to count as that script
+SCRIPT_MAJORITY = float(os.environ.get("TRANSLATION_SCRIPT_MAJORITY", 0.8))
+# Keys of reply/plan trees that hold identifiers, not prose
+UNTRANSLATED_KEYS = ("facialExpression", "animation")
+
+# Spans kept out of the translator; longest alternatives first
+_PROTECTED = re.compile(
+    r"https?://\S+|www\.\S+"
+    r"|[\w.+-]+@[\w-]+\.[\w.-]+"
+    r"|(?:₹|\bRs\.?|\bINR)\s?\d[\d,]*(?:\.\d+)?(?:\s?(?:lakhs?|crores?|k)\b)?"
+    r"|\b\d{1,4}[/.-]\d{1,2}[/.-]\d{1,4}\b"
+    r"|\b\d{1,2}:\d{2}(?:\s?[AaPp]\.?[Mm]\.?)?"
+    r"|\d[\d,]*(?:\.\d+)?%?",
+    re.IGNORECASE,
+)
+_PLACEHOLDER = "⟦{}⟧"
+_PLACEHOLDER_RE = re.compile(r"⟦\s*(\d+)\s*⟧")
+
+_stats_lock = threading.Lock()
+_stats = {"segments": 0, "skipped": 0}
+
+
+def detect_script(text: str) -> Optional[str]:
+    """Dominant script of text's letters ("latin", "tamil", ...), or None if mixed or unknown."""
+    counts: Dict[str, int] = {}
+    letters = 0
+    for ch in text:
+        if not ch.isalpha():
+            continue
+        letters += 1
+        code = ord(ch)
+        if code < 0x0250:
+            script = "latin"
+        else:
+            script = next((name for name, lo, hi in _SCRIPT_RANGES if lo <= code <= hi), "other")
+        counts[script] = counts.get(script, 0) + 1
+    if not letters:
+        return None
+    script, count = max(counts.items(), key=lambda kv: kv[1])
+    return script if script != "other" and count >= SCRIPT_MAJORITY * letters else None
+
+
+def mask(text: str) -> Tuple[str, List[str]]:
+    """Replace numbers, dates, ₹ amounts, URLs and e-mails with numbered placeholders."""
+    spans: List[str] = []
+
+    def hold(match):
+        spans.append(match.group(0))
+        return _PLACEHOLDER.format(len(spans) - 1)
+
+    return _PROTECTED.sub(hold, text), spans
+
+
+def unmask(text: str, spans: List[str]) -> Optional[str]:
+    """Put masked spans back; None when the translator lost or duplicated a placeholder."""
+    if not spans:
+        return text
+    found = [int(i) for i in _PLACEHOLDER_RE.findall(text)]
+    if sorted(found) != list(range(len(spans))):
+        return None
+    return _PLACEHOLDER_RE.sub(lambda m: spans[int(m.group(1))], text)
+
+
+def skip_reason(core: str, dest: str, src: str) -> Optional[str]:
+    """Why core needs no translation ("script" or "no_words"), or None if it does."""
+    masked, _ = mask(core)
+    if not any(ch.isalpha() for ch in _PLACEHOLDER_RE.sub("", masked)):
+        return "no_words"
+    dest_script = LANGUAGE_SCRIPTS.get(dest)
+    # Only decidable when the two languages are written in different scripts
+    if dest_script and dest_script != LANGUAGE_SCRIPTS.get(src) and detect_script(core) == dest_script:
+        return "script"
+    return None
+
+
+def _classify(cores: List[str], dest: str, src: str) -> List[bool]:
+    """Flags cores that need the translator and counts the rest as avoided."""
+    needed = []
+    for core in cores:
+        reason = skip_reason(core, dest, src)
+        needed.append(reason is None)
+        if reason is not None:
+            TRANSLATION_SEGMENTS.inc(result=f"skipped_{reason}")
+    with _stats_lock:
+        _stats["segments"] += len(cores)
+        _stats["skipped"] += needed.count(False)
+    return needed
+
+
+def translation_stats() -> Dict[str, Any]:
+    """Segments seen by translate_text/translate_many and the share the classifier skipped."""
+    with _stats_lock:
+        segments, skipped = _stats["segments"], _stats["skipped"]
+    return {"segments": segments, "skipped": skipped,
+            "avoided_ratio": round(skipped / segments, 4) if segments else 0.0}
+
+
+def _rewrap(text: str, translated: str) -> str:
+    lead = text[:len(text) - len(text.lstrip())]
+    trail = text[len(text.rstrip()):]
+    return f"{lead}{translated}{trail}"
+
+
+def translate_text(text: str, dest: str, src: str = 'en') -> str:
+    """Translate text through the cache; raises like Translator.translate on failure.
+
+    Leading/trailing whitespace of the input is preserved around the result.
+    Text that needs no translation (see skip_reason) is returned unchanged.
+    """
+    if not isinstance(text, str) or src == dest:
+        return text
+    core = normalize_text(text)
+    if not core or not _classify([core], dest, src)[0]:
+        return text
+    masked, spans = mask(core)
+    key = f"{src}\x1f{dest}\x1f{masked}"
+    translated = translation_cache.get(key)
+    if translated is None:
+        TRANSLATION_CALLS.inc(kind="single")
+        translated = get_translator().translate(masked, src=src, dest=dest).text
+        if unmask(translated, spans) is None:
+            # Placeholders did not survive; translate the plain text instead
+            TRANSLATION_CALLS.inc(kind="unmasked")
+            return _rewrap(text, get_translator().translate(core, src=src, dest=dest).text)
+        translation_cache.set(key, translated)
+        TRANSLATION_SEGMENTS.inc(result="translated")
+    else:
+        TRANSLATION_SEGMENTS.inc(result="cache_hit")
+    return _rewrap(text, unmask(translated, spans))
+
+
+# Batched translation: leaves are packed into requests of at most
+# TRANSLATION_BATCH_CHARS characters and sent TRANSLATION_WORKERS at a time.
+TRANSLATION_BATCH_CHARS = int(os.environ.get("TRANSLATION_BATCH_CHARS", 4000))
+TRANSLATION_WORKERS = int(os.environ.get("TRANSLATION_WORKERS", 4))
+_SEPARATOR = "\n|||\n"
+_SPLIT = re.compile(r"\s*\|\s*\|\s*\|\s*")
+
+_pool = ThreadPoolExecutor(max_workers=TRANSLATION_WORKERS, thread_name_prefix="translate")
+_local = threading.local()
+
+
+def _client():
+    # googletrans clients keep per-instance token state; one per worker thread
+    client = getattr(_local, "client", None)
+    if client is None:
+        from googletrans import Translator
+        client = Translator()
+        _local.client = client
+    return client
+
+
+def warm_clients(timeout: float = 10.0) -> None:
+    """Create the client of every translation worker thread ahead of the first batch."""
+    # The barrier holds each task until all have started, so each lands on its own thread
+    barrier = threading.Barrier(TRANSLATION_WORKERS)
+
+    def warm():
+        _client()
+        try:
+            barrier.wait(timeout)
+        except threading.BrokenBarrierError:
+            pass
+
+    for future in [_pool.submit(warm) for _ in range(TRANSLATION_WORKERS)]:
+        future.result()
+
+
+def _pack(texts: List[str]) -> List[List[str]]:
+    batches: List[List[str]] = []
+    current: List[str] = []
+    size = 0
+    for text in texts:
+        if current and size + len(text) + len(_SEPARATOR) > TRANSLATION_BATCH_CHARS:
+            batches.append(current)
+            current, size = [], 0
+        current.append(text)
+        size += len(text) + len(_SEPARATOR)
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _translate_batch(batch: List[str], dest: str, src: str) -> List[str]:
+    """Translate a packed batch in one request; per-item fallback if the split fails."""
+    if len(batch) > 1:
+        try:
+            TRANSLATION_CALLS.inc(kind="batch")
+            joined = _client().translate(_SEPARATOR.join(batch), src=src, dest=dest).text
+            parts = _SPLIT.split(joined.strip())
+            if len(parts) == len(batch):
+                return parts
+            logger.warning(f"Batch split mismatch ({len(parts)} != {len(batch)}); translating items one by one")
+        except Exception as e:
+            logger.warning(f"Batch translation failed: {e}")
+    results = []
+    for text in batch:
+        try:
+            TRANSLATION_CALLS.inc(kind="single")
+            results.append(_client().translate(text, src=src, dest=dest).text)
+        except Exception as e:
+            logger.error(f"Translation error: {str(e)}")
+            results.append(text)
+    return results
+
+
+def translate_many(texts: List[str], dest: str, src: str = 'en') -> List[str]:
+    """Translate a list of strings with dedup, caching, batching and bounded parallelism.
+
+    Numbers, dates, amounts and URLs are masked first, so strings differing only
+    in those share one cache entry. Strings that need no translation or cannot
+    be translated are returned unchanged.
+    """
+    if src == dest or not texts:
+        return list(texts)
+    cores = []
+    seen = set()
+    for text in texts:
+        core = normalize_text(text) if isinstance(text, str) else ""
+        if core and core not in seen:
+            seen.add(core)
+            cores.append(core)
+
+    translated: Dict[str, str] = {}
+    masked_by_core: Dict[str, Tuple[str, List[str]]] = {}
+    by_masked: Dict[str, str] = {}
+    missing: List[str] = []
+    for core, needed in zip(cores, _classify(cores, dest, src)):
+        if not needed:
+            translated[core] = core
+            continue
+        masked, spans = mask(core)
+        masked_by_core[core] = (masked, spans)
+        if masked in by_masked:
+            continue
+        hit = translation_cache.get(f"{src}\x1f{dest}\x1f{masked}")
+        if hit is None:
+            missing.append(masked)
+            by_masked[masked] = masked
+        else:
+            by_masked[masked] = hit
+            TRANSLATION_SEGMENTS.inc(result="cache_hit")
+
+    batches = _pack(missing)
+    futures = [_pool.submit(_translate_batch, batch, dest, src) for batch in batches]
+    for batch, future in zip(batches, futures):
+        for masked, result in zip(batch, future.result()):
+            by_masked[masked] = result
+            if result != masked:
+                translation_cache.set(f"{src}\x1f{dest}\x1f{masked}", result)
+                TRANSLATION_SEGMENTS.inc(result="translated")
+
+    for core, (masked, spans) in masked_by_core.items():
+        result = unmask(by_masked[masked], spans)
+        if result is None:
+            # Placeholders did not survive; translate the plain text on its own
+            result = _translate_batch([core], dest, src)[0]
+            TRANSLATION_CALLS.inc(kind="unmasked")
+        translated[core] = result
+
+    out = []
+    for text in texts:
+        core = normalize_text(text) if isinstance(text, str) else ""
+        out.append(_rewrap(text, translated.get(core, core)) if core else text)
+    return out
+
+
+def _collect(value: Any, path: Tuple, leaves: List[Tuple[Tuple, str]], skip_keys) -> None:
+    if isinstance(value, str):
+        leaves.append((path, value))
+    elif isinstance(value, dict):
+        for k, v in value.items():
+            if k not in skip_keys:
+                _collect(v, path + (k,), leaves, skip_keys)
+    elif isinstance(value, list):
+        for i, v in enumerate(value):
+            _collect(v, path + (i,), leaves, skip_keys)
+
+
+def translate_tree(value: Any, dest: str, src: str = 'en', skip_keys=UNTRANSLATED_KEYS) -> Any:
+    """Translate every string leaf of a JSON-like tree in as few requests as possible.
+
+    Leaves are gathered, translated through translate_many and scattered back
+    into a copy of the structure; values under skip_keys (by default the
+    avatar's facialExpression/animation identifiers) are left untouched.
+    """
+    if src == dest:
+        return value
+    leaves: List[Tuple[Tuple, str]] = []
+    _collect(value, (), leaves, set(skip_keys))
+    if not leaves:
+        return value
+    results = translate_many([text for _, text in leaves], dest=dest, src=src)
+    by_path = {path: result for (path, _), result in zip(leaves, results)}
+
+    def scatter(val: Any, path: Tuple) -> Any:
+        if isinstance(val, str):
+            return by_path.get(path, val)
+        if isinstance(val, dict):
+            return {k: scatter(v, path + (k,)) if k not in skip_keys else v for k, v in val.items()}
+        if isinstance(val, list):
+            return [scatter(v, path + (i,)) for i, v in enumerate(val)]
+        return val
+
+    return scatter(value, ())